@@ -31,6 +31,20 @@ extern "C" {
  * calls that use the same name for one of its parameters.
  */
 
+/*
+ * About threads:
+ * The functions that read or write traces and trace headers (segy_readtrace,
+ * segy_readsubtr, segy_traceheader, segy_field_forall, their write
+ * counterparts, and the functions built on top of them, like segy_read_line)
+ * use positional I/O (pread/pwrite, or the memory map), and don't keep a
+ * cursor in the segy_file. The same handle can be used for concurrent calls
+ * from multiple threads, as long as the writes don't overlap, and the handle
+ * is not closed, mmap'd or re-formatted in the meantime.
+ *
+ * On platforms without pread/pwrite, e.g. Windows, these functions fall back
+ * to fseek + fread and are not safe to call concurrently.
+ */
+
 struct segy_file_handle;
 typedef struct segy_file_handle segy_file;
 
@@ -101,6 +115,64 @@ int segy_field_forall( segy_file*,
                        long trace0,
                        int trace_bsize );
 
+/*
+ * Write the header word `field` of the traces in the range [start, stop) with
+ * step, from buf, i.e. the ith trace in the range gets buf[i]. This is the
+ * write counterpart of segy_field_forall.
+ *
+ * Only the bytes of the word are written, the rest of the header is left
+ * untouched, and values are truncated to the size of the word. For LSB files,
+ * the word is written little-endian.
+ */
+int segy_set_field_forall( segy_file*,
+                           int field,
+                           int start,
+                           int stop,
+                           int step,
+                           const int* buf,
+                           long trace0,
+                           int trace_bsize );
+
+/*
+ * Write the header words `fields` of the traces in the range [start, stop)
+ * with step, from buf, which is laid out field-major like the output of
+ * segy_fields_forall, i.e. the nth word of the ith trace in the range is
+ * buf[n * slicelen + i].
+ *
+ * Like segy_set_field_forall, only the bytes of the words are written, and
+ * every trace header is visited once for all the fields.
+ */
+int segy_set_fields_forall( segy_file*,
+                            const int* fields,
+                            int nfields,
+                            int start,
+                            int stop,
+                            int step,
+                            const int* buf,
+                            long trace0,
+                            int trace_bsize );
+
+/*
+ * Read the header words `fields` of the traces in the range [start, stop) with
+ * step, and write them field-major to buf, i.e. the nth word of the ith trace
+ * in the range is written to buf[n * slicelen + i]. buf must have room for
+ * nfields * slicelen ints.
+ *
+ * Every trace header is read once for all the fields, and traces close on
+ * disk are read in large, sequential chunks when the file is not memory
+ * mapped. This is considerably faster than calling segy_field_forall once per
+ * field.
+ */
+int segy_fields_forall( segy_file*,
+                        const int* fields,
+                        int nfields,
+                        int start,
+                        int stop,
+                        int step,
+                        int* buf,
+                        long trace0,
+                        int trace_bsize );
+
 /*
  * exception: segy_trace_bsize computes the size of the traces in bytes. Cannot
  * fail. Equivalent to segy_trsize(SEGY_IBM_FLOAT_4_BYTE, samples);
@@ -175,6 +247,36 @@ int segy_write_traceheader( segy_file*,
                             long trace0,
                             int trace_bsize );
 
+/*
+ * Read the trace headers in the range [start, stop) with step into `buf`,
+ * back-to-back, i.e. the header of the ith trace in the range is written to
+ * buf[i * SEGY_TRACE_HEADER_SIZE]. buf must have room for slicelen headers.
+ *
+ * Like segy_traceheader, the headers are always big-endian in `buf`. When
+ * the file is not memory mapped and the headers are close on disk, many
+ * headers are read in one go.
+ */
+int segy_traceheaders( segy_file*,
+                       int start,
+                       int stop,
+                       int step,
+                       char* buf,
+                       long trace0,
+                       int trace_bsize );
+
+/*
+ * Write the back-to-back, big-endian trace headers in `buf` to the traces in
+ * the range [start, stop) with step. This is the inverse of
+ * segy_traceheaders. Combined, they copy headers between LSB and MSB files.
+ */
+int segy_write_traceheaders( segy_file*,
+                             int start,
+                             int stop,
+                             int step,
+                             const char* buf,
+                             long trace0,
+                             int trace_bsize );
+
 /*
  * The sorting type will be written to `sorting` if the function can figure out
  * how the file is sorted.
@@ -270,6 +372,85 @@ int segy_writesubtr( segy_file*,
                      long trace0,
                      int trace_bsize );
 
+/*
+ * Read a sub trace, like segy_readsubtr, and convert it to native
+ * representation, like segy_to_native. `format` must agree with the format the
+ * file was configured with in segy_set_format.
+ *
+ * For memory-mapped files, the samples are decoded straight from the mapping
+ * into buf in a single pass, which avoids the separate copy, byteswap and
+ * conversion passes. Otherwise, this is equivalent to segy_readsubtr followed
+ * by segy_to_native.
+ */
+int segy_readsubtr_native( segy_file*,
+                           int traceno,
+                           int start,
+                           int stop,
+                           int step,
+                           int format,
+                           void* buf,
+                           void* rangebuf,
+                           long trace0,
+                           int trace_bsize );
+
+/*
+ * Read the `count` traces with numbers `traces`, in that order, into buf, and
+ * convert them to native representation. buf must be at least count *
+ * trace_bsize bytes. The trace numbers can be in any order and can repeat.
+ *
+ * Traces that are adjacent, or close and equally spaced, on disk are read
+ * with a single read, rather than one read per trace. Returns
+ * SEGY_INVALID_ARGS if a trace number is negative.
+ */
+int segy_readtraces_native( segy_file*,
+                            const int* traces,
+                            int count,
+                            int format,
+                            void* buf,
+                            long trace0,
+                            int trace_bsize );
+
+/*
+ * Read the samples [start, stop) with step of the `count` traces with numbers
+ * `traces`, like segy_readtraces_native. buf must be at least count *
+ * slicelength(start, stop, step) * elemsize bytes, and is laid out trace by
+ * trace. Only the bytes in the sample window are read from traces that are
+ * not merged with their neighbours. step must be positive.
+ */
+int segy_readsubtraces_native( segy_file*,
+                               const int* traces,
+                               int count,
+                               int start,
+                               int stop,
+                               int step,
+                               int format,
+                               void* buf,
+                               long trace0,
+                               int trace_bsize );
+
+/*
+ * Read the samples [start, stop) with step of the `count` traces traceno,
+ * traceno + stride, traceno + 2 * stride ... into buf, converted to native
+ * representation. The output is depth-major, i.e. buf[k * count + i] is
+ * sample start + k * step of trace i, so that every depth is a contiguous
+ * slice. buf must be at least count * slicelength(start, stop, step) *
+ * elemsize bytes.
+ *
+ * Every trace is read once, and the sample windows of nearby traces are read
+ * in a single read. step must be positive.
+ */
+int segy_readdepths_native( segy_file*,
+                            int traceno,
+                            int count,
+                            int stride,
+                            int start,
+                            int stop,
+                            int step,
+                            int format,
+                            void* buf,
+                            long trace0,
+                            int trace_bsize );
+
 /*
  * convert to/from native float from segy formats (likely IBM or IEEE).  Size
  * parameter is long long because it needs to know the number of *samples*,
@@ -345,6 +526,26 @@ int segy_lines_count( segy_file*,
                       int* xl_count,
                       long trace0,
                       int trace_bsize );
+/*
+ * Infer the geometry of the file: its sorting, number of offsets, and number
+ * of inlines and crosslines. The results are the same as those of
+ * segy_sorting, segy_offsets and segy_lines_count, but every trace header is
+ * read at most once, and the headers are read in bulk.
+ *
+ * Returns SEGY_INVALID_SORTING if the file is not sorted, and SEGY_NOTFOUND if
+ * the line count does not add up, like segy_lines_count.
+ */
+int segy_geometry( segy_file*,
+                   int il,
+                   int xl,
+                   int tr_offset,
+                   int* sorting,
+                   int* offsets,
+                   int* il_count,
+                   int* xl_count,
+                   long trace0,
+                   int trace_bsize );
+
 /*
  * Find the `line_length` for the inlines. Assumes all inlines, crosslines and
  * traces don't vary in length.
@@ -630,6 +831,7 @@ typedef enum {
     SEGY_MMAP_INVALID,
     SEGY_READONLY,
     SEGY_NOTFOUND,
+    SEGY_MEMORY_ERROR,
 } SEGY_ERROR;
 
 #ifdef __cplusplus
@@ -1,7 +1,7 @@
 #define _POSIX_SOURCE /* fileno */
 
 /* 64-bit off_t in ftello */
-#define _POSIX_C_SOURCE 200808L
+#define _POSIX_C_SOURCE 200809L
 #define _FILE_OFFSET_BITS 64
 
 #if defined(_WIN32) || defined(_MSC_VER)
@@ -19,7 +19,12 @@
   #include <sys/stat.h>
 #endif //HAVE_SYS_STAT_H
 
+#ifdef HAVE_PREAD
+  #include <unistd.h>
+#endif //HAVE_PREAD
+
 #include <assert.h>
+#include <errno.h>
 #include <limits.h>
 #include <math.h>
 #include <stdbool.h>
@@ -204,6 +209,84 @@ static inline void native_ibm( void* buf ) {
     memcpy( buf, &u, sizeof( u ) );
 }
 
+/*
+ * Branch- and table free versions of ibm_native and native_ibm, that operate
+ * on (host order) words. They are bit-exact with the table-based versions, but
+ * only use arithmetic and compares, so that loops over them can be
+ * auto-vectorised.
+ *
+ * The table lookups are replaced by the shift it encodes. For ibm -> ieee, the
+ * shift is the number of leading zero bits in the top hex digit of the
+ * mantissa (capped at 3), and mt[ix] = 1 << shift,
+ * it[ix] = 0x20c00000 + (shift << 22).
+ *
+ * For ieee -> ibm, the shift is (ix + 1) % 4, with mt[ix] = 1 << shift and
+ * it[ix] = 0x21000000 + (0x00100000 << shift), plus one hex exponent when
+ * shift is zero.
+ */
+static inline uint32_t ibm_native_word( uint32_t u ) {
+    const uint32_t manthi = u & 0x00ffffff;
+    const uint32_t ix     = manthi >> 21;
+    const uint32_t shift  = (ix < 1) + (ix < 2) + (ix < 4);
+    const uint32_t iexp   = ( ( u & 0x7f000000 )
+                          - ( 0x20c00000 + ( shift << 22 ) ) ) << 1;
+    const uint32_t inabs  = u & 0x7fffffff;
+
+    uint32_t x = ( manthi << shift ) + iexp;
+    x = inabs > IEMAXIB ? IEEEMAX : x;
+    x = x | ( u & 0x80000000 );
+    return inabs < IEMINIB ? 0 : x;
+}
+
+static inline uint32_t native_ibm_word( uint32_t u ) {
+    const uint32_t ix     = ( u & 0x01800000 ) >> 23;
+    const uint32_t shift  = ( ix + 1 ) & 3;
+    const uint32_t it     = 0x21000000
+                          + ( 0x00100000 << shift )
+                          + ( shift == 0 ? 0x01000000 : 0 );
+    const uint32_t iexp   = ( ( u & 0x7e000000 ) >> 1 ) + it;
+    const uint32_t manthi = ( ( u & 0x007fffff ) << shift ) >> 3;
+    const uint32_t x      = ( manthi + iexp ) | ( u & 0x80000000 );
+    return ( u & 0x7fffffff ) ? x : 0;
+}
+
+/*
+ * Convert a buffer of big-endian ibm floats to native floats, and back, in a
+ * single pass over memory. On x86 with a compiler that supports it, the loops
+ * are compiled for both the baseline (sse2) and avx2, and the best one is
+ * picked at load time. Other targets (e.g. neon on aarch64) rely on the
+ * compiler's auto-vectoriser for the baseline.
+ */
+#ifdef HAVE_TARGET_CLONES
+    #define SEGY_SIMD_CLONES __attribute__((target_clones("avx2","default")))
+#else
+    #define SEGY_SIMD_CLONES
+#endif // HAVE_TARGET_CLONES
+
+SEGY_SIMD_CLONES
+static void ibm_native_vec( void* buf, long long size ) {
+    char* xs = (char*) buf;
+
+    for( long long i = 0; i < size; ++i ) {
+        uint32_t u;
+        memcpy( &u, xs + i * sizeof( u ), sizeof( u ) );
+        u = ibm_native_word( be32toh( u ) );
+        memcpy( xs + i * sizeof( u ), &u, sizeof( u ) );
+    }
+}
+
+SEGY_SIMD_CLONES
+static void native_ibm_vec( void* buf, long long size ) {
+    char* xs = (char*) buf;
+
+    for( long long i = 0; i < size; ++i ) {
+        uint32_t u;
+        memcpy( &u, xs + i * sizeof( u ), sizeof( u ) );
+        u = htobe32( native_ibm_word( u ) );
+        memcpy( xs + i * sizeof( u ), &u, sizeof( u ) );
+    }
+}
+
 void ibm2ieee( void* to, const void* from ) {
     uint32_t u;
     memcpy( &u, from, sizeof( u ) );
@@ -427,12 +510,15 @@ static int formatsize( int format ) {
 /*
  * addr is NULL if mmap is not found under compilation or if the file is
  * not requested mmap'd. If so, the fallback code path of FILE* is taken
+ *
+ * There is deliberately no cursor in the handle - trace data and headers are
+ * accessed with positional I/O, so that the handle can be shared between
+ * threads.
  */
 
 #define MODEBUF_SIZE 5
 struct segy_file_handle {
     void* addr;
-    void* cur;
     FILE* fp;
     size_t fsize;
     char mode[ MODEBUF_SIZE ];
@@ -527,7 +613,7 @@ int segy_mmap( segy_file* fp ) {
     // cppcheck-suppress memleak
     if( addr == MAP_FAILED ) return SEGY_MMAP_ERROR;
 
-    fp->addr = fp->cur = addr;
+    fp->addr = addr;
     fp->fsize = fsize;
 
     fclose(fp->fp);
@@ -734,6 +820,179 @@ static int32_t bswap_header_word(int32_t f, int word_size) {
     return (int16_t) bswap16((int16_t) f);
 }
 
+/*
+ * memread/memwrite are small utilities to give reading/writing to
+ * memory-mapped files fread/fwrite like behaviour and fail if going outside
+ * the file. Returns SEGY_FREAD/WRITE_ERROR, so that functions that are
+ * read-and-return can just return this function's result
+ */
+#ifdef HAVE_MMAP
+static int memread( void* dest, const segy_file* fp, const void* src, size_t n ) {
+    const void* begin = fp->addr;
+    const void* end = (const char*)fp->addr + fp->fsize;
+    const void* srcend = (const char*)src + n;
+
+    if( src < begin || src > end || srcend > end )
+        return SEGY_FREAD_ERROR;
+
+    memcpy( dest, src, n );
+    return SEGY_OK;
+}
+
+static int memwrite( segy_file* fp, void* dest, const void* src, size_t n ) {
+    const void* begin = fp->addr;
+    const void* end = (const char*)fp->addr + fp->fsize;
+    const void* destend = (const char*)dest + n;
+
+    if( dest < begin || dest > end || destend > end )
+        return SEGY_FWRITE_ERROR;
+
+    memcpy( dest, src, n );
+    return SEGY_OK;
+}
+#endif //HAVE_MMAP
+
+/*
+ * The absolute byte offset of the trace header of traceno
+ */
+static long long trace_pos( int traceno, long trace0, int trace_bsize ) {
+    const long long trsize = (long long)trace_bsize + SEGY_TRACE_HEADER_SIZE;
+    return (long long)trace0 + (traceno * trsize);
+}
+
+/*
+ * The address of [pos, pos + n) in a memory mapped file, or NULL if the range
+ * is not fully inside the file
+ */
+static char* mapped( const segy_file* fp, long long pos, size_t n ) {
+    if( pos < 0 ) return NULL;
+    if( (unsigned long long)pos + n > fp->fsize ) return NULL;
+    return (char*)fp->addr + pos;
+}
+
+/*
+ * Absolute seek on the FILE*, which handles offsets >2G also on platforms
+ * where long is 32 bits
+ */
+static int seekto( segy_file* fp, long long pos ) {
+    if( pos < 0 ) return SEGY_FSEEK_ERROR;
+
+    int err;
+#if LONG_MAX == LLONG_MAX
+    assert( pos <= LONG_MAX );
+    err = fseek( fp->fp, (long)pos, SEEK_SET );
+#else
+   /*
+    * If long is 32bit on our platform (hello, windows), we do skips according
+    * to LONG_MAX and seek relative to our cursor rather than absolute on file
+    * begin.
+    */
+    err = SEGY_OK;
+    rewind( fp->fp );
+    while( pos >= LONG_MAX && err == SEGY_OK ) {
+        err = fseek( fp->fp, LONG_MAX, SEEK_CUR );
+        pos -= LONG_MAX;
+    }
+
+    if( err != 0 ) return SEGY_FSEEK_ERROR;
+
+    assert( pos <= LONG_MAX );
+    err = fseek( fp->fp, (long)pos, SEEK_CUR );
+#endif
+
+    if( err != 0 ) return SEGY_FSEEK_ERROR;
+    return SEGY_OK;
+}
+
+/*
+ * Reads of traces that are close on disk are merged, as long as the bytes in
+ * between that are read only to be thrown away stay below MERGE_GAP per trace,
+ * and a single read stays below MERGE_MAX.
+ */
+#define MERGE_GAP (64 * 1024)
+#define MERGE_MAX (16 * 1024 * 1024)
+
+/*
+ * readat/writeat read and write n bytes at the absolute byte offset pos,
+ * pread/pwrite style. They neither use nor move a file position, so
+ * concurrent calls on the same handle are safe. This is what makes the
+ * trace- and trace header functions usable from multiple threads.
+ *
+ * Without pread (notably windows) this falls back to fseek + fread, which is
+ * *not* safe for concurrent use.
+ *
+ * The FILE* is still used for the textual and binary headers. Since those
+ * regions never overlap with trace data, buffered (FILE*) and positional I/O
+ * don't step on each other.
+ */
+static int readat( segy_file* fp, void* buf, size_t n, long long pos ) {
+    if( pos < 0 ) return SEGY_FSEEK_ERROR;
+
+    if( fp->addr ) {
+        const char* src = mapped( fp, pos, n );
+        if( !src ) return SEGY_FREAD_ERROR;
+        memcpy( buf, src, n );
+        return SEGY_OK;
+    }
+
+#ifdef HAVE_PREAD
+    const int fd = fileno( fp->fp );
+    char* dst = (char*)buf;
+    while( n > 0 ) {
+        const ssize_t readc = pread( fd, dst, n, (off_t)pos );
+        if( readc < 0 && errno == EINTR ) continue;
+        if( readc <= 0 ) return SEGY_FREAD_ERROR;
+
+        dst += readc;
+        pos += readc;
+        n -= readc;
+    }
+
+    return SEGY_OK;
+#else
+    const int err = seekto( fp, pos );
+    if( err != SEGY_OK ) return err;
+
+    const size_t readc = fread( buf, 1, n, fp->fp );
+    if( readc != n ) return SEGY_FREAD_ERROR;
+    return SEGY_OK;
+#endif //HAVE_PREAD
+}
+
+static int writeat( segy_file* fp, const void* buf, size_t n, long long pos ) {
+    if( pos < 0 ) return SEGY_FSEEK_ERROR;
+
+    if( fp->addr ) {
+        char* dst = mapped( fp, pos, n );
+        if( !dst ) return SEGY_FWRITE_ERROR;
+        memcpy( dst, buf, n );
+        return SEGY_OK;
+    }
+
+#ifdef HAVE_PREAD
+    const int fd = fileno( fp->fp );
+    const char* src = (const char*)buf;
+    while( n > 0 ) {
+        const ssize_t writec = pwrite( fd, src, n, (off_t)pos );
+        if( writec < 0 && errno == EINTR ) continue;
+        if( writec <= 0 ) return SEGY_FWRITE_ERROR;
+
+        src += writec;
+        pos += writec;
+        n -= writec;
+    }
+
+    return SEGY_OK;
+#else
+    const int err = seekto( fp, pos );
+    if( err != SEGY_OK ) return err;
+
+    const size_t writec = fwrite( buf, 1, n, fp->fp );
+    if( writec != n ) return SEGY_FWRITE_ERROR;
+    return SEGY_OK;
+#endif //HAVE_PREAD
+}
+
 int segy_field_forall( segy_file* fp,
                        int field,
                        int start,
@@ -757,26 +1016,29 @@ int segy_field_forall( segy_file* fp,
 
     // check *once* that we don't look past the end-of-file
     // checking seek error inside the loop is a performance killer
-    err = segy_seek( fp, start, trace0, trace_bsize );
-    if( err != SEGY_OK ) return err;
     const int end = start + step * (slicelen - 1);
-    err = segy_seek( fp, end, trace0, trace_bsize );
-    if( err != SEGY_OK ) return err;
+    const long long first = trace_pos( start, trace0, trace_bsize );
+    const long long last  = trace_pos( end,   trace0, trace_bsize );
+    if( first < 0 || last < 0 ) return SEGY_FSEEK_ERROR;
 
     const int lsb = fp->lsb;
 
-#ifdef HAVE_MMAP
     if( fp->addr ) {
+        if( !mapped( fp, first, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FREAD_ERROR;
+        if( !mapped( fp, last, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FREAD_ERROR;
+
         for( int i = start; slicelen > 0; i += step, ++buf, --slicelen ) {
-            segy_seek( fp, i, trace0, trace_bsize );
-            get_field( fp->cur, field_size, field, &f );
+            const char* src = (const char*)fp->addr
+                            + trace_pos( i, trace0, trace_bsize );
+            get_field( src, field_size, field, &f );
             if (lsb) f = bswap_header_word(f, word_size);
             *buf = f;
         }
 
         return SEGY_OK;
     }
-#endif //HAVE_MMAP
 
     /*
      * non-mmap path. Doing multiple freads is slow, so instead the *actual*
@@ -789,10 +1051,9 @@ int segy_field_forall( segy_file* fp,
      */
     const int zfield = field - 1;
     for( int i = start; slicelen > 0; i += step, ++buf, --slicelen ) {
-        err = segy_seek( fp, i, trace0 + zfield, trace_bsize );
-        if( err != 0 ) return SEGY_FSEEK_ERROR;
-        size_t readc = fread( header + zfield, sizeof(uint32_t), 1, fp->fp );
-        if( readc != 1 ) return SEGY_FREAD_ERROR;
+        const long long pos = trace_pos( i, trace0, trace_bsize ) + zfield;
+        err = readat( fp, header + zfield, sizeof(uint32_t), pos );
+        if( err != SEGY_OK ) return err;
 
         get_field( header, field_size, field, &f );
         if (lsb) f = bswap_header_word(f, word_size);
@@ -802,34 +1063,237 @@ int segy_field_forall( segy_file* fp,
     return SEGY_OK;
 }
 
-/*
- * memread/memwrite are small utilities to give reading/writing to
- * memory-mapped files fread/fwrite like behaviour and fail if going outside
- * the file. Returns SEGY_FREAD/WRITE_ERROR, so that functions that are
- * read-and-return can just return this function's result
- */
-static int memread( void* dest, const segy_file* fp, const void* src, size_t n ) {
-    const void* begin = fp->addr;
-    const void* end = (const char*)fp->addr + fp->fsize;
-    const void* srcend = (const char*)src + n;
+int segy_set_field_forall( segy_file* fp,
+                           int field,
+                           int start,
+                           int stop,
+                           int step,
+                           const int* buf,
+                           long trace0,
+                           int trace_bsize ) {
+    return segy_set_fields_forall( fp, &field, 1,
+                                   start, stop, step,
+                                   buf,
+                                   trace0,
+                                   trace_bsize );
+}
+
+int segy_set_fields_forall( segy_file* fp,
+                            const int* fields,
+                            int nfields,
+                            int start,
+                            int stop,
+                            int step,
+                            const int* buf,
+                            long trace0,
+                            int trace_bsize ) {
+    if( !fp->writable ) return SEGY_READONLY;
+    if( nfields < 0 ) return SEGY_INVALID_ARGS;
 
-    if( src < begin || src > end || srcend > end )
-        return SEGY_FREAD_ERROR;
+    /*
+     * check all fields up front with a dummy-write to a zero-init'd buffer,
+     * and mark the bytes they cover, so that only those are written
+     */
+    char header[ SEGY_TRACE_HEADER_SIZE ] = { 0 };
+    char covered[ SEGY_TRACE_HEADER_SIZE ] = { 0 };
+    for( int k = 0; k < nfields; ++k ) {
+        if( segy_set_field( header, fields[ k ], 0 ) != SEGY_OK )
+            return SEGY_INVALID_ARGS;
+
+        const int zfield = fields[ k ] - 1;
+        memset( covered + zfield, 1, field_size[ fields[ k ] ] );
+    }
+
+    const int slicelen = slicelength( start, stop, step );
+    if( nfields == 0 || slicelen == 0 ) return SEGY_OK;
+
+    // check *once* that we don't look past the end-of-file
+    const int end = start + step * (slicelen - 1);
+    const long long first = trace_pos( start, trace0, trace_bsize );
+    const long long last  = trace_pos( end,   trace0, trace_bsize );
+    if( first < 0 || last < 0 ) return SEGY_FSEEK_ERROR;
+
+    const int lsb = fp->lsb;
+
+    if( fp->addr ) {
+        if( !mapped( fp, first, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FWRITE_ERROR;
+        if( !mapped( fp, last, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FWRITE_ERROR;
+
+        for( int i = 0; i < slicelen; ++i ) {
+            char* dst = (char*)fp->addr
+                      + trace_pos( start + i * step, trace0, trace_bsize );
+
+            for( int k = 0; k < nfields; ++k ) {
+                int32_t f = buf[ k * slicelen + i ];
+                if( lsb ) f = bswap_header_word( f, field_size[ fields[ k ] ] );
+                set_field( dst, field_size, fields[ k ], f );
+            }
+        }
+
+        return SEGY_OK;
+    }
+
+    /*
+     * non-mmap path. Encode the words into the local header buffer, and write
+     * only the runs of bytes covered by the words, so that the rest of the
+     * header doesn't have to be read first. Adjacent words are written
+     * together.
+     */
+    for( int i = 0; i < slicelen; ++i ) {
+        for( int k = 0; k < nfields; ++k ) {
+            int32_t f = buf[ k * slicelen + i ];
+            if( lsb ) f = bswap_header_word( f, field_size[ fields[ k ] ] );
+            set_field( header, field_size, fields[ k ], f );
+        }
+
+        const long long pos = trace_pos( start + i * step, trace0, trace_bsize );
+        for( int lo = 0; lo < SEGY_TRACE_HEADER_SIZE; ) {
+            if( !covered[ lo ] ) { ++lo; continue; }
+
+            int hi = lo;
+            while( hi < SEGY_TRACE_HEADER_SIZE && covered[ hi ] ) ++hi;
+
+            const int err = writeat( fp, header + lo, hi - lo, pos + lo );
+            if( err != SEGY_OK ) return err;
+            lo = hi;
+        }
+    }
 
-    memcpy( dest, src, n );
     return SEGY_OK;
 }
 
-static int memwrite( segy_file* fp, void* dest, const void* src, size_t n ) {
-    const void* begin = fp->addr;
-    const void* end = (const char*)fp->addr + fp->fsize;
-    const void* destend = (const char*)dest + n;
+int segy_fields_forall( segy_file* fp,
+                        const int* fields,
+                        int nfields,
+                        int start,
+                        int stop,
+                        int step,
+                        int* buf,
+                        long trace0,
+                        int trace_bsize ) {
+    if( nfields < 0 ) return SEGY_INVALID_ARGS;
 
-    if( dest < begin || dest > end || destend > end )
-        return SEGY_FWRITE_ERROR;
+    /*
+     * check all fields up front, and find the span [lo, hi) of the header
+     * that covers them, so that only that span is read when traces are far
+     * apart
+     */
+    int lo = SEGY_TRACE_HEADER_SIZE;
+    int hi = 0;
+    for( int k = 0; k < nfields; ++k ) {
+        int32_t f;
+        char header[ SEGY_TRACE_HEADER_SIZE ] = { 0 };
+        if( segy_get_field( header, fields[ k ], &f ) != SEGY_OK )
+            return SEGY_INVALID_ARGS;
 
-    memcpy( dest, src, n );
-    return SEGY_OK;
+        const int zfield = fields[ k ] - 1;
+        if( zfield < lo ) lo = zfield;
+        if( zfield + field_size[ fields[ k ] ] > hi )
+            hi = zfield + field_size[ fields[ k ] ];
+    }
+
+    const int slicelen = slicelength( start, stop, step );
+    if( nfields == 0 || slicelen == 0 ) return SEGY_OK;
+
+    const int end = start + step * (slicelen - 1);
+    const long long first = trace_pos( start, trace0, trace_bsize );
+    const long long last  = trace_pos( end,   trace0, trace_bsize );
+    if( first < 0 || last < 0 ) return SEGY_FSEEK_ERROR;
+
+    const int lsb = fp->lsb;
+
+    if( fp->addr ) {
+        if( !mapped( fp, first, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FREAD_ERROR;
+        if( !mapped( fp, last, SEGY_TRACE_HEADER_SIZE ) )
+            return SEGY_FREAD_ERROR;
+
+        for( int i = 0; i < slicelen; ++i ) {
+            const char* src = (const char*)fp->addr
+                            + trace_pos( start + i * step, trace0, trace_bsize );
+
+            for( int k = 0; k < nfields; ++k ) {
+                int32_t f;
+                get_field( src, field_size, fields[ k ], &f );
+                if( lsb ) f = bswap_header_word( f, field_size[ fields[ k ] ] );
+                buf[ k * slicelen + i ] = f;
+            }
+        }
+
+        return SEGY_OK;
+    }
+
+    /*
+     * non-mmap path. When the headers are close (small traces, small step),
+     * read a chunk of many traces in one go and pick the headers out of it.
+     * Otherwise, only read the span of the header that holds the fields, once
+     * per trace.
+     */
+    const long long trsize = SEGY_TRACE_HEADER_SIZE + (long long)trace_bsize;
+    const long long dist = step < 0 ? -(long long)step : step;
+    const int merge = dist * trsize - SEGY_TRACE_HEADER_SIZE <= MERGE_GAP;
+
+    if( !merge ) {
+        char header[ SEGY_TRACE_HEADER_SIZE ];
+        for( int i = 0; i < slicelen; ++i ) {
+            const long long pos = trace_pos( start + i * step,
+                                             trace0,
+                                             trace_bsize );
+            const int err = readat( fp, header + lo, hi - lo, pos + lo );
+            if( err != SEGY_OK ) return err;
+
+            for( int k = 0; k < nfields; ++k ) {
+                int32_t f;
+                get_field( header, field_size, fields[ k ], &f );
+                if( lsb ) f = bswap_header_word( f, field_size[ fields[ k ] ] );
+                buf[ k * slicelen + i ] = f;
+            }
+        }
+
+        return SEGY_OK;
+    }
+
+    const long long maxlen = (MERGE_MAX - SEGY_TRACE_HEADER_SIZE)
+                           / (dist * trsize) + 1;
+    const int chunklen = maxlen < slicelen ? (int)maxlen : slicelen;
+    const long long span = (chunklen - 1) * dist * trsize
+                         + SEGY_TRACE_HEADER_SIZE;
+    char* chunk = malloc( span );
+    if( !chunk ) return SEGY_MEMORY_ERROR;
+
+    int err = SEGY_OK;
+    for( int i = 0; i < slicelen && err == SEGY_OK; i += chunklen ) {
+        const int n = slicelen - i < chunklen ? slicelen - i : chunklen;
+
+        /*
+         * with a negative step, the chunk is read from the last (lowest)
+         * trace in it
+         */
+        const int a = start + i * step;
+        const int b = start + (i + n - 1) * step;
+        const int lowest = a < b ? a : b;
+        const long long pos = trace_pos( lowest, trace0, trace_bsize );
+        const long long len = (n - 1) * dist * trsize + SEGY_TRACE_HEADER_SIZE;
+        err = readat( fp, chunk, len, pos );
+        if( err != SEGY_OK ) break;
+
+        for( int j = 0; j < n; ++j ) {
+            const int traceno = start + (i + j) * step;
+            const char* src = chunk + (traceno - lowest) * trsize;
+
+            for( int k = 0; k < nfields; ++k ) {
+                int32_t f;
+                get_field( src, field_size, fields[ k ], &f );
+                if( lsb ) f = bswap_header_word( f, field_size[ fields[ k ] ] );
+                buf[ k * slicelen + i + j ] = f;
+            }
+        }
+    }
+
+    free( chunk );
+    return err;
 }
 
 static int bswap_bin( char* xs, int lsb ) {
@@ -1037,50 +1501,19 @@ int segy_seek( segy_file* fp,
                long trace0,
                int trace_bsize ) {
 
-    trace_bsize += SEGY_TRACE_HEADER_SIZE;
-    long long pos = (long long)trace0 + (trace * (long long)trace_bsize);
-
-#ifdef HAVE_MMAP
-    if( fp->addr ) {
-        /*
-         * mmap fseek doesn't fail (it's just a pointer readjustment) and won't
-         * set errno, in order to keep its behaviour consistent with fseek,
-         * which can easily reposition itself past the end-of-file
-         */
-        fp->cur = (char*)fp->addr + pos;
-        return SEGY_OK;
-    }
-#endif //HAVE_MMAP
+    /*
+     * memory mapped files have no cursor - all reads and writes are
+     * positional. mmap seek doesn't fail, in order to keep its behaviour
+     * consistent with fseek, which can easily reposition itself past the
+     * end-of-file
+     */
+    if( fp->addr ) return SEGY_OK;
 
-    int err;
-#if LONG_MAX == LLONG_MAX
-    assert( pos <= LONG_MAX );
-    err = fseek( fp->fp, (long)pos, SEEK_SET );
-#else
-   /*
-    * If long is 32bit on our platform (hello, windows), we do skips according
-    * to LONG_MAX and seek relative to our cursor rather than absolute on file
-    * begin.
-    */
-    err = SEGY_OK;
-    rewind( fp->fp );
-    while( pos >= LONG_MAX && err == SEGY_OK ) {
-        err = fseek( fp->fp, LONG_MAX, SEEK_CUR );
-        pos -= LONG_MAX;
-    }
+    return seekto( fp, trace_pos( trace, trace0, trace_bsize ) );
+}
 
-    if( err != 0 ) return SEGY_FSEEK_ERROR;
-
-    assert( pos <= LONG_MAX );
-    err = fseek( fp->fp, (long)pos, SEEK_CUR );
-#endif
-
-    if( err != 0 ) return SEGY_FSEEK_ERROR;
-    return SEGY_OK;
-}
-
-static int bswap_th( char* xs, int lsb ) {
-    if( !lsb ) return SEGY_OK;
+static int bswap_th( char* xs, int lsb ) {
+    if( !lsb ) return SEGY_OK;
 
     const int bytes4[] = {
         SEGY_TR_CDP_X,
@@ -1206,19 +1639,9 @@ int segy_traceheader( segy_file* fp,
                       long trace0,
                       int trace_bsize ) {
 
-    const int err = segy_seek( fp, traceno, trace0, trace_bsize );
-    if( err != 0 ) return err;
-
-    if( fp->addr ) {
-        const int errm = memread( buf, fp, fp->cur, SEGY_TRACE_HEADER_SIZE );
-        if( errm ) return errm;
-        return bswap_th( buf, fp->lsb );
-    }
-
-    const size_t readc = fread( buf, 1, SEGY_TRACE_HEADER_SIZE, fp->fp );
-
-    if( readc != SEGY_TRACE_HEADER_SIZE )
-        return SEGY_FREAD_ERROR;
+    const long long pos = trace_pos( traceno, trace0, trace_bsize );
+    const int err = readat( fp, buf, SEGY_TRACE_HEADER_SIZE, pos );
+    if( err != SEGY_OK ) return err;
 
     return bswap_th( buf, fp->lsb );
 }
@@ -1230,20 +1653,101 @@ int segy_write_traceheader( segy_file* fp,
                             int trace_bsize ) {
     if( !fp->writable ) return SEGY_READONLY;
 
-    const int err = segy_seek( fp, traceno, trace0, trace_bsize );
-    if( err != 0 ) return err;
-
     char swapped[ SEGY_TRACE_HEADER_SIZE ];
     memcpy( swapped, buf, SEGY_TRACE_HEADER_SIZE );
     bswap_th( swapped, fp->lsb );
 
-    if( fp->addr )
-        return memwrite( fp, fp->cur, swapped, SEGY_TRACE_HEADER_SIZE );
+    const long long pos = trace_pos( traceno, trace0, trace_bsize );
+    return writeat( fp, swapped, SEGY_TRACE_HEADER_SIZE, pos );
+}
 
-    const size_t writec = fwrite( swapped, 1, SEGY_TRACE_HEADER_SIZE, fp->fp );
+int segy_traceheaders( segy_file* fp,
+                       int start,
+                       int stop,
+                       int step,
+                       char* buf,
+                       long trace0,
+                       int trace_bsize ) {
+    const int slicelen = slicelength( start, stop, step );
+    if( slicelen == 0 ) return SEGY_OK;
+
+    const long long trsize = SEGY_TRACE_HEADER_SIZE + (long long)trace_bsize;
+    const long long dist = step < 0 ? -(long long)step : step;
+    const int merge = !fp->addr
+                   && dist * trsize - SEGY_TRACE_HEADER_SIZE <= MERGE_GAP;
+
+    if( !merge ) {
+        for( int i = 0; i < slicelen; ++i ) {
+            char* dst = buf + (long long)i * SEGY_TRACE_HEADER_SIZE;
+            const int err = segy_traceheader( fp, start + i * step,
+                                                  dst,
+                                                  trace0,
+                                                  trace_bsize );
+            if( err != SEGY_OK ) return err;
+        }
 
-    if( writec != SEGY_TRACE_HEADER_SIZE )
-        return SEGY_FWRITE_ERROR;
+        return SEGY_OK;
+    }
+
+    /*
+     * The headers are close (small traces, small step), so read a chunk of
+     * many traces in one go and pick the headers out of it, like
+     * segy_fields_forall
+     */
+    const long long maxlen = (MERGE_MAX - SEGY_TRACE_HEADER_SIZE)
+                           / (dist * trsize) + 1;
+    const int chunklen = maxlen < slicelen ? (int)maxlen : slicelen;
+    const long long span = (chunklen - 1) * dist * trsize
+                         + SEGY_TRACE_HEADER_SIZE;
+    char* chunk = malloc( span );
+    if( !chunk ) return SEGY_MEMORY_ERROR;
+
+    int err = SEGY_OK;
+    for( int i = 0; i < slicelen && err == SEGY_OK; i += chunklen ) {
+        const int n = slicelen - i < chunklen ? slicelen - i : chunklen;
+
+        const int a = start + i * step;
+        const int b = start + (i + n - 1) * step;
+        const int lowest = a < b ? a : b;
+        const long long pos = trace_pos( lowest, trace0, trace_bsize );
+        const long long len = (n - 1) * dist * trsize + SEGY_TRACE_HEADER_SIZE;
+        if( pos < 0 ) { err = SEGY_FSEEK_ERROR; break; }
+
+        err = readat( fp, chunk, len, pos );
+        if( err != SEGY_OK ) break;
+
+        for( int j = 0; j < n; ++j ) {
+            const int traceno = start + (i + j) * step;
+            char* dst = buf + (long long)(i + j) * SEGY_TRACE_HEADER_SIZE;
+            memcpy( dst,
+                    chunk + (traceno - lowest) * trsize,
+                    SEGY_TRACE_HEADER_SIZE );
+            bswap_th( dst, fp->lsb );
+        }
+    }
+
+    free( chunk );
+    return err;
+}
+
+int segy_write_traceheaders( segy_file* fp,
+                             int start,
+                             int stop,
+                             int step,
+                             const char* buf,
+                             long trace0,
+                             int trace_bsize ) {
+    if( !fp->writable ) return SEGY_READONLY;
+
+    const int slicelen = slicelength( start, stop, step );
+    for( int i = 0; i < slicelen; ++i ) {
+        const char* src = buf + (long long)i * SEGY_TRACE_HEADER_SIZE;
+        const int err = segy_write_traceheader( fp, start + i * step,
+                                                    src,
+                                                    trace0,
+                                                    trace_bsize );
+        if( err != SEGY_OK ) return err;
+    }
 
     return SEGY_OK;
 }
@@ -1521,21 +2025,14 @@ int segy_offset_indices( segy_file* fp,
                          int* out,
                          long trace0,
                          int trace_bsize ) {
-    int32_t x = 0;
-    char header[ SEGY_TRACE_HEADER_SIZE ];
-
     if( field_size[ offset_field ] == 0 )
         return SEGY_INVALID_FIELD;
 
-    for( int i = 0; i < offsets; ++i ) {
-        const int err = segy_traceheader( fp, i, header, trace0, trace_bsize );
-        if( err != SEGY_OK ) return err;
-
-        segy_get_field( header, offset_field, &x );
-        *out++ = x;
-    }
-
-    return SEGY_OK;
+    return segy_fields_forall( fp, &offset_field, 1,
+                               0, offsets, 1,
+                               out,
+                               trace0,
+                               trace_bsize );
 }
 
 static int segy_line_indices( segy_file* fp,
@@ -1546,14 +2043,15 @@ static int segy_line_indices( segy_file* fp,
                               int* buf,
                               long trace0,
                               int trace_bsize ) {
-    return segy_field_forall( fp,
-                              field,
-                              traceno,                          /* start */
-                              traceno + (num_indices * stride), /* stop */
-                              stride,                           /* step */
-                              buf,
-                              trace0,
-                              trace_bsize );
+    return segy_fields_forall( fp,
+                               &field,
+                               1,
+                               traceno,                          /* start */
+                               traceno + (num_indices * stride), /* stop */
+                               stride,                           /* step */
+                               buf,
+                               trace0,
+                               trace_bsize );
 }
 
 static int count_lines( segy_file* fp,
@@ -1675,6 +2173,214 @@ int segy_lines_count( segy_file* fp,
     return SEGY_OK;
 }
 
+/*
+ * The inline, crossline and offset words of the traces [start, start + n *
+ * step), read in one go. The words are written field-major to buf, which must
+ * have room for 3 * n ints.
+ */
+static int geometry_words( segy_file* fp,
+                           const int* fields,
+                           int start,
+                           int n,
+                           int step,
+                           int* buf,
+                           long trace0,
+                           int trace_bsize ) {
+    return segy_fields_forall( fp, fields, 3,
+                               start, start + n * step, step,
+                               buf,
+                               trace0,
+                               trace_bsize );
+}
+
+/*
+ * Headers are scanned in chunks that start small, since a post-stack file
+ * needs only a couple of them to determine sorting and offsets, and double in
+ * size up to GEOMETRY_CHUNK_MAX
+ */
+#define GEOMETRY_CHUNK_MIN 16
+#define GEOMETRY_CHUNK_MAX (64 * 1024)
+
+/*
+ * Sorting and offsets are both determined from the first traces of the file,
+ * so scan them once, until both are decided. This is the same procedure as
+ * segy_sorting and segy_offsets.
+ *
+ * The sorting is decided by the first trace where the offset wraps around, or
+ * where the inline or crossline moves before that. The number of offsets is
+ * the first trace where the inline or crossline moves.
+ */
+static int scan_sorting_offsets( segy_file* fp,
+                                 const int* fields,
+                                 const int* first,
+                                 int traces,
+                                 int* buf,
+                                 int* sorting,
+                                 int* offsets,
+                                 long trace0,
+                                 int trace_bsize ) {
+    const int il0 = first[ 0 ];
+    const int xl0 = first[ 1 ];
+    const int of0 = first[ 2 ];
+
+    int sort = traces == 1 ? SEGY_CROSSLINE_SORTING : -1;
+    int offs = traces == 1 ? 1 : -1;
+
+    int chunk = GEOMETRY_CHUNK_MIN;
+    int t = 1;
+    while( t < traces && offs == -1 && sort != SEGY_UNKNOWN_SORTING ) {
+        const int n = traces - t < chunk ? traces - t : chunk;
+        const int err = geometry_words( fp, fields, t, n, 1, buf,
+                                        trace0, trace_bsize );
+        if( err ) return err;
+
+        const int* ils = buf;
+        const int* xls = buf + n;
+        const int* ofs = buf + 2 * n;
+
+        for( int i = 0; i < n && offs == -1; ++i, ++t ) {
+            const int moved = ils[ i ] != il0 || xls[ i ] != xl0;
+
+            if( sort == -1 && ofs[ i ] == of0 ) {
+                if( ils[ i ] == il0 && xls[ i ] != xl0 )
+                    sort = SEGY_INLINE_SORTING;
+                else if( xls[ i ] == xl0 && ils[ i ] != il0 )
+                    sort = SEGY_CROSSLINE_SORTING;
+                else
+                    sort = SEGY_UNKNOWN_SORTING;
+            }
+
+            if( sort == -1 && moved ) sort = SEGY_UNKNOWN_SORTING;
+            if( moved ) offs = t;
+        }
+
+        if( chunk < GEOMETRY_CHUNK_MAX ) chunk *= 2;
+    }
+
+    *sorting = sort == -1 ? SEGY_CROSSLINE_SORTING : sort;
+    *offsets = offs == -1 ? traces : offs;
+    return SEGY_OK;
+}
+
+/*
+ * Count the lines by walking the first trace of every line, at the first
+ * offset, until the line number and offset of the first trace come around
+ * again. This is the same procedure as segy_count_lines. `field` is the index
+ * in `fields` of the line number that changes the fastest.
+ */
+static int scan_lines( segy_file* fp,
+                       const int* fields,
+                       const int* first,
+                       int field,
+                       int traces,
+                       int offsets,
+                       int* buf,
+                       int* out,
+                       long trace0,
+                       int trace_bsize ) {
+    const int ln0 = first[ field ];
+    const int of0 = first[ 2 ];
+
+    int lines = 1;
+    int curr = offsets;
+    int chunk = GEOMETRY_CHUNK_MIN;
+
+    while( curr < traces ) {
+        const int remaining = (traces - curr + offsets - 1) / offsets;
+        const int n = remaining < chunk ? remaining : chunk;
+        const int err = geometry_words( fp, fields, curr, n, offsets, buf,
+                                        trace0, trace_bsize );
+        if( err ) return err;
+
+        const int* lns = buf + field * n;
+        const int* ofs = buf + 2 * n;
+
+        for( int i = 0; i < n; ++i ) {
+            if( ofs[ i ] == of0 && lns[ i ] == ln0 ) {
+                *out = lines;
+                return SEGY_OK;
+            }
+
+            curr += offsets;
+            ++lines;
+        }
+
+        if( chunk < GEOMETRY_CHUNK_MAX ) chunk *= 2;
+    }
+
+    if( curr > traces ) return SEGY_NOTFOUND;
+
+    *out = lines;
+    return SEGY_OK;
+}
+
+int segy_geometry( segy_file* fp,
+                   int il,
+                   int xl,
+                   int tr_offset,
+                   int* sorting,
+                   int* offsets,
+                   int* il_count,
+                   int* xl_count,
+                   long trace0,
+                   int trace_bsize ) {
+
+    const int fields[] = { il, xl, tr_offset };
+    for( int i = 0; i < 3; ++i ) {
+        const int f = fields[ i ];
+        if( f < 0 )
+            return SEGY_INVALID_FIELD;
+        if( f >= SEGY_TRACE_HEADER_SIZE )
+            return SEGY_INVALID_FIELD;
+        if( field_size[ f ] == 0 )
+            return SEGY_INVALID_FIELD;
+    }
+
+    int traces;
+    int err = segy_traces( fp, &traces, trace0, trace_bsize );
+    if( err ) return err;
+
+    int first[ 3 ];
+    err = geometry_words( fp, fields, 0, 1, 1, first, trace0, trace_bsize );
+    if( err ) return err;
+
+    int* buf = malloc( 3 * GEOMETRY_CHUNK_MAX * sizeof( int ) );
+    if( !buf ) return SEGY_MEMORY_ERROR;
+
+    int sort, offs;
+    err = scan_sorting_offsets( fp, fields, first, traces, buf,
+                                &sort, &offs,
+                                trace0, trace_bsize );
+
+    if( !err && sort == SEGY_UNKNOWN_SORTING )
+        err = SEGY_INVALID_SORTING;
+
+    /* the crossline moves fastest in inline sorted files, and vice versa */
+    const int field = sort == SEGY_INLINE_SORTING ? 1 : 0;
+    int l2count = 1;
+    if( !err && traces != offs )
+        err = scan_lines( fp, fields, first, field, traces, offs, buf,
+                          &l2count,
+                          trace0, trace_bsize );
+
+    free( buf );
+    if( err ) return err;
+
+    const int l1count = traces / (l2count * offs);
+
+    *sorting = sort;
+    *offsets = offs;
+    if( sort == SEGY_INLINE_SORTING ) {
+        *il_count = l1count;
+        *xl_count = l2count;
+    } else {
+        *il_count = l2count;
+        *xl_count = l1count;
+    }
+
+    return SEGY_OK;
+}
+
 /*
  * segy_*line_length is rather pointless as a computation, but serve a purpose
  * as an abstraction as the detail on how exactly a length is defined is usually uninteresting
@@ -1731,16 +2437,15 @@ int segy_crossline_indices( segy_file* fp,
     return SEGY_INVALID_SORTING;
 }
 
-static inline int subtr_seek( segy_file* fp,
-                              int traceno,
-                              int start,
-                              int stop,
-                              int elemsize,
-                              long trace0,
-                              int trace_bsize ) {
+static inline long long subtr_pos( int traceno,
+                                   int start,
+                                   int stop,
+                                   int elemsize,
+                                   long trace0,
+                                   int trace_bsize ) {
     /*
      * Optimistically assume that indices are correct by the time they're given
-     * to subtr_seek.
+     * to subtr_pos.
      */
     const int min = start < stop ? start : stop + 1;
     assert( start >= 0 );
@@ -1749,7 +2454,7 @@ static inline int subtr_seek( segy_file* fp,
 
     // skip the trace header and skip everything before min
     trace0 += (min * elemsize) + SEGY_TRACE_HEADER_SIZE;
-    return segy_seek( fp, traceno, trace0, trace_bsize );
+    return trace_pos( traceno, trace0, trace_bsize );
 }
 
 static int reverse( void* buf, int elems, int elemsize ) {
@@ -1845,20 +2550,20 @@ int segy_readsubtr( segy_file* fp,
 
     const int elems = abs( stop - start );
     const int elemsize = fp->elemsize;
+    const size_t len = (size_t)elems * elemsize;
 
-    int err = subtr_seek( fp, traceno, start, stop, elemsize, trace0, trace_bsize );
-    if( err != SEGY_OK ) return err;
+    const long long pos = subtr_pos( traceno,
+                                     start,
+                                     stop,
+                                     elemsize,
+                                     trace0,
+                                     trace_bsize );
+    if( pos < 0 ) return SEGY_FSEEK_ERROR;
 
     // most common case: step == abs(1), reading contiguously
     if( step == 1 || step == -1 ) {
-
-        if( fp->addr ) {
-            err = memread( buf, fp, fp->cur, elemsize * elems );
-            if( err != SEGY_OK ) return err;
-        } else {
-            const int readc = fread( buf, elemsize, elems, fp->fp );
-            if( readc != elems ) return SEGY_FREAD_ERROR;
-        }
+        const int err = readat( fp, buf, len, pos );
+        if( err != SEGY_OK ) return err;
 
         if (fp->lsb) {
             if (fp->elemsize == 8) bswap64vec(buf, elems);
@@ -1882,7 +2587,10 @@ int segy_readsubtr( segy_file* fp,
 
 
     if( fp->addr ) {
-        const char* cur = (char*)fp->cur + elemsize * defstart;
+        const char* cur = mapped( fp, pos, len );
+        if( !cur ) return SEGY_FREAD_ERROR;
+
+        cur += elemsize * defstart;
         for( int i = 0; i < slicelen; cur += step, dst += elemsize, ++i )
             memcpy( dst, cur, elemsize );
 
@@ -1905,12 +2613,12 @@ int segy_readsubtr( segy_file* fp,
      * use, but with a significant performance penalty when no buffer is
      * supplied.
      */
-    void* tracebuf = rangebuf ? rangebuf : malloc( elems * elemsize );
+    void* tracebuf = rangebuf ? rangebuf : malloc( len );
 
-    const int readc = fread( tracebuf, elemsize, elems, fp->fp );
-    if( readc != elems ) {
+    const int err = readat( fp, tracebuf, len, pos );
+    if( err != SEGY_OK ) {
         if( !rangebuf ) free( tracebuf );
-        return SEGY_FREAD_ERROR;
+        return err;
     }
 
     const char* cur = (char*)tracebuf + elemsize * defstart;
@@ -1928,6 +2636,353 @@ int segy_readsubtr( segy_file* fp,
     return SEGY_OK;
 }
 
+/*
+ * Copy n elements, every stride bytes, from src into the contiguous dst, and
+ * decode them to native representation in the same pass. Samples are
+ * byteswapped if swap is set, and (4-byte) IBM floats converted if ibm is set.
+ */
+SEGY_SIMD_CLONES
+static void decode32( char* dst,
+                      const char* src,
+                      int n,
+                      int stride,
+                      int swap,
+                      int ibm ) {
+    uint32_t u;
+    if( swap && ibm ) {
+        for( int i = 0; i < n; ++i, src += stride, dst += sizeof( u ) ) {
+            memcpy( &u, src, sizeof( u ) );
+            u = ibm_native_word( bswap32( u ) );
+            memcpy( dst, &u, sizeof( u ) );
+        }
+    } else if( ibm ) {
+        for( int i = 0; i < n; ++i, src += stride, dst += sizeof( u ) ) {
+            memcpy( &u, src, sizeof( u ) );
+            u = ibm_native_word( u );
+            memcpy( dst, &u, sizeof( u ) );
+        }
+    } else if( swap ) {
+        for( int i = 0; i < n; ++i, src += stride, dst += sizeof( u ) ) {
+            memcpy( &u, src, sizeof( u ) );
+            u = bswap32( u );
+            memcpy( dst, &u, sizeof( u ) );
+        }
+    } else {
+        for( int i = 0; i < n; ++i, src += stride, dst += sizeof( u ) )
+            memcpy( dst, src, sizeof( u ) );
+    }
+}
+
+static void decode( char* dst,
+                    const char* src,
+                    int n,
+                    int stride,
+                    int elemsize,
+                    int swap,
+                    int ibm ) {
+
+    if( elemsize == 4 ) {
+        decode32( dst, src, n, stride, swap, ibm );
+        return;
+    }
+
+    for( int i = 0; i < n; ++i, src += stride, dst += elemsize )
+        memcpy( dst, src, elemsize );
+
+    if( !swap ) return;
+
+    dst -= n * elemsize;
+    switch( elemsize ) {
+        case 8: bswap64vec( dst, n ); break;
+        case 3: bswap24vec( dst, n ); break;
+        case 2: bswap16vec( dst, n ); break;
+        default:                      break;
+    }
+}
+
+int segy_readsubtr_native( segy_file* fp,
+                           int traceno,
+                           int start,
+                           int stop,
+                           int step,
+                           int format,
+                           void* buf,
+                           void* rangebuf,
+                           long trace0,
+                           int trace_bsize ) {
+
+    const int elemsize = fp->elemsize;
+    if( formatsize( format ) != elemsize ) return SEGY_INVALID_ARGS;
+
+    const int slicelen = slicelength( start, stop, step );
+
+    if( !fp->addr ) {
+        /*
+         * no mapping to decode from - read into the output buffer and
+         * convert it, while it's still in cache
+         */
+        const int err = segy_readsubtr( fp,
+                                        traceno,
+                                        start,
+                                        stop,
+                                        step,
+                                        buf,
+                                        rangebuf,
+                                        trace0,
+                                        trace_bsize );
+        if( err != SEGY_OK ) return err;
+        return segy_to_native( format, slicelen, buf );
+    }
+
+    const int elems = abs( stop - start );
+    const size_t len = (size_t)elems * elemsize;
+    const long long pos = subtr_pos( traceno,
+                                     start,
+                                     stop,
+                                     elemsize,
+                                     trace0,
+                                     trace_bsize );
+
+    const char* src = mapped( fp, pos, len );
+    if( !src ) return SEGY_FREAD_ERROR;
+
+    /*
+     * the on-disk byte order is either lsb or msb, and the samples must be
+     * swapped when it differs from the host order
+     */
+    const int swap = fp->lsb ? HOST_MSB : HOST_LSB;
+    const int ibm = format == SEGY_IBM_FLOAT_4_BYTE;
+    const int defstart = start < stop ? 0 : elems - 1;
+
+    decode( (char*)buf,
+            src + elemsize * defstart,
+            slicelen,
+            step * elemsize,
+            elemsize,
+            swap,
+            ibm );
+
+    return SEGY_OK;
+}
+
+int segy_readtraces_native( segy_file* fp,
+                            const int* traces,
+                            int count,
+                            int format,
+                            void* buf,
+                            long trace0,
+                            int trace_bsize ) {
+
+    const int elemsize = fp->elemsize;
+    if( formatsize( format ) != elemsize ) return SEGY_INVALID_ARGS;
+
+    return segy_readsubtraces_native( fp,
+                                      traces,
+                                      count,
+                                      0,
+                                      trace_bsize / elemsize,
+                                      1,
+                                      format,
+                                      buf,
+                                      trace0,
+                                      trace_bsize );
+}
+
+int segy_readsubtraces_native( segy_file* fp,
+                               const int* traces,
+                               int count,
+                               int start,
+                               int stop,
+                               int step,
+                               int format,
+                               void* buf,
+                               long trace0,
+                               int trace_bsize ) {
+
+    const int elemsize = fp->elemsize;
+    if( formatsize( format ) != elemsize ) return SEGY_INVALID_ARGS;
+    if( count < 0 ) return SEGY_INVALID_ARGS;
+
+    const int samples = trace_bsize / elemsize;
+    if( step < 1 || start < 0 || stop > samples ) return SEGY_INVALID_ARGS;
+
+    for( int i = 0; i < count; ++i )
+        if( traces[ i ] < 0 ) return SEGY_INVALID_ARGS;
+
+    const int slicelen = slicelength( start, stop, step );
+    if( count == 0 || slicelen <= 0 ) return SEGY_OK;
+
+    const int swap = fp->lsb ? HOST_MSB : HOST_LSB;
+    const int ibm = format == SEGY_IBM_FLOAT_4_BYTE;
+    const int stride = step * elemsize;
+    const size_t rowsize = (size_t)slicelen * elemsize;
+    char* dst = (char*)buf;
+
+    /* the bytes of every trace that hold the samples in the window */
+    const long long window = ((long long)(slicelen - 1) * step + 1) * elemsize;
+    const long long skip = SEGY_TRACE_HEADER_SIZE + (long long)start * elemsize;
+
+    /*
+     * memory mapped files don't benefit from merging, as there are no
+     * syscalls to save - just decode every trace
+     */
+    if( fp->addr ) {
+        for( int i = 0; i < count; ++i, dst += rowsize ) {
+            const long long pos = trace_pos( traces[ i ], trace0, trace_bsize )
+                                + skip;
+            const char* src = mapped( fp, pos, window );
+            if( !src ) return SEGY_FREAD_ERROR;
+            decode( dst, src, slicelen, stride, elemsize, swap, ibm );
+        }
+
+        return SEGY_OK;
+    }
+
+    const long long trsize = (long long)trace_bsize + SEGY_TRACE_HEADER_SIZE;
+    char* chunk = NULL;
+    long long chunksize = 0;
+    int err = SEGY_OK;
+
+    for( int i = 0; i < count; ) {
+        /*
+         * find the longest run traces[i], traces[i] + d, traces[i] + 2d ...
+         * with a constant, small distance d, that fits in a single read
+         */
+        int run = 1;
+        const long long d = i + 1 < count
+                          ? (long long)traces[ i + 1 ] - traces[ i ]
+                          : 0;
+        const long long dist = d < 0 ? -d : d;
+
+        if( d != 0 && dist * trsize - window <= MERGE_GAP ) {
+            while( i + run < count
+                && traces[ i + run ] - traces[ i + run - 1 ] == d
+                && run * dist * trsize + window <= MERGE_MAX )
+                ++run;
+        }
+
+        const int first = d < 0 ? traces[ i + run - 1 ] : traces[ i ];
+        const long long span = (run - 1) * dist * trsize + window;
+        const long long pos = trace_pos( first, trace0, trace_bsize ) + skip;
+
+        if( span > chunksize ) {
+            char* p = realloc( chunk, span );
+            if( !p ) { err = SEGY_MEMORY_ERROR; break; }
+            chunk = p;
+            chunksize = span;
+        }
+
+        err = readat( fp, chunk, span, pos );
+        if( err != SEGY_OK ) break;
+
+        for( int k = 0; k < run; ++k, ++i, dst += rowsize ) {
+            const char* src = chunk + (traces[ i ] - first) * trsize;
+            decode( dst, src, slicelen, stride, elemsize, swap, ibm );
+        }
+    }
+
+    free( chunk );
+    return err;
+}
+
+int segy_readdepths_native( segy_file* fp,
+                            int traceno,
+                            int count,
+                            int stride,
+                            int start,
+                            int stop,
+                            int step,
+                            int format,
+                            void* buf,
+                            long trace0,
+                            int trace_bsize ) {
+
+    const int elemsize = fp->elemsize;
+    if( formatsize( format ) != elemsize ) return SEGY_INVALID_ARGS;
+
+    const int samples = trace_bsize / elemsize;
+    if( traceno < 0 || count < 0 || stride < 1 || step < 1 )
+        return SEGY_INVALID_ARGS;
+    if( start < 0 || stop > samples ) return SEGY_INVALID_ARGS;
+
+    const int slicelen = slicelength( start, stop, step );
+    if( count == 0 || slicelen <= 0 ) return SEGY_OK;
+
+    const int swap = fp->lsb ? HOST_MSB : HOST_LSB;
+    const int ibm = format == SEGY_IBM_FLOAT_4_BYTE;
+
+    /* the bytes of every trace that hold the samples in the window */
+    const long long window = ((long long)(slicelen - 1) * step + 1) * elemsize;
+    const long long skip = SEGY_TRACE_HEADER_SIZE + (long long)start * elemsize;
+    const long long trsize = SEGY_TRACE_HEADER_SIZE + (long long)trace_bsize;
+    const long long dist = stride * trsize;
+
+    /*
+     * samples are decoded one trace at a time into row, and then scattered
+     * into the depth-major output
+     */
+    char* row = malloc( (size_t)slicelen * elemsize );
+    if( !row ) return SEGY_MEMORY_ERROR;
+
+    char* dst = (char*)buf;
+    const size_t depthsize = (size_t)count * elemsize;
+
+    if( fp->addr ) {
+        for( int i = 0; i < count; ++i ) {
+            const long long pos = trace_pos( traceno + i * stride,
+                                             trace0,
+                                             trace_bsize ) + skip;
+            const char* src = mapped( fp, pos, window );
+            if( !src ) { free( row ); return SEGY_FREAD_ERROR; }
+
+            decode( row, src, slicelen, step * elemsize, elemsize, swap, ibm );
+            for( int k = 0; k < slicelen; ++k )
+                memcpy( dst + k * depthsize + (size_t)i * elemsize,
+                        row + k * elemsize,
+                        elemsize );
+        }
+
+        free( row );
+        return SEGY_OK;
+    }
+
+    /*
+     * non-mmap path. When the windows are close, read the windows of many
+     * traces, and the bytes in between, in one go. Otherwise, read only the
+     * window, once per trace.
+     */
+    const int merge = dist - window <= MERGE_GAP;
+    const long long maxlen = merge ? (MERGE_MAX - window) / dist + 1 : 1;
+    const int chunklen = maxlen < count ? (int)maxlen : count;
+    const long long span = (chunklen - 1) * dist + window;
+
+    char* chunk = malloc( span );
+    if( !chunk ) { free( row ); return SEGY_MEMORY_ERROR; }
+
+    int err = SEGY_OK;
+    for( int i = 0; i < count && err == SEGY_OK; i += chunklen ) {
+        const int n = count - i < chunklen ? count - i : chunklen;
+        const long long pos = trace_pos( traceno + i * stride,
+                                         trace0,
+                                         trace_bsize ) + skip;
+        err = readat( fp, chunk, (n - 1) * dist + window, pos );
+        if( err != SEGY_OK ) break;
+
+        for( int j = 0; j < n; ++j ) {
+            const char* src = chunk + j * dist;
+            decode( row, src, slicelen, step * elemsize, elemsize, swap, ibm );
+            for( int k = 0; k < slicelen; ++k )
+                memcpy( dst + k * depthsize + (size_t)(i + j) * elemsize,
+                        row + k * elemsize,
+                        elemsize );
+        }
+    }
+
+    free( chunk );
+    free( row );
+    return err;
+}
+
 int segy_writetrace( segy_file* fp,
                      int traceno,
                      const void* buf,
@@ -1994,10 +3049,15 @@ int segy_writesubtr( segy_file* fp,
 
     const int elems = abs( stop - start );
     const int elemsize = fp->elemsize;
+    const size_t len = (size_t)elems * elemsize;
 
-    int err = subtr_seek( fp, traceno, start, stop, elemsize, trace0, trace_bsize );
-    if( err != SEGY_OK ) return err;
-
+    const long long pos = subtr_pos( traceno,
+                                     start,
+                                     stop,
+                                     elemsize,
+                                     trace0,
+                                     trace_bsize );
+    if( pos < 0 ) return SEGY_FSEEK_ERROR;
 
     if( step == 1 && !fp->lsb ) {
         /*
@@ -2006,15 +3066,7 @@ int segy_writesubtr( segy_file* fp,
          * (which is const), which in turn may require a memory allocation. It will
          * be handled by the stride-aware code path
          */
-        if( fp->addr ) {
-            err = memwrite( fp, fp->cur, buf, elemsize * elems );
-            if( err ) return err;
-        } else {
-            const int writec = fwrite( buf, elemsize, elems, fp->fp );
-            if( writec != elems ) return SEGY_FWRITE_ERROR;
-        }
-
-        return SEGY_OK;
+        return writeat( fp, buf, len, pos );
     }
 
     /*
@@ -2022,8 +3074,8 @@ int segy_writesubtr( segy_file* fp,
      * swapping
      */
     if( !fp->addr && (step == 1 || step == -1) && fp->lsb ) {
-        void* tracebuf = rangebuf ? rangebuf : malloc( elems * elemsize );
-        memcpy( tracebuf, buf, elemsize * elems );
+        void* tracebuf = rangebuf ? rangebuf : malloc( len );
+        memcpy( tracebuf, buf, len );
 
         if (step == -1) reverse(tracebuf, elems, elemsize);
         if (fp->elemsize == 8) bswap64vec(tracebuf, elems);
@@ -2036,10 +3088,9 @@ int segy_writesubtr( segy_file* fp,
          * only handle fstream path - the mmap is handled comfortably by the
          * stride-aware code path
          */
-        const int writec = fwrite( tracebuf, elemsize, elems, fp->fp );
+        const int err = writeat( fp, tracebuf, len, pos );
         if( !rangebuf ) free( tracebuf );
-        if( writec != elems ) return SEGY_FWRITE_ERROR;
-        return SEGY_OK;
+        return err;
     }
 
     // step != 1, i.e. do strided reads
@@ -2051,7 +3102,9 @@ int segy_writesubtr( segy_file* fp,
 
     if( fp->addr ) {
         /* if mmap is on, strided write is trivial and fast */
-        char* cur = (char*)fp->cur + elemsize * defstart;
+        char* cur = mapped( fp, pos, len );
+        if( !cur ) return SEGY_FWRITE_ERROR;
+        cur += elemsize * defstart;
 
         if( !fp->lsb ) {
             step *= elemsize;
@@ -2068,16 +3121,13 @@ int segy_writesubtr( segy_file* fp,
         return SEGY_OK;
     }
 
-    void* tracebuf = rangebuf ? rangebuf : malloc( elems * elemsize );
+    void* tracebuf = rangebuf ? rangebuf : malloc( len );
 
     // like in readsubtr, read a larger chunk and then step through that
-    const int readc = fread( tracebuf, elemsize, elems, fp->fp );
-    if( readc != elems ) { free( tracebuf ); return SEGY_FREAD_ERROR; }
-    /* rewind, because fread advances the file pointer */
-    err = fseek( fp->fp, -(elems * elemsize), SEEK_CUR );
-    if( err != 0 ) {
+    int err = readat( fp, tracebuf, len, pos );
+    if( err != SEGY_OK ) {
         if( !rangebuf ) free( tracebuf );
-        return SEGY_FSEEK_ERROR;
+        return err;
     }
 
     char* cur = (char*)tracebuf + elemsize * defstart;
@@ -2093,12 +3143,10 @@ int segy_writesubtr( segy_file* fp,
         bswap16vec_strided( cur, src, step, slicelen );
     }
 
-    const int writec = fwrite( tracebuf, elemsize, elems, fp->fp );
+    err = writeat( fp, tracebuf, len, pos );
     if( !rangebuf ) free( tracebuf );
 
-    if( writec != elems ) return SEGY_FWRITE_ERROR;
-
-    return SEGY_OK;
+    return err;
 }
 
 /*
@@ -2147,15 +3195,13 @@ int segy_to_native( int format,
     const int elemsize = formatsize( format );
     if( elemsize < 0 ) return SEGY_INVALID_ARGS;
 
-    segy_native_byteswap( format, size, buf );
-
-    char* dst = (char*)buf;
+    /* byteswap and convert in the same pass */
     if( format == SEGY_IBM_FLOAT_4_BYTE ) {
-        for( long long i = 0; i < size; ++i )
-            ibm_native( dst + i * elemsize );
+        ibm_native_vec( buf, size );
+        return SEGY_OK;
     }
 
-    return SEGY_OK;
+    return segy_native_byteswap( format, size, buf );
 }
 
 int segy_from_native( int format,
@@ -2165,10 +3211,10 @@ int segy_from_native( int format,
     const int elemsize = formatsize( format );
     if( elemsize < 0 ) return SEGY_INVALID_ARGS;
 
-    char* dst = (char*)buf;
+    /* convert and byteswap in the same pass */
     if( format == SEGY_IBM_FLOAT_4_BYTE ) {
-        for( long long i = 0; i < size; ++i )
-            native_ibm( dst + i * elemsize );
+        native_ibm_vec( buf, size );
+        return SEGY_OK;
     }
 
     return segy_native_byteswap( format, size, buf );
@@ -0,0 +1,79 @@
+/*
+ * Throughput of the sample conversion functions, segy_to_native and
+ * segy_from_native, compared to a per-sample ibm2ieee/ieee2ibm loop.
+ *
+ * Not a part of the test suite, run manually:
+ *      bench-native [samples] [repeats]
+ */
+#include <chrono>
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+
+#include <segyio/segy.h>
+#include <segyio/util.h>
+
+namespace {
+
+template< typename F >
+double seconds( int repeats, F f ) {
+    using clock = std::chrono::steady_clock;
+    const auto start = clock::now();
+    for( int i = 0; i < repeats; ++i ) f();
+    const std::chrono::duration< double > elapsed = clock::now() - start;
+    return elapsed.count();
+}
+
+void report( const char* name, double secs, long long samples, int repeats ) {
+    const double bytes = double( samples ) * sizeof( float ) * repeats;
+    std::printf( "%-24s %8.3f s %10.1f MB/s\n",
+                 name, secs, bytes / secs / 1e6 );
+}
+
+}
+
+int main( int argc, char** argv ) {
+    const long long samples = argc > 1 ? std::atoll( argv[ 1 ] ) : 1 << 24;
+    const int repeats = argc > 2 ? std::atoi( argv[ 2 ] ) : 10;
+
+    std::vector< std::uint32_t > xs( samples );
+    std::uint32_t seed = 1;
+    for( auto& x : xs ) {
+        /* xorshift, to get a spread of exponents and mantissas */
+        seed ^= seed << 13;
+        seed ^= seed >> 17;
+        seed ^= seed << 5;
+        x = seed;
+    }
+
+    const int ibm = SEGY_IBM_FLOAT_4_BYTE;
+    const int ieee = SEGY_IEEE_FLOAT_4_BYTE;
+
+    auto buf = xs;
+    report( "ibm2ieee (per sample)", seconds( repeats, [&] {
+        for( auto& x : buf ) ibm2ieee( &x, &x );
+    }), samples, repeats );
+
+    buf = xs;
+    report( "segy_to_native ibm", seconds( repeats, [&] {
+        segy_to_native( ibm, buf.size(), buf.data() );
+    }), samples, repeats );
+
+    buf = xs;
+    report( "ieee2ibm (per sample)", seconds( repeats, [&] {
+        for( auto& x : buf ) ieee2ibm( &x, &x );
+    }), samples, repeats );
+
+    buf = xs;
+    report( "segy_from_native ibm", seconds( repeats, [&] {
+        segy_from_native( ibm, buf.size(), buf.data() );
+    }), samples, repeats );
+
+    buf = xs;
+    report( "segy_to_native ieee", seconds( repeats, [&] {
+        segy_to_native( ieee, buf.size(), buf.data() );
+    }), samples, repeats );
+
+    return 0;
+}
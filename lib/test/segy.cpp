@@ -3,6 +3,7 @@
 #include <cmath>
 #include <iomanip>
 #include <memory>
+#include <thread>
 #include <limits>
 #include <vector>
 #include <array>
@@ -1023,6 +1024,103 @@ TEST_CASE_METHOD( smallcube,
     CHECK_THAT( line, ApproxRange( expected ) );
 }
 
+TEST_CASE_METHOD( smallcube,
+                  "concurrent reads on a shared handle are consistent",
+                  "[c.segy]" ) {
+    const int threads = 4;
+    const int rounds = 50;
+    const int trace_size = samples;
+
+    std::vector< float > expected( traces * trace_size );
+    for( int i = 0; i < traces; ++i ) {
+        Err err = segy_readtrace( fp,
+                                  i,
+                                  expected.data() + (i * trace_size),
+                                  trace0,
+                                  trace_bsize );
+        REQUIRE( success( err ) );
+    }
+
+    std::vector< int > expected_ilines( traces );
+    Err err = segy_field_forall( fp,
+                                 il,
+                                 0, traces, 1,
+                                 expected_ilines.data(),
+                                 trace0,
+                                 trace_bsize );
+    REQUIRE( success( err ) );
+
+    /*
+     * catch assertions are not thread safe, so record the outcome in the
+     * threads and check it after they've been joined
+     */
+    std::vector< std::vector< float > > traces_read( threads );
+    std::vector< std::vector< int > > ilines_read( threads );
+    std::vector< int > errors( threads, SEGY_OK );
+    std::vector< std::thread > workers;
+
+    for( int t = 0; t < threads; ++t ) {
+        workers.emplace_back( [&, t] {
+            auto& xs = traces_read.at( t );
+            auto& ils = ilines_read.at( t );
+            xs.assign( expected.size(), 0 );
+            ils.assign( traces, 0 );
+
+            for( int r = 0; r < rounds; ++r ) {
+                /* read in a different order in every thread */
+                for( int k = 0; k < traces; ++k ) {
+                    const int i = (k * (t + 1) + r) % traces;
+                    const int err = segy_readtrace( fp,
+                                                    i,
+                                                    xs.data() + (i * trace_size),
+                                                    trace0,
+                                                    trace_bsize );
+                    if( err != SEGY_OK ) errors.at( t ) = err;
+                }
+
+                const int err = segy_field_forall( fp,
+                                                   il,
+                                                   0, traces, 1,
+                                                   ils.data(),
+                                                   trace0,
+                                                   trace_bsize );
+                if( err != SEGY_OK ) errors.at( t ) = err;
+            }
+        });
+    }
+
+    for( auto& worker : workers ) worker.join();
+
+    for( int t = 0; t < threads; ++t ) {
+        CHECK( errors.at( t ) == SEGY_OK );
+        CHECK( traces_read.at( t ) == expected );
+        CHECK_THAT( ilines_read.at( t ), Catch::Equals( expected_ilines ) );
+    }
+}
+
+TEST_CASE_METHOD( smallbasic,
+                  "reading traces does not move the file position",
+                  "[c.segy]" ) {
+    if( testcfg::config().memmap ) return;
+
+    char bin[ SEGY_BINARY_HEADER_SIZE ];
+    REQUIRE( success( segy_binheader( fp, bin ) ) );
+    const long long pos = segy_ftell( fp );
+
+    std::vector< float > trace( samples );
+    char header[ SEGY_TRACE_HEADER_SIZE ];
+    int inline_no;
+    REQUIRE( success( segy_readtrace( fp, 10, trace.data(),
+                                      trace0, trace_bsize ) ) );
+    REQUIRE( success( segy_traceheader( fp, 3, header,
+                                        trace0, trace_bsize ) ) );
+    REQUIRE( success( segy_field_forall( fp, SEGY_TR_INLINE,
+                                         4, 5, 1, &inline_no,
+                                         trace0, trace_bsize ) ) );
+
+    CHECK( segy_ftell( fp ) == pos );
+}
+
 template< int Start, int Stop, int Step >
 struct writesubtr {
     segy_file* fp = nullptr;
@@ -1692,6 +1790,722 @@ TEST_CASE("can open 1-byte unsigned char", "[c.segy][format]") {
     f3_in_format< std::uint8_t >(SEGY_UNSIGNED_CHAR_1_BYTE);
 }
 
+namespace {
+
+/*
+ * reference conversions, element-by-element with the scalar ibm2ieee and
+ * ieee2ibm. segy_to_native/segy_from_native must be bit-exact with these
+ */
+std::vector< std::uint32_t > ibm2ieee_each( std::vector< std::uint32_t > xs ) {
+    for( auto& x : xs ) ibm2ieee( &x, &x );
+    return xs;
+}
+
+std::vector< std::uint32_t > ieee2ibm_each( std::vector< std::uint32_t > xs ) {
+    for( auto& x : xs ) ieee2ibm( &x, &x );
+    return xs;
+}
+
+}
+
+TEST_CASE( "IBM float conversion is bit-exact with the scalar conversion",
+           "[c.segy][format]" ) {
+    unique_segy ufp{ openfile( "test-data/Format1", "rb" ) };
+    auto* fp = ufp.get();
+
+    char header[ SEGY_BINARY_HEADER_SIZE ];
+    REQUIRE( Err( segy_binheader( fp, header ) ) == Err::ok() );
+
+    const int samples = segy_samples( header );
+    const long trace0 = segy_trace0( header );
+    const int trace_bsize = segy_trsize( SEGY_IBM_FLOAT_4_BYTE, samples );
+    int traces;
+    REQUIRE( Err( segy_traces( fp, &traces, trace0, trace_bsize ) )
+             == Err::ok() );
+
+    std::vector< std::uint32_t > raw( traces * samples );
+    for( int i = 0; i < traces; ++i ) {
+        Err err = segy_readtrace( fp,
+                                  i,
+                                  raw.data() + i * samples,
+                                  trace0,
+                                  trace_bsize );
+        REQUIRE( err == Err::ok() );
+    }
+
+    auto native = raw;
+    segy_to_native( SEGY_IBM_FLOAT_4_BYTE, native.size(), native.data() );
+    CHECK( native == ibm2ieee_each( raw ) );
+
+    auto ibm = native;
+    segy_from_native( SEGY_IBM_FLOAT_4_BYTE, ibm.size(), ibm.data() );
+    CHECK( ibm == ieee2ibm_each( native ) );
+}
+
+TEST_CASE( "IBM float conversion is bit-exact over the full 32-bit range",
+           "[c.segy][format]" ) {
+    /*
+     * not every bit pattern, but a prime stride over the full range, and the
+     * edges around the special cases (zero, underflow, overflow, sign)
+     */
+    std::vector< std::uint32_t > xs = {
+        0x00000000, 0x80000000, 0x7FFFFFFF, 0xFFFFFFFF,
+        0x21200000, 0x211FFFFF, 0xA1200000, 0xA11FFFFF,
+        0x611FFFFF, 0x61200000, 0xE11FFFFF, 0xE1200000,
+        0x00100000, 0x00200000, 0x00400000, 0x00800000,
+        0x7F800000, 0xFF800000, 0x7FC00000, 0x00000001,
+    };
+
+    for( std::uint64_t x = 0; x <= 0xFFFFFFFF; x += 65521 )
+        xs.push_back( std::uint32_t( x ) );
+
+    auto to_native = xs;
+    segy_to_native( SEGY_IBM_FLOAT_4_BYTE, to_native.size(), to_native.data() );
+    CHECK( to_native == ibm2ieee_each( xs ) );
+
+    auto from_native = xs;
+    segy_from_native( SEGY_IBM_FLOAT_4_BYTE,
+                      from_native.size(),
+                      from_native.data() );
+    CHECK( from_native == ieee2ibm_each( xs ) );
+}
+
+namespace {
+
+void readsubtr_native_in_format( int fmt ) {
+    const auto name = "test-data/Format" + std::to_string( fmt );
+    unique_segy ufp{ openfile( name, "rb" ) };
+    auto* fp = ufp.get();
+
+    char header[ SEGY_BINARY_HEADER_SIZE ];
+    REQUIRE( Err( segy_binheader( fp, header ) ) == Err::ok() );
+    REQUIRE( Err( segy_set_format( fp, fmt ) ) == Err::ok() );
+
+    const int samples = segy_samples( header );
+    const long trace0 = segy_trace0( header );
+    const int trace_bsize = segy_trsize( fmt, samples );
+    const int elemsize = trace_bsize / samples;
+
+    const std::vector< std::array< int, 3 > > slices = {
+        {{ 0, samples, 1 }},
+        {{ samples - 1, -1, -1 }},
+        {{ 3, 60, 4 }},
+        {{ 70, 2, -3 }},
+        {{ 10, 11, 1 }},
+    };
+
+    for( const auto& slice : slices ) {
+        const int start = slice[ 0 ];
+        const int stop  = slice[ 1 ];
+        const int step  = slice[ 2 ];
+        const int len = (std::abs( stop - start ) - 1) / std::abs( step ) + 1;
+
+        for( int traceno : { 0, 17, 413 } ) {
+            std::vector< char > expected( len * elemsize );
+            Err err = segy_readsubtr( fp, traceno,
+                                          start, stop, step,
+                                          expected.data(),
+                                          nullptr,
+                                          trace0,
+                                          trace_bsize );
+            REQUIRE( err == Err::ok() );
+            segy_to_native( fmt, len, expected.data() );
+
+            std::vector< char > native( len * elemsize );
+            err = segy_readsubtr_native( fp, traceno,
+                                             start, stop, step,
+                                             fmt,
+                                             native.data(),
+                                             nullptr,
+                                             trace0,
+                                             trace_bsize );
+            REQUIRE( err == Err::ok() );
+            CHECK( native == expected );
+        }
+    }
+}
+
+}
+
+TEST_CASE( "read sub traces straight to native", "[c.segy][format]" ) {
+    const int formats[] = {
+        SEGY_IBM_FLOAT_4_BYTE,
+        SEGY_SIGNED_INTEGER_4_BYTE,
+        SEGY_SIGNED_SHORT_2_BYTE,
+        SEGY_IEEE_FLOAT_4_BYTE,
+        SEGY_IEEE_FLOAT_8_BYTE,
+        SEGY_SIGNED_CHAR_3_BYTE,
+        SEGY_SIGNED_CHAR_1_BYTE,
+        SEGY_SIGNED_INTEGER_8_BYTE,
+        SEGY_UNSIGNED_INTEGER_4_BYTE,
+        SEGY_UNSIGNED_SHORT_2_BYTE,
+        SEGY_UNSIGNED_INTEGER_8_BYTE,
+        SEGY_UNSIGNED_INTEGER_3_BYTE,
+        SEGY_UNSIGNED_CHAR_1_BYTE,
+    };
+
+    for( const int fmt : formats ) {
+        INFO( "format " << fmt );
+        readsubtr_native_in_format( fmt );
+    }
+}
+
+TEST_CASE( "read sub trace to native with mismatching format fails",
+           "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    std::vector< double > xs( 50 );
+    Err err = segy_readsubtr_native( fp, 0, 0, 50, 1,
+                                     SEGY_IEEE_FLOAT_8_BYTE,
+                                     xs.data(),
+                                     nullptr,
+                                     3600,
+                                     50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "read many traces straight to native", "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int samples = 50;
+    const long trace0 = 3600;
+    const int trace_bsize = samples * 4;
+    const int format = SEGY_IBM_FLOAT_4_BYTE;
+
+    const std::vector< std::vector< int > > cases = {
+        { 0, 1, 2, 3, 4 },
+        { 3, 17, 5, 24, 0 },
+        { 0, 5, 10, 15, 20 },
+        { 24, 20, 16, 12 },
+        { 7, 7, 7, 8, 8 },
+        { 12 },
+        {},
+    };
+
+    for( const auto& traces : cases ) {
+        const int count = traces.size();
+        INFO( "count " << count );
+
+        std::vector< float > expected( count * samples );
+        for( int i = 0; i < count; ++i ) {
+            Err err = segy_readsubtr_native( fp, traces[ i ],
+                                             0, samples, 1,
+                                             format,
+                                             expected.data() + i * samples,
+                                             nullptr,
+                                             trace0,
+                                             trace_bsize );
+            REQUIRE( err == Err::ok() );
+        }
+
+        std::vector< float > xs( count * samples );
+        Err err = segy_readtraces_native( fp, traces.data(), count,
+                                          format,
+                                          xs.data(),
+                                          trace0,
+                                          trace_bsize );
+        REQUIRE( err == Err::ok() );
+        CHECK_THAT( xs, Catch::Equals( expected ) );
+    }
+}
+
+TEST_CASE( "read sample windows of many traces", "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int samples = 50;
+    const long trace0 = 3600;
+    const int trace_bsize = samples * 4;
+    const int format = SEGY_IBM_FLOAT_4_BYTE;
+
+    const std::vector< int > traces = { 0, 1, 2, 10, 15, 20, 24, 3, 3 };
+    const int count = traces.size();
+
+    struct window { int start, stop, step; };
+    const std::vector< window > cases = {
+        {  0, 50, 1 },
+        { 10, 20, 1 },
+        {  3, 40, 4 },
+        { 49, 50, 1 },
+        {  5,  5, 1 },
+    };
+
+    for( const auto& w : cases ) {
+        INFO( "start " << w.start << " stop " << w.stop << " step " << w.step );
+
+        const int len = w.stop > w.start
+                      ? (w.stop - w.start - 1) / w.step + 1
+                      : 0;
+        std::vector< float > expected( count * len );
+        for( int i = 0; i < count; ++i ) {
+            Err err = segy_readsubtr_native( fp, traces[ i ],
+                                             w.start, w.stop, w.step,
+                                             format,
+                                             expected.data() + i * len,
+                                             nullptr,
+                                             trace0,
+                                             trace_bsize );
+            REQUIRE( err == Err::ok() );
+        }
+
+        std::vector< float > xs( count * len );
+        Err err = segy_readsubtraces_native( fp, traces.data(), count,
+                                             w.start, w.stop, w.step,
+                                             format,
+                                             xs.data(),
+                                             trace0,
+                                             trace_bsize );
+        REQUIRE( err == Err::ok() );
+        CHECK_THAT( xs, Catch::Equals( expected ) );
+    }
+
+    std::vector< float > xs( count * samples );
+    Err err = segy_readsubtraces_native( fp, traces.data(), count,
+                                         10, 0, -1,
+                                         format,
+                                         xs.data(),
+                                         trace0,
+                                         trace_bsize );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "read many traces with negative trace number fails",
+           "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int traces[] = { 0, -1 };
+    std::vector< float > xs( 2 * 50 );
+    Err err = segy_readtraces_native( fp, traces, 2,
+                                      SEGY_IBM_FLOAT_4_BYTE,
+                                      xs.data(),
+                                      3600,
+                                      50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "read many depths in one pass", "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int samples = 50;
+    const long trace0 = 3600;
+    const int trace_bsize = samples * 4;
+    const int format = SEGY_IBM_FLOAT_4_BYTE;
+
+    struct window { int traceno, count, stride, start, stop, step; };
+    const std::vector< window > cases = {
+        {  0, 25, 1,  0, 50, 1 },
+        {  0, 25, 1, 10, 11, 1 },
+        {  2,  5, 5,  3, 40, 4 },
+        {  1, 12, 2, 49, 50, 1 },
+        { 24,  1, 1,  0, 50, 7 },
+        {  0,  0, 1,  0, 50, 1 },
+    };
+
+    for( const auto& w : cases ) {
+        INFO( "traceno " << w.traceno << " start " << w.start
+              << " stop " << w.stop << " step " << w.step );
+
+        const int depths = (w.stop - w.start - 1) / w.step + 1;
+        std::vector< float > expected( w.count * depths );
+        std::vector< float > trace( samples );
+        for( int i = 0; i < w.count; ++i ) {
+            Err err = segy_readsubtr_native( fp, w.traceno + i * w.stride,
+                                             0, samples, 1,
+                                             format,
+                                             trace.data(),
+                                             nullptr,
+                                             trace0,
+                                             trace_bsize );
+            REQUIRE( err == Err::ok() );
+            for( int k = 0; k < depths; ++k )
+                expected[ k * w.count + i ] = trace[ w.start + k * w.step ];
+        }
+
+        std::vector< float > xs( w.count * depths );
+        Err err = segy_readdepths_native( fp, w.traceno,
+                                          w.count,
+                                          w.stride,
+                                          w.start,
+                                          w.stop,
+                                          w.step,
+                                          format,
+                                          xs.data(),
+                                          trace0,
+                                          trace_bsize );
+        REQUIRE( err == Err::ok() );
+        CHECK_THAT( xs, Catch::Equals( expected ) );
+    }
+}
+
+TEST_CASE( "read many depths with invalid window fails", "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    std::vector< float > xs( 25 * 50 );
+    const int format = SEGY_IBM_FLOAT_4_BYTE;
+
+    Err err = segy_readdepths_native( fp, 0, 25, 1, 0, 51, 1, format,
+                                      xs.data(), 3600, 50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+
+    err = segy_readdepths_native( fp, 0, 25, 1, 10, 0, -1, format,
+                                  xs.data(), 3600, 50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+
+    err = segy_readdepths_native( fp, -1, 25, 1, 0, 50, 1, format,
+                                  xs.data(), 3600, 50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "reading many fields matches reading them one by one",
+           "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/f3.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const long trace0 = 3600;
+    const int trace_bsize = 75 * 2;
+
+    const std::vector< int > fields = {
+        SEGY_TR_INLINE,
+        SEGY_TR_CROSSLINE,
+        SEGY_TR_OFFSET,
+        SEGY_TR_SAMPLE_COUNT,
+        SEGY_TR_CDP_X,
+        SEGY_TR_SEQ_LINE,
+    };
+
+    const slice slices[] = {
+        { 0, 414, 1 },
+        { 413, -1, -1 },
+        { 5, 400, 3 },
+        { 5, 414, 200 },
+        { 400, 3, -170 },
+        { 10, 11, 1 },
+        { 5, 5, 1 },
+    };
+
+    for( const auto& s : slices ) {
+        INFO( "slice " << str( s ) );
+        const int len = std::max( 0, (int)std::ceil(
+            double( s.stop - s.start ) / s.step ) );
+
+        std::vector< int > expected( fields.size() * len );
+        for( std::size_t k = 0; k < fields.size(); ++k ) {
+            Err err = segy_field_forall( fp, fields[ k ],
+                                         s.start, s.stop, s.step,
+                                         expected.data() + k * len,
+                                         trace0,
+                                         trace_bsize );
+            REQUIRE( err == Err::ok() );
+        }
+
+        std::vector< int > xs( fields.size() * len );
+        Err err = segy_fields_forall( fp, fields.data(), fields.size(),
+                                      s.start, s.stop, s.step,
+                                      xs.data(),
+                                      trace0,
+                                      trace_bsize );
+        REQUIRE( err == Err::ok() );
+        CHECK_THAT( xs, Catch::Equals( expected ) );
+    }
+}
+
+TEST_CASE( "writing a field to every other trace header",
+           "[c.segy]" ) {
+    const std::string name = std::string( "write-field-forall" )
+                           + (testcfg::config().memmap ? "-mmap" : "")
+                           + (testcfg::config().lsbit  ? "-lsb"  : "")
+                           + ".sgy";
+    copyfile( testcfg::config().apply( "test-data/small.sgy" ), name );
+
+    unique_segy ufp{ openfile( name, "r+b" ) };
+    auto* fp = ufp.get();
+
+    const int trace0 = 3600;
+    const int trace_bsize = 50 * 4;
+
+    std::vector< int > inlines( 25 );
+    Err err = segy_field_forall( fp, SEGY_TR_INLINE, 0, 25, 1,
+                                 inlines.data(), trace0, trace_bsize );
+    REQUIRE( success( err ) );
+
+    const std::vector< int > cdpx = { 10, -20, 30, 1 << 20, -(1 << 20) };
+    err = segy_set_field_forall( fp, SEGY_TR_CDP_X, 1, 10, 2,
+                                 cdpx.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+
+    const std::vector< int > scalar = { -100, 100, -1 };
+    err = segy_set_field_forall( fp, SEGY_TR_SOURCE_GROUP_SCALAR, 24, 0, -10,
+                                 scalar.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+
+    std::vector< int > xs( cdpx.size() );
+    err = segy_field_forall( fp, SEGY_TR_CDP_X, 1, 10, 2,
+                             xs.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+    CHECK_THAT( xs, Catch::Equals( cdpx ) );
+
+    xs.resize( scalar.size() );
+    err = segy_field_forall( fp, SEGY_TR_SOURCE_GROUP_SCALAR, 24, 0, -10,
+                             xs.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+    CHECK_THAT( xs, Catch::Equals( scalar ) );
+
+    /* the neighbouring words are untouched */
+    xs.resize( inlines.size() );
+    err = segy_field_forall( fp, SEGY_TR_INLINE, 0, 25, 1,
+                             xs.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+    CHECK_THAT( xs, Catch::Equals( inlines ) );
+
+    err = segy_field_forall( fp, SEGY_TR_CDP_X, 0, 1, 1,
+                             xs.data(), trace0, trace_bsize );
+    CHECK( success( err ) );
+    CHECK( xs.front() == 0 );
+}
+
+TEST_CASE( "writing many fields matches writing one at a time",
+           "[c.segy]" ) {
+    const std::string suffix = std::string()
+                             + (testcfg::config().memmap ? "-mmap" : "")
+                             + (testcfg::config().lsbit  ? "-lsb"  : "")
+                             + ".sgy";
+    const std::string src = testcfg::config().apply( "test-data/small.sgy" );
+    const std::string one  = copyfile( src, "write-fields-one" + suffix );
+    const std::string many = copyfile( src, "write-fields-many" + suffix );
+
+    unique_segy onefp{ openfile( one, "r+b" ) };
+    unique_segy manyfp{ openfile( many, "r+b" ) };
+
+    const int trace0 = 3600;
+    const int trace_bsize = 50 * 4;
+
+    /* 69 and 71 are adjacent, and written together */
+    const std::vector< int > fields = {
+        SEGY_TR_SOURCE_GROUP_SCALAR,
+        SEGY_TR_CDP_X,
+        SEGY_TR_ELEV_SCALAR,
+    };
+
+    const slice s = { 23, 2, -3 };
+    const int len = 7;
+    std::vector< int > values( fields.size() * len );
+    for( std::size_t i = 0; i < values.size(); ++i )
+        values[ i ] = int( i * 7 ) - 50;
+
+    for( std::size_t k = 0; k < fields.size(); ++k ) {
+        Err err = segy_set_field_forall( onefp.get(), fields[ k ],
+                                         s.start, s.stop, s.step,
+                                         values.data() + k * len,
+                                         trace0, trace_bsize );
+        REQUIRE( success( err ) );
+    }
+
+    Err err = segy_set_fields_forall( manyfp.get(),
+                                      fields.data(), fields.size(),
+                                      s.start, s.stop, s.step,
+                                      values.data(),
+                                      trace0, trace_bsize );
+    REQUIRE( success( err ) );
+
+    std::vector< char > x( SEGY_TRACE_HEADER_SIZE );
+    std::vector< char > y( SEGY_TRACE_HEADER_SIZE );
+    for( int i = 0; i < 25; ++i ) {
+        INFO( "trace " << i );
+        err = segy_traceheader( onefp.get(), i, x.data(), trace0, trace_bsize );
+        REQUIRE( success( err ) );
+        err = segy_traceheader( manyfp.get(), i, y.data(), trace0, trace_bsize );
+        REQUIRE( success( err ) );
+        CHECK( x == y );
+    }
+
+    std::vector< int > xs( fields.size() * len );
+    err = segy_fields_forall( manyfp.get(), fields.data(), fields.size(),
+                              s.start, s.stop, s.step,
+                              xs.data(),
+                              trace0, trace_bsize );
+    CHECK( success( err ) );
+    CHECK_THAT( xs, Catch::Equals( values ) );
+}
+
+TEST_CASE( "writing an invalid field or read-only file fails",
+           "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/small.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int val = 1;
+    Err err = segy_set_field_forall( fp, SEGY_TR_INLINE, 0, 1, 1,
+                                     &val, 3600, 50 * 4 );
+    CHECK( err == SEGY_READONLY );
+
+    const std::string name = "write-field-forall-invalid.sgy";
+    copyfile( testcfg::config().apply( "test-data/small.sgy" ), name );
+    unique_segy wfp{ openfile( name, "r+b" ) };
+
+    err = segy_set_field_forall( wfp.get(), SEGY_TR_INLINE + 1, 0, 1, 1,
+                                 &val, 3600, 50 * 4 );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "reading and writing many trace headers",
+           "[c.segy]" ) {
+    const std::string name = std::string( "write-traceheaders" )
+                           + (testcfg::config().memmap ? "-mmap" : "")
+                           + (testcfg::config().lsbit  ? "-lsb"  : "")
+                           + ".sgy";
+    copyfile( testcfg::config().apply( "test-data/f3.sgy" ), name );
+
+    unique_segy ufp{ openfile( name, "r+b" ) };
+    auto* fp = ufp.get();
+
+    const int trace0 = 3600;
+    const int trace_bsize = 75 * 2;
+    const int size = SEGY_TRACE_HEADER_SIZE;
+
+    const slice slices[] = {
+        { 0, 414, 1 },
+        { 413, -1, -1 },
+        { 5, 400, 3 },
+        { 400, 3, -170 },
+        { 5, 5, 1 },
+    };
+
+    for( const auto& s : slices ) {
+        INFO( "slice " << str( s ) );
+        const int len = std::max( 0, (int)std::ceil(
+            double( s.stop - s.start ) / s.step ) );
+
+        std::vector< char > expected( len * size );
+        for( int i = 0; i < len; ++i ) {
+            Err err = segy_traceheader( fp, s.start + i * s.step,
+                                            expected.data() + i * size,
+                                            trace0,
+                                            trace_bsize );
+            REQUIRE( err == Err::ok() );
+        }
+
+        std::vector< char > xs( len * size );
+        Err err = segy_traceheaders( fp, s.start, s.stop, s.step,
+                                         xs.data(),
+                                         trace0,
+                                         trace_bsize );
+        REQUIRE( err == Err::ok() );
+        CHECK( xs == expected );
+    }
+
+    /* write the first 10 headers to 100-109, in reverse */
+    std::vector< char > headers( 10 * size );
+    Err err = segy_traceheaders( fp, 0, 10, 1,
+                                     headers.data(),
+                                     trace0,
+                                     trace_bsize );
+    REQUIRE( err == Err::ok() );
+
+    err = segy_write_traceheaders( fp, 109, 99, -1,
+                                       headers.data(),
+                                       trace0,
+                                       trace_bsize );
+    CHECK( err == Err::ok() );
+
+    std::vector< char > xs( 10 * size );
+    err = segy_traceheaders( fp, 109, 99, -1,
+                                 xs.data(),
+                                 trace0,
+                                 trace_bsize );
+    CHECK( err == Err::ok() );
+    CHECK( xs == headers );
+}
+
+TEST_CASE( "reading many fields with an invalid field fails",
+           "[c.segy]" ) {
+    unique_segy ufp{ openfile( "test-data/f3.sgy", "rb" ) };
+    auto* fp = ufp.get();
+
+    const int fields[] = { SEGY_TR_INLINE, SEGY_TR_INLINE + 1 };
+    std::vector< int > xs( 2 * 10 );
+    Err err = segy_fields_forall( fp, fields, 2, 0, 10, 1,
+                                  xs.data(),
+                                  3600,
+                                  75 * 2 );
+    CHECK( err == SEGY_INVALID_ARGS );
+}
+
+TEST_CASE( "geometry in one pass matches sorting, offsets and lines",
+           "[c.segy]" ) {
+    const std::string files[] = {
+        "test-data/small.sgy",
+        "test-data/long.sgy",
+        "test-data/1x1.sgy",
+        "test-data/1xN.sgy",
+        "test-data/f3.sgy",
+        "test-data/text.sgy",
+        "test-data/small-ps-dec-il-xl-off.sgy",
+        "test-data/small-ps-dec-il-inc-xl-off.sgy",
+        "test-data/small-ps-dec-xl-inc-il-off.sgy",
+        "test-data/small-ps-dec-off-inc-il-xl.sgy",
+        "test-data/small-ps-dec-il-xl-inc-off.sgy",
+        "test-data/small-ps-dec-il-off-inc-xl.sgy",
+        "test-data/small-ps-dec-xl-off-inc-il.sgy",
+    };
+
+    const std::pair< int, int > lines[] = {
+        { SEGY_TR_INLINE, SEGY_TR_CROSSLINE },
+        { SEGY_TR_CROSSLINE, SEGY_TR_INLINE },
+        { SEGY_TR_INLINE, SEGY_TR_CDP_X },
+    };
+
+    for( const auto& file : files ) {
+    for( const auto& ln : lines ) {
+        INFO( file << " (il: " << ln.first << ", xl: " << ln.second << ")" );
+        unique_segy ufp( segy_open( file.c_str(), "rb" ) );
+        REQUIRE( ufp );
+        auto* fp = ufp.get();
+        testcfg::config().mmap( fp );
+
+        char header[ SEGY_BINARY_HEADER_SIZE ];
+        REQUIRE( Err( segy_binheader( fp, header ) ) == Err::ok() );
+        const long trace0 = segy_trace0( header );
+        const int trace_bsize = segy_trsize( segy_format( header ),
+                                             segy_samples( header ) );
+        int traces;
+        REQUIRE( Err( segy_traces( fp, &traces, trace0, trace_bsize ) )
+                 == Err::ok() );
+
+        const int il = ln.first;
+        const int xl = ln.second;
+
+        int sorting = -1, offsets = -1, ilc = -1, xlc = -1;
+        Err expected = segy_sorting( fp, il, xl, SEGY_TR_OFFSET,
+                                     &sorting,
+                                     trace0, trace_bsize );
+        if( expected == Err::ok() )
+            expected = segy_offsets( fp, il, xl, traces, &offsets,
+                                     trace0, trace_bsize );
+        if( expected == Err::ok() )
+            expected = segy_lines_count( fp, il, xl, sorting, offsets,
+                                         &ilc, &xlc,
+                                         trace0, trace_bsize );
+
+        int sorting1 = -1, offsets1 = -1, ilc1 = -1, xlc1 = -1;
+        Err err = segy_geometry( fp, il, xl, SEGY_TR_OFFSET,
+                                 &sorting1, &offsets1, &ilc1, &xlc1,
+                                 trace0, trace_bsize );
+
+        CHECK( err == expected );
+        if( err != Err::ok() ) continue;
+
+        CHECK( sorting1 == sorting );
+        CHECK( offsets1 == offsets );
+        CHECK( ilc1 == ilc );
+        CHECK( xlc1 == xlc );
+    }
+    }
+}
+
 SCENARIO( "reading a 2-byte int file", "[c.segy][2-byte]" ) {
     unique_segy ufp{ openfile( "test-data/f3.sgy", "rb" ) };
     auto fp = ufp.get();
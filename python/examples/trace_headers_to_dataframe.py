@@ -11,14 +11,10 @@ def main():
 
     # Open file
     with segyio.open(filename, ignore_geometry=True) as f:
-        # Get all header keys:
-        header_keys = segyio.tracefield.keys
-        # Initialize df with trace id as index and headers as columns
-        trace_headers = pd.DataFrame(index=range(1, f.tracecount+1),
-                                     columns=header_keys.keys())
-        # Fill dataframe with all trace headers values
-        for k, v in header_keys.items():
-            trace_headers[k] = f.attributes(v)[:]
+        # Read all trace headers in one pass, with trace id as index and
+        # headers as columns
+        trace_headers = pd.DataFrame(f.header.table(),
+                                     index=range(1, f.tracecount+1))
 
     print(trace_headers.head())
 
@@ -8,6 +8,7 @@ try: from future_builtins import zip
 except ImportError: pass
 from .trace import Sequence
 from .utils import castarray
+from .tracesortingformat import TraceSortingFormat
 
 class Depth(Sequence):
     """
@@ -37,10 +38,15 @@ class Depth(Sequence):
         depths, consider using a faster mode.
     """
 
+    # upper bound of the size of the slabs of depths read at a time when
+    # iterating over depths
+    slab_bytes = 64 * 1024 * 1024
+
     def __init__(self, fd):
         super(Depth, self).__init__(len(fd.samples))
         self.filehandle = fd.xfd
         self.dtype = fd.dtype
+        self.lookup = None
 
         if fd.unstructured:
             self.shape = fd.tracecount
@@ -49,6 +55,17 @@ class Depth(Sequence):
             self.shape = (len(fd.fast), len(fd.slow))
             self.offsets = len(fd.offsets)
 
+        if not fd.unstructured and fd.lookup is not None:
+            # sparse files are read whole-file, and the samples of the traces
+            # at the first offset are scattered into the fast-by-slow grid
+            lookup = fd.lookup[:, :, 0]
+            if fd.sorting == TraceSortingFormat.CROSSLINE_SORTING:
+                lookup = lookup.T
+            self.lookup = lookup
+            self.present = lookup >= 0
+            self.tracecount = fd.tracecount
+            self.fill = fd._fill
+
     def __getitem__(self, i):
         """depth[i]
 
@@ -115,6 +132,8 @@ class Depth(Sequence):
 
         try:
             i = self.wrapindex(i)
+            if self.lookup is not None:
+                return self.sparse(i, np.empty(self.shape, dtype=self.dtype))
             buf = np.empty(self.shape, dtype=self.dtype)
             return self.filehandle.getdepth(i, buf.size, self.offsets, buf)
 
@@ -126,16 +145,100 @@ class Depth(Sequence):
                 raise TypeError(msg.format(type(i).__name__))
 
             def gen():
-                x = np.empty(self.shape, dtype=self.dtype)
-                y = np.copy(x)
-
-                for j in range(*indices):
-                    self.filehandle.getdepth(j, x.size, self.offsets, x)
-                    x, y = y, x
-                    yield y
+                # read the depths in slabs of many depths at a time, so that
+                # the file is traversed once per slab rather than once per
+                # depth
+                start, stop, step = indices
+                n = len(range(start, stop, step))
+                block = max(1, self.slab_bytes // self.depth_bytes())
+                for j in range(0, n, block):
+                    first = start + j * step
+                    last = start + min(j + block, n) * step
+                    for x in self.slab(first, last, step):
+                        yield x
 
             return gen()
 
+    def depth_bytes(self):
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+    def slab(self, first, last, step):
+        # the depths in [first, last) with step, with first, last and step as
+        # returned by slice.indices
+        n = len(range(first, last, step))
+        out = np.empty((n,) + tuple(np.atleast_1d(self.shape)), dtype=self.dtype)
+        if n == 0:
+            return out
+
+        # the depths are always read forwards
+        end = first + (n - 1) * step
+        start = min(first, end)
+        stop = max(first, end) + 1
+        backwards = step < 0
+        step = abs(step)
+
+        if self.lookup is None:
+            count = out[0].size
+            self.filehandle.getdepths(start, stop, step, count, self.offsets, out)
+        else:
+            flat = np.empty((n, self.tracecount), dtype=self.dtype)
+            self.filehandle.getdepths(start, stop, step, self.tracecount, 1, flat)
+            out[:, ~self.present] = self.fill
+            out[:, self.present] = flat[:, self.lookup[self.present]]
+
+        if backwards:
+            out = out[::-1]
+        return out
+
+    def read(self, index):
+        """depth.read(slice)
+
+        Read a range of depths into one numpy.ndarray, in a single pass over
+        the file. Every trace is read only once, regardless of the number of
+        depths, which is much faster than reading the depths one by one with
+        ``depth[i]``.
+
+        Like ``depth[i]``, this interface uses zero-based indices.
+
+        Parameters
+        ----------
+        index : slice
+
+        Returns
+        -------
+        depths : numpy.ndarray of dtype
+            of shape (len(depths), fast, slow), or (len(depths), tracecount)
+            for unstructured files
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Read the depths [100, 200) into a (100, fast, slow) array:
+
+        >>> x = f.depth_slice.read(slice(100, 200))
+
+        Read every other depth:
+
+        >>> x = f.depth_slice.read(slice(None, None, 2))
+        """
+        try:
+            indices = index.indices(len(self))
+        except AttributeError:
+            msg = 'depth read indices must be slices, not {}'
+            raise TypeError(msg.format(type(index).__name__))
+
+        return self.slab(*indices)
+
+    def sparse(self, i, out):
+        flat = np.empty(self.tracecount, dtype = self.dtype)
+        self.filehandle.getdepth(i, flat.size, 1, flat)
+        out[~self.present] = self.fill
+        out[self.present] = flat[self.lookup[self.present]]
+        return out
+
     def __setitem__(self, depth, val):
         """depth[i] = val
 
@@ -177,4 +280,14 @@ class Depth(Sequence):
             return
 
         val = castarray(val, dtype = self.dtype)
+        if self.lookup is not None:
+            # only the present traces are written, so read the depth of every
+            # trace and write it back with the present ones replaced
+            val = val.reshape(self.shape)
+            flat = np.empty(self.tracecount, dtype = self.dtype)
+            self.filehandle.getdepth(depth, flat.size, 1, flat)
+            flat[self.lookup[self.present]] = val[self.present]
+            self.filehandle.putdepth(depth, flat.size, 1, flat)
+            return
+
         self.filehandle.putdepth(depth, val.size, self.offsets, val)
@@ -5,6 +5,8 @@ except ImportError:
     from collections import Mapping # noqa
     from collections import MutableMapping # noqa
 
+import numpy as np
+
 import segyio
 from .binfield import BinField
 from .tracefield import TraceField
@@ -28,7 +30,24 @@ class Field(MutableMapping):
 
     .. versionchanged:: 1.6
         more common dict operations (MutableMapping)
+
+    .. versionchanged:: 1.10
+        all fields are decoded at once, on first access
     """
+    __slots__ = (
+        '_keys',
+        '_words',
+        '_index',
+        'kind',
+        '_buf',
+        '_values',
+        'traceno',
+        'filehandle',
+        'getfield',
+        'putfield',
+        'readonly',
+    )
+
     _bin_keys = [x for x in BinField.enums()
                  if  x != BinField.Unassigned1
                  and x != BinField.Unassigned2]
@@ -37,6 +56,15 @@ class Field(MutableMapping):
                 if  x != TraceField.UnassignedInt1
                 and x != TraceField.UnassignedInt2]
 
+    # the keys as a C int array, for decoding all fields in one call, and the
+    # position of every key in that array
+    _bin_words = np.asarray([int(x) for x in _bin_keys], dtype = np.intc)
+    _tr_words  = np.asarray([int(x) for x in _tr_keys],  dtype = np.intc)
+    _bin_index = { int(x): i for i, x in enumerate(_bin_keys) }
+    _tr_index  = { int(x): i for i, x in enumerate(_tr_keys) }
+    _bin_names = [str(x) for x in _bin_keys]
+    _tr_names  = [str(x) for x in _tr_keys]
+
     _kwargs = {
         'tracl' : TraceField.TRACE_SEQUENCE_LINE,
         'tracr' : TraceField.TRACE_SEQUENCE_FILE,
@@ -176,9 +204,13 @@ class Field(MutableMapping):
         # requires _keys
         if kind == 'binary':
             self._keys = self._bin_keys
+            self._words = self._bin_words
+            self._index = self._bin_index
             self.kind = BinField
         elif kind == 'trace':
             self._keys = self._tr_keys
+            self._words = self._tr_words
+            self._index = self._tr_index
             self.kind = TraceField
         else:
             raise ValueError('Unknown header type {}'.format(kind))
@@ -191,6 +223,35 @@ class Field(MutableMapping):
 
         self.readonly = readonly
 
+    @property
+    def buf(self):
+        return self._buf
+
+    @buf.setter
+    def buf(self, buf):
+        self._buf = buf
+        self._values = None
+
+    def decode(self):
+        """Decode all fields of the header
+
+        All fields are decoded in a single call, and the result is cached
+        until the header buffer changes, so that reading many fields, or
+        comparing and printing headers, is cheap.
+
+        Returns
+        -------
+        values : list of int
+            The values, in the order of keys()
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+        """
+        if not self._values:
+            self._values = segyio._segyio.getfields(self._buf, self._words)
+        return self._values
+
     def fetch(self, buf = None, traceno = None):
         """Fetch the header from disk
 
@@ -231,6 +292,10 @@ class Field(MutableMapping):
         if buf is None:
             buf = self.buf
 
+        if buf is self._buf:
+            # the buffer is read into in-place
+            self._values = None
+
         if traceno is None:
             traceno = self.traceno
 
@@ -364,10 +429,22 @@ class Field(MutableMapping):
         { 37: 5, 189: 2484 }
         """
 
-        try: return self.getfield(self.buf, int(key))
-        except TypeError: pass
+        if self._values is None:
+            # a fresh header is often only read for a single field, e.g. when
+            # iterating over headers, which is faster without decoding all
+            # fields. decode everything on the second read
+            self._values = False
+        else:
+            try: return self.decode()[self._index[key]]
+            except (KeyError, TypeError): pass
+
+        try: key = int(key)
+        except TypeError:
+            return {self.kind(k): self[k] for k in key}
 
-        return {self.kind(k): self.getfield(self.buf, int(k)) for k in key}
+        # first read, or not one of the keys, so let getfield decode the
+        # single (possibly unassigned) field, or raise KeyError
+        return self.getfield(self._buf, key)
 
     def __setitem__(self, key, val):
         """d[key] = val
@@ -417,6 +494,7 @@ class Field(MutableMapping):
         """
 
         self.putfield(self.buf, key, val)
+        self._values = None
         self.flush()
 
         return val
@@ -455,10 +533,14 @@ class Field(MutableMapping):
         if len(self) != len(other):
             return False
 
+        if isinstance(other, Field) and other.kind == self.kind:
+            return self.decode() == other.decode()
+
         def intkeys(d):
             return { int(k): v for k, v in d.items() }
 
-        return intkeys(self) == intkeys(other)
+        mine = dict(zip(self._words.tolist(), self.decode()))
+        return mine == intkeys(other)
 
 
     def update(self, *args, **kwargs):
@@ -543,4 +625,8 @@ class Field(MutableMapping):
                     ).reload()
 
     def __repr__(self):
-        return repr(self[self.keys()])
+        # same as repr(dict(self)), without creating and looking up the name
+        # of an enum per key
+        names = self._bin_names if self.kind == BinField else self._tr_names
+        items = ('{}: {}'.format(k, v) for k, v in zip(names, self.decode()))
+        return '{' + ', '.join(items) + '}'
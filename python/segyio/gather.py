@@ -10,8 +10,6 @@ import numpy as np
 try: from future_builtins import zip
 except ImportError: pass
 
-import segyio.tools as tools
-
 from .line import sanitize_slice
 
 
@@ -109,9 +107,7 @@ class Gather(object):
 
         # gather[int,int,int]
         if not any(map(isslice, [il, xl, off])):
-            o = self.iline.offsets[off]
-            i = o + self.iline.heads[il] + self.xline.heads[xl]
-            return self.trace[i]
+            return self.readtraces(self.traces(il, xl, [off]))[0]
 
         if isslice(off):
             offs = sanitize_slice(off, self.offsets)
@@ -125,19 +121,11 @@ class Gather(object):
         # gather[int,int,:]
         if not any(map(isslice, [il, xl])):
             if len(xs) == 0: return empty
-            i = self.iline.heads[il] + self.xline.heads[xl]
-            return tools.collect(self.trace[i + self.iline.offsets[x]] for x in xs)
+            return self.readtraces(self.traces(il, xl, xs))
 
         # gather[:,:,:], gather[int,:,:], gather[:,int,:]
         # gather[:,:,int] etc
         def gen():
-            # precomputed xline number -> xline offset into the iline
-            xlinds = { xlno: i for i, xlno in enumerate(self.xline.keys()) }
-
-            # ranges over gathers are done on a by-line basis so lines can be
-            # buffered, and traces can be read from the iline. This is the
-            # least efficient when there are very few traces read per inline,
-            # but huge savings with larger subcubes
             last_il = self.iline.keys()[-1] + 1
             last_xl = self.xline.keys()[-1] + 1
 
@@ -145,9 +133,8 @@ class Gather(object):
             xl_slice = xl if isslice(xl) else slice(xl, xl+1)
 
             # the slice could still be defaulted (:), in which case this starts
-            # at zero. the lookups are guarded by try-excepts so it won't fail,
-            # but it's unnecessary to chck all keys up until the first xline
-            # because that will never be a hit anyway
+            # at zero. It's unnecessary to check all keys up until the first
+            # line because that will never be a hit anyway
             if il_slice.start is None:
                 start = self.iline.keys()[0]
                 il_slice = slice(start, il_slice.stop, il_slice.step)
@@ -159,36 +146,166 @@ class Gather(object):
             il_range = range(*il_slice.indices(last_il))
             xl_range = range(*xl_slice.indices(last_xl))
 
-            # the try-except-else is essentially a filter on in/xl keys, but
-            # delegates the work (and decision) to the iline and xline modes
-            if not isslice(off):
-                for iline in self.iline[il_slice, off]:
-                    for xlno in xl_range:
-                        try:
-                            xind = xlinds[xlno]
-                        except KeyError:
-                            pass
-                        else:
-                            yield iline[xind]
-
-                return
-
             if len(xs) == 0:
+                if not isslice(off): return
                 for _, _ in itertools.product(il_range, xl_range): yield empty
                 return
 
-            for ilno in il_range:
-                iline = tools.collect(self.iline[ilno, off])
-                for x in xl_range:
-                    try:
-                        xind = xlinds[x]
-                    except KeyError:
-                        pass
-                    else:
-                        yield iline[:, xind]
+            ilnos = [x for x in il_range if x in self.iline.heads]
+            xlnos = [x for x in xl_range if x in self.xline.heads]
+            if len(xlnos) == 0: return
+
+            # ranges over gathers are read inline by inline, and all the
+            # requested traces of an inline are read in one go. Only the
+            # traces in the gathers are read, which for pre-stack files is
+            # every requested offset of the intersections, de-interleaved
+            # from the offset-major layout on disk
+            for ilno in ilnos:
+                traces = np.stack([self.traces(ilno, x, xs) for x in xlnos])
+                for gather in self.readtraces(traces):
+                    yield gather if isslice(off) else gather[0]
+
+        return gen()
+
+    def read(self, il, xl, off = None):
+        """gather.read(i, x, o)
+
+        Read the gathers at the inlines `i` and crosslines `x` at the offsets
+        `o` into one numpy.ndarray of shape (inlines, crosslines, offsets,
+        samples). The trace numbers of all the gathers are computed up front,
+        and the traces are read with a single call into segyio.
+
+        Follows the same rules for indexing and slicing as ``gather[i, x,
+        o]``, but the dimensions of ints are kept, so the array is always 4D.
+
+        Parameters
+        ----------
+        i : int or slice
+            inline
+        x : int or slice
+            crossline
+        o : int or slice
+            offsets (default is :)
+
+        Returns
+        -------
+        gathers : numpy.ndarray
+
+        Raises
+        ------
+        KeyError
+            If `i`, `x` or `o` don't exist
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Read all offsets for a set of ilines and xlines:
+
+        >>> x = f.gather.read(slice(200, 300), slice(241, 248))
+        >>> x.shape
+        (100, 7, 25, 1500)
+        """
+        sub = self.trace.segy.subvolume
+        ils, xls, offs = self.keys(sub, il, xl, off)
+        return sub.read(ils, xls, offs, (0, sub.samples, 1))
+
+    def blocks(self, il, xl, off = None, block_bytes = 64 * 1024 * 1024):
+        """gather.blocks(i, x, o)
+
+        Like ``gather.read(i, x, o)``, but a generator of the 4D arrays of
+        runs of inlines, so that the gathers of large selections can be
+        processed without reading all of them into memory at once.
+
+        Parameters
+        ----------
+        i : int or slice
+            inline
+        x : int or slice
+            crossline
+        o : int or slice
+            offsets (default is :)
+        block_bytes : int
+            Upper bound of the size of the blocks
+
+        Returns
+        -------
+        gathers : generator of numpy.ndarray
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Average every gather in the file, block by block:
+
+        >>> for block in f.gather.blocks(slice(None), slice(None)):
+        ...     avg = block.mean(axis = 2)
+        """
+        sub = self.trace.segy.subvolume
+        ils, xls, offs = self.keys(sub, il, xl, off)
+        depths = (0, sub.samples, 1)
+
+        linesize = len(xls) * len(offs) * sub.samples * sub.dtype.itemsize
+        block = max(1, block_bytes // max(linesize, 1))
+
+        def gen():
+            for i in range(0, len(ils), block):
+                yield sub.read(ils[i:i + block], xls, offs, depths)
 
         return gen()
 
+    @staticmethod
+    def keys(sub, il, xl, off):
+        if off is None:
+            off = slice(None)
+
+        return (sub.keys(il, sub.iline.heads),
+                sub.keys(xl, sub.xline.heads),
+                sub.keys(off, sub.iline.offsets))
+
+    def traces(self, il, xl, offsets):
+        """The trace numbers of the offsets at the intersection il, xl"""
+        head = self.iline.heads[il] + self.xline.heads[xl]
+        offs = [self.iline.offsets[o] for o in offsets]
+        return head + np.asarray(offs, dtype = np.intc)
+
+    def readtraces(self, traces):
+        return self.trace.read(traces)
+
+class SparseGather(Gather):
+    """
+    The gather of files with missing traces. It implements the same interface
+    as Gather, but the traces are found through the trace lookup table, and
+    missing traces are read as a constant fill value.
+
+    Notes
+    -----
+    .. versionadded:: 1.10
+    """
+
+    def __init__(self, trace, iline, xline, offsets, lookup, fill):
+        super(SparseGather, self).__init__(trace, iline, xline, offsets)
+        self.lookup = lookup
+        self.fill = fill
+
+    def traces(self, il, xl, offsets):
+        """The trace numbers of the offsets at il, xl, -1 if missing"""
+        offs = [self.iline.offsets[o] for o in offsets]
+        return self.lookup[self.iline.heads[il], self.xline.heads[xl], offs]
+
+    def readtraces(self, traces):
+        out = np.empty(traces.shape + (self.iline.shape[1],),
+                       dtype = self.trace.dtype)
+        present = traces >= 0
+        out[~present] = self.fill
+        if present.any():
+            out[present] = self.trace.read(traces[present])
+        return out
+
 class Group(object):
     """
     The inner representation of the Groups abstraction provided by Group.
@@ -244,6 +361,28 @@ class Group(object):
         for i in self.index:
             yield source[i]
 
+    def read(self):
+        """
+        Read all the traces in this group
+
+        Unlike the trace generator, the traces are read with a single call,
+        into one numpy.ndarray.
+
+        Returns
+        -------
+        traces : numpy.ndarray
+            of shape (len(index), samples)
+
+        Notes
+        -----
+        The traces respect the order of the index - to get the traces in a
+        different order, the index attribute can be re-organised.
+
+        .. versionadded:: 1.10
+        """
+        index = np.asarray(self.index, dtype = np.intc)
+        return self.parent.trace.read(index)
+
     def sort(self, fields):
         """
         Sort the traces in the group, obeying the `fields` order of
@@ -251,16 +390,13 @@ class Group(object):
         """
         # TODO: examples
 
-        headers = [dict(self.parent.header[i]) for i in self.index]
-        index = list(zip(headers, self.index))
-        # sorting is stable, so sort the whole set by field, applied in the
-        # reverse order:
-        for field in reversed(fields):
-            index.sort(key = lambda x: x[0][field])
+        index = np.asarray(self.index, dtype = np.intc)
+        attributes = self.parent.header.segy.attributes
+        words = [attributes(field)[index] for field in fields]
 
-        # strip off all the headers
-        index = [i for _, i in index]
-        self.index = index
+        # lexsort is stable, and sorts by the last key first
+        order = np.lexsort(words[::-1]) if words else np.arange(len(index))
+        self.index = index[order].tolist()
 
 class Groups(Mapping):
     """
@@ -295,17 +431,43 @@ class Groups(Mapping):
     Notes
     -----
     .. versionadded:: 1.9
+
+    .. versionchanged:: 1.10
+        the key words of all traces are read in one pass, and the groups are
+        stored as arrays of trace indices
     """
     # TODO: only group in range of traces?
-    # TODO: cache header dicts?
     def __init__(self, trace, header, key):
+        try:
+            fields = [int(key)]
+            single = True
+        except TypeError:
+            fields = [int(field) for field in key]
+            single = False
+
+        # read the key words of every trace in one pass, and bin the traces
+        # by their unique key, in the order the keys first appear in the file
+        attrs = header.segy.attributes_many(fields)
+        words = np.stack([attrs[field] for field in fields], axis = 1)
+
         bins = collections.OrderedDict()
-        for i, h in enumerate(header[:]):
-            k = self.fingerprint(h[key])
-            if k in bins:
-                bins[k].append(i)
-            else:
-                bins[k] = [i]
+        if len(words) > 0:
+            # sort the traces by key, and split where the key changes. The
+            # sort is stable, so the traces of a group stay in file order
+            order = np.lexsort(words.T[::-1])
+            ordered = words[order]
+            change = np.any(ordered[1:] != ordered[:-1], axis = 1)
+            starts = np.concatenate(([0], np.flatnonzero(change) + 1))
+            keys = ordered[starts]
+            first = order[starts]
+            groups = np.split(order, starts[1:])
+
+            for g in np.argsort(first):
+                if single:
+                    k = int(keys[g][0])
+                else:
+                    k = frozenset(zip(fields, (int(x) for x in keys[g])))
+                bins[k] = groups[g]
 
         self.trace = trace
         self.header = header
@@ -417,15 +579,15 @@ class Groups(Mapping):
         >>> record5 = records[5]
         """
         key = self.fingerprint(key)
-        return Group(key, self, self.bins[key])
+        return Group(key, self, self.bins[key].tolist())
 
     def values(self):
         for key, index in self.bins.items():
-            yield Group(key, self, index)
+            yield Group(key, self, index.tolist())
 
     def items(self):
         for key, index in self.bins.items():
-            yield key, Group(key, self, index)
+            yield key, Group(key, self, index.tolist())
 
     def __iter__(self):
         return self.bins.keys()
@@ -439,6 +601,6 @@ class Groups(Mapping):
         for key, index in self.bins.items():
             g = Group(key, self, index)
             g.sort(fields)
-            bins[key] = g.index
+            bins[key] = np.asarray(g.index, dtype = np.intc)
 
         self.bins = bins
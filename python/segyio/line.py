@@ -29,6 +29,50 @@ def sanitize_slice(s, source):
 
     return slice(start, stop, step)
 
+def window(samples, count):
+    """The (start, stop, step) of the sample indices selected by samples, an
+    int or a slice
+    """
+    if isinstance(samples, slice):
+        return samples.indices(count)
+
+    try:
+        i = range(count)[samples]
+    except TypeError:
+        msg = 'sample indices must be integers or slices, not {}'
+        raise TypeError(msg.format(type(samples).__name__))
+    return i, i + 1, 1
+
+def readwindow(fd, traces, depths, out, fill = 0):
+    """Read the samples depths of traces into out, in one call into segyio
+
+    depths is the (start, stop, step) of the samples, as from window().
+    Missing traces, i.e. negative trace numbers, are set to fill. out must be
+    a C-contiguous array of shape traces.shape + (len(range(*depths)),).
+    """
+    if out.size == 0:
+        return out
+
+    # the samples are always read forwards, and reversed afterwards
+    first, _, step = depths
+    last = first + (out.shape[-1] - 1) * step
+    start, stop = min(first, last), max(first, last) + 1
+
+    present = traces >= 0
+    if present.all():
+        indices = np.ascontiguousarray(traces.ravel(), dtype = np.intc)
+        fd.gettraces(out, indices, start, stop, abs(step))
+    else:
+        out[~present] = fill
+        indices = np.ascontiguousarray(traces[present], dtype = np.intc)
+        buf = np.empty((len(indices), out.shape[-1]), dtype = out.dtype)
+        fd.gettraces(buf, indices, start, stop, abs(step))
+        out[present] = buf
+
+    if step < 0:
+        out[:] = out[..., ::-1]
+    return out
+
 class Line(Mapping):
     """
     The Line implements the dict interface, with a fixed set of int_like keys,
@@ -61,7 +105,15 @@ class Line(Mapping):
         common dict operations (Mapping)
     """
 
+    # upper bound of the size of the blocks of lines read at a time when
+    # iterating over lines
+    block_bytes = 64 * 1024 * 1024
+
+    # the value of missing traces, which only sparse lines have
+    fill = 0
+
     def __init__(self, filehandle, labels, length, stride, offsets, name):
+        self.segy = filehandle
         self.filehandle = filehandle.xfd
         self.lines = labels
         self.length = length
@@ -103,12 +155,19 @@ class Line(Mapping):
         return irange, list(orange)
 
     def __getitem__(self, index):
-        """line[i] or line[i, o]
+        """line[i], line[i, o] or line[i, o, t]
 
         The line `i`, or the line `i` at a specific offset `o`. ``line[i]``
         returns a numpy array, and changes to this array will *not* be
         reflected on disk.
 
+        With `t`, only the samples `t` of every trace is read. `t` is a
+        zero-based sample index or slice, and only that window is read from
+        disk. If `t` is an int, the line has one value per trace. When `i` is
+        an int and `o` a slice, ``line[i, o, t]`` is a numpy array of shape
+        (offsets, traces, samples), or just (traces, samples) if the file only
+        has a single offset.
+
         The `i` and `o` are *keys*, and should correspond to the line- and
         offset labels in your file, and in the `ilines`, `xlines`, and
         `offsets` attributes.
@@ -133,6 +192,7 @@ class Line(Mapping):
         ----------
         i : int or slice
         o : int or slice
+        t : int or slice
 
         Returns
         -------
@@ -147,6 +207,9 @@ class Line(Mapping):
         -----
         .. versionadded:: 1.1
 
+        .. versionchanged:: 1.10
+            sample windows
+
         Examples
         --------
 
@@ -154,6 +217,14 @@ class Line(Mapping):
 
         >>> x = line[2400]
 
+        Read the samples [500, 700) of an inline:
+
+        >>> x = line[2400, :, 500:700]
+
+        Read the samples [500, 700) of an inline, at the first offset:
+
+        >>> x = line[2400, None, 500:700]
+
         Copy every inline into a list:
 
         >>> l = [numpy.copy(x) for x in iline[:]]
@@ -191,9 +262,10 @@ class Line(Mapping):
         >>> l = [numpy.copy(x) for x in line[2420:2460, 200:800:50]]
         """
 
-        offset = self.default_offset
-        try: index, offset = index
-        except TypeError: pass
+        index, offset, samples = self.unpack(index)
+
+        if samples is not None:
+            return self.window(index, offset, samples)
 
         # prioritise the code path that's potentially in loops externally
         try:
@@ -216,26 +288,98 @@ class Line(Mapping):
         irange, orange = self.ranges(index, offset)
 
         def gen():
-            x = np.empty(self.shape, dtype=self.dtype)
-            y = np.copy(x)
-
             # only fetch lines that exist. the slice can generate both offsets
             # and line numbers that don't exist, so filter out misses before
             # they happen
+            heads = [self.heads[line] + self.offsets[off]
+                     for line in irange
+                     for off in orange]
+
+            for block in self.blocks(heads):
+                for x in block:
+                    yield x
+
+        return gen()
+
+    def unpack(self, index):
+        # line[i], line[i, o] or line[i, o, t], where a None offset is the
+        # default offset
+        offset, samples = self.default_offset, None
+        if isinstance(index, tuple) and len(index) == 3:
+            index, offset, samples = index
+        else:
+            try: index, offset = index
+            except TypeError: pass
+
+        if offset is None:
+            offset = self.default_offset
+
+        return index, offset, samples
+
+    def traces(self, index, offset):
+        """The trace numbers of the line index at offset"""
+        head = self.heads[index] + self.offsets[offset]
+        step = self.stride * len(self.offsets)
+        return head + np.arange(self.length, dtype = np.intc) * step
+
+    def window(self, index, offset, samples):
+        depths = window(samples, self.shape[1])
+
+        def read(traces):
+            shape = (len(traces), len(range(*depths)))
+            out = np.empty(shape, dtype = self.dtype)
+            readwindow(self.filehandle, traces, depths, out, self.fill)
+            return out if isinstance(samples, slice) else out[:, 0]
+
+        try:
+            traces = self.traces(index, offset)
+        except TypeError:
+            pass
+        else:
+            return read(traces)
+
+        irange, orange = self.ranges(index, offset)
+
+        if not isinstance(index, slice):
+            # line[i, :, t] reads the window of all the offsets of the line in
+            # one go. Like with the gather, the offset dimension is dropped
+            # when the file only has a single offset
+            traces = [self.traces(index, off) for off in orange]
+            if len(self.offsets) == 1 and len(traces) == 1:
+                return read(traces[0])
+
+            out = read(np.asarray(traces, dtype = np.intc).reshape(-1))
+            return out.reshape((len(traces), self.length) + out.shape[1:])
+
+        def gen():
             for line in irange:
                 for off in orange:
-                    head = self.heads[line] + self.offsets[off]
-                    self.filehandle.getline(head,
-                                            self.length,
-                                            self.stride,
-                                            len(self.offsets),
-                                            y,
-                                           )
-                    y, x = x, y
-                    yield x
+                    yield read(self.traces(line, off))
 
         return gen()
 
+    def blocks(self, heads):
+        """Read the lines starting at heads, many lines at a time
+
+        The lines are read in blocks of up to block_bytes. The traces of all
+        lines in a block are sorted and read in on-disk order, and then put
+        back in line order, so that consecutive traces are read together
+        regardless of the sorting of the file and the direction of the lines.
+        """
+        linesize = self.length * self.shape[1] * self.dtype.itemsize
+        block = max(1, self.block_bytes // max(linesize, 1))
+        step = self.stride * len(self.offsets)
+        along = np.arange(self.length, dtype = np.intc) * step
+
+        for i in range(0, len(heads), block):
+            chunk = np.asarray(heads[i:i + block], dtype = np.intc)
+            indices = (chunk[:, np.newaxis] + along[np.newaxis, :]).ravel()
+            order = np.argsort(indices, kind = 'mergesort')
+            traces = self.segy.trace.read(indices[order])
+            out = np.empty_like(traces)
+            out[order] = traces
+            yield out.reshape(len(chunk), self.length, self.shape[1])
+
     def __setitem__(self, index, val):
         """line[i] = val or line[i, o] = val
 
@@ -315,6 +459,52 @@ class Line(Mapping):
                                            )
                 except StopIteration: return
 
+    def view(self, index, offset = None):
+        """line.view(i) or line.view(i, o)
+
+        The line `i` at offset `o` as a zero-copy view of the file. The
+        returned numpy.ndarray is a strided slice of ``trace.view()``, and
+        follows the same rules: no samples are copied or converted, it is
+        writeable if the file is, and it is only available for files whose
+        samples numpy can represent.
+
+        Parameters
+        ----------
+        i : int
+        o : int, optional
+            defaults to the first offset
+
+        Returns
+        -------
+        line : numpy.ndarray
+            of shape (length, samples)
+
+        Raises
+        ------
+        KeyError
+            If `i` or `o` don't exist
+        ValueError
+            If the samples can't be represented by numpy without conversion
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Clip an inline in-place, in a file opened with r+:
+
+        >>> x = iline.view(2400)
+        >>> numpy.clip(x, -1.0, 1.0, out = x)
+        """
+        if offset is None:
+            offset = self.default_offset
+
+        head = self.heads[index] + self.offsets[offset]
+        step = self.stride * len(self.offsets)
+        stop = head + step * (self.length - 1) + 1
+        return self.segy._view_traces()[head:stop:step]
+
     # can't rely on most Mapping default implementations of
     # dict-like, because iter() does not yield keys for this class, it gives
     # the lines themselves. that violates some assumptions (but segyio's always
@@ -346,6 +536,157 @@ class Line(Mapping):
         """D.values() -> generator of D's (key,values), as 2-tuples"""
         return zip(self.keys(), self[:])
 
+class SparseLine(Line):
+    """
+    The SparseLine is the Line of files with missing traces, i.e. where not
+    every (inline, crossline, offset) position has a trace. It implements the
+    same dict interface as Line, but the traces are found through the trace
+    lookup table rather than by a fixed stride, and missing traces are read as
+    a constant fill value.
+
+    Notes
+    -----
+    .. versionadded:: 1.10
+    """
+
+    def __init__(self, filehandle, labels, lookup, offsets, fill):
+        self.segy = filehandle
+        self.filehandle = filehandle.xfd
+        self.lines = labels
+        # the lookup table, ordered (this line, other line, offset)
+        self.lookup = lookup
+        self.length = lookup.shape[1]
+        self.shape = (self.length, len(filehandle.samples))
+        self.dtype = filehandle.dtype
+        self.fill = fill
+
+        # the heads are the positions of the lines in the lookup table
+        self.heads = { label: i for i, label in enumerate(labels) }
+        self.offsets = { x: i for i, x in enumerate(offsets) }
+        self.default_offset = offsets[0]
+
+    def traces(self, index, offset):
+        """The trace numbers of the line index at offset, -1 if missing"""
+        return self.lookup[self.heads[index], :, self.offsets[offset]]
+
+    def read(self, traces, out = None):
+        if out is None:
+            out = np.empty(self.shape, dtype = self.dtype)
+
+        present = traces >= 0
+        out[~present] = self.fill
+        if present.any():
+            out[present] = self.segy.trace.read(traces[present])
+        return out
+
+    def __getitem__(self, index):
+        """line[i], line[i, o] or line[i, o, t]
+
+        Follows the same rules for indexing and slicing as ``Line``. Missing
+        traces are read as the fill value.
+
+        Parameters
+        ----------
+        i : int or slice
+        o : int or slice
+        t : int or slice
+
+        Returns
+        -------
+        line : numpy.ndarray of dtype or generator of numpy.ndarray of dtype
+
+        Raises
+        ------
+        KeyError
+            If `i` or `o` don't exist
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+        """
+        index, offset, samples = self.unpack(index)
+
+        if samples is not None:
+            return self.window(index, offset, samples)
+
+        try:
+            traces = self.traces(index, offset)
+        except TypeError:
+            pass
+        else:
+            return self.read(traces)
+
+        irange, orange = self.ranges(index, offset)
+
+        def gen():
+            x = np.empty(self.shape, dtype=self.dtype)
+            y = np.copy(x)
+
+            for line in irange:
+                for off in orange:
+                    self.read(self.traces(line, off), y)
+                    y, x = x, y
+                    yield x
+
+        return gen()
+
+    def __setitem__(self, index, val):
+        """line[i] = val or line[i, o] = val
+
+        Follows the same rules for indexing and slicing as ``Line``. Only the
+        traces present in the file are written, the values at the positions of
+        missing traces are ignored.
+
+        Parameters
+        ----------
+        i       : int or slice
+        offset  : int or slice
+        val     : array_like
+
+        Raises
+        ------
+        KeyError
+            If `i` or `o` don't exist
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+        """
+        offset = self.default_offset
+        try: index, offset = index
+        except TypeError: pass
+
+        def write(traces, val):
+            val = castarray(val, dtype = self.dtype).reshape(self.shape)
+            for trace, x in zip(traces, val):
+                if trace >= 0:
+                    self.segy.trace[int(trace)] = x
+
+        try:
+            traces = self.lookup[self.heads[index], :, self.offsets[offset]]
+        except TypeError:
+            pass
+        else:
+            return write(traces, val)
+
+        irange, orange = self.ranges(index, offset)
+
+        val = iter(val)
+        for line in irange:
+            for off in orange:
+                traces = self.lookup[self.heads[line], :, self.offsets[off]]
+                try: write(traces, next(val))
+                except StopIteration: return
+
+    def view(self, index, offset = None):
+        """Views are not available for lines with missing traces
+
+        Raises
+        ------
+        ValueError
+        """
+        raise ValueError('line views are not available for sparse files')
+
 class HeaderLine(Line):
     """
     The Line implements the dict interface, with a fixed set of int_like keys,
@@ -363,6 +704,10 @@ class HeaderLine(Line):
     # __len__, keys() etc., however, the __getitem__ is  way different and is re-implemented
 
     def __init__(self, header, base, direction):
+        if isinstance(base, SparseLine):
+            msg = 'header lines are not available for sparse files'
+            raise ValueError(msg)
+
         super(HeaderLine, self).__init__(header.segy,
                                           base.lines,
                                           base.length,
@@ -1,3 +1,7 @@
+import io
+import os
+import zlib
+
 import numpy
 
 import segyio
@@ -24,17 +28,315 @@ def infer_geometry(f, metrics, iline, xline, strict):
             f._xlines  = None
             f._offsets = None
         else:
-            f.close()
             raise
 
     return f
 
 
+def regular_geometry(f, iline, xline, checks):
+    """Geometry of a regular file, from a handful of trace headers
+
+    Assume the file is a regular cube, with constant inline and crossline
+    increments, and derive the geometry from the first and last traces of the
+    file and of the first line. The hypothesis is then checked against
+    `checks` traces, evenly spread through the file.
+
+    Returns (sorting, ilines, xlines, offsets), or None if the file is not
+    regular, or the hypothesis does not hold.
+    """
+    traces = f.tracecount
+    words = [iline, xline, segyio.TraceField.offset]
+
+    def read(indices):
+        indices = numpy.asarray(indices, dtype = numpy.intc)
+        return [f.attributes(w)[indices] for w in words]
+
+    (il0, xl0, of0), = zip(*read([0]))
+
+    # the offsets of the first trace; pre-stack files usually have few, so
+    # read in small, growing chunks until the inline or crossline moves
+    offsets = []
+    chunk = 16
+    while len(offsets) < traces:
+        start = len(offsets)
+        attrs = f.attributes_many(words, slice(start, start + chunk))
+        ils, xls, ofs = (attrs[w] for w in words)
+        moved = numpy.flatnonzero((ils != il0) | (xls != xl0))
+        if len(moved) > 0:
+            offsets.extend(ofs[:moved[0]])
+            break
+        offsets.extend(ofs)
+        chunk *= 2
+
+    offsets = numpy.asarray(offsets, dtype = numpy.intc)
+    noffsets = len(offsets)
+
+    if noffsets == traces:
+        il = numpy.asarray([il0], dtype = numpy.intc)
+        xl = numpy.asarray([xl0], dtype = numpy.intc)
+        return segyio.TraceSortingFormat.CROSSLINE_SORTING, il, xl, offsets
+
+    (il1, xl1, of1), (iln, xln, ofn) = zip(*read([noffsets, traces - 1]))
+    if of1 != of0:
+        return None
+
+    if il1 == il0 and xl1 != xl0:
+        sorting = segyio.TraceSortingFormat.INLINE_SORTING
+        fast0, fast1, fastn = xl0, xl1, xln
+        slow0, slown = il0, iln
+    elif xl1 == xl0 and il1 != il0:
+        sorting = segyio.TraceSortingFormat.CROSSLINE_SORTING
+        fast0, fast1, fastn = il0, il1, iln
+        slow0, slown = xl0, xln
+    else:
+        return None
+
+    fastinc = fast1 - fast0
+    if (fastn - fast0) % fastinc != 0:
+        return None
+
+    fastlen = (fastn - fast0) // fastinc + 1
+    if fastlen < 1 or traces % (fastlen * noffsets) != 0:
+        return None
+
+    slowlen = traces // (fastlen * noffsets)
+    if slowlen == 1:
+        slowinc = 1
+        if slown != slow0:
+            return None
+    else:
+        # the first trace of the second line gives the slow increment
+        (sil, sxl, _), = zip(*read([fastlen * noffsets]))
+        if sorting == segyio.TraceSortingFormat.INLINE_SORTING:
+            slowinc = sil - slow0
+        else:
+            slowinc = sxl - slow0
+        if slowinc == 0 or slown != slow0 + (slowlen - 1) * slowinc:
+            return None
+
+    fast = fast0 + numpy.arange(fastlen, dtype = numpy.intc) * fastinc
+    slow = slow0 + numpy.arange(slowlen, dtype = numpy.intc) * slowinc
+
+    if sorting == segyio.TraceSortingFormat.INLINE_SORTING:
+        ilines, xlines = slow, fast
+    else:
+        ilines, xlines = fast, slow
+
+    # spot-check the hypothesis. The last trace of the first line is always
+    # checked, as it's the one most likely to be off in an irregular file
+    sample = numpy.linspace(0, traces - 1, num = max(checks, 2)).astype(int)
+    sample = numpy.unique(numpy.append(sample, fastlen * noffsets - 1))
+    ils, xls, ofs = read(sample)
+
+    o = sample % noffsets
+    x = (sample // noffsets) % fastlen
+    y = sample // (noffsets * fastlen)
+    if sorting == segyio.TraceSortingFormat.INLINE_SORTING:
+        expected = ilines[y], xlines[x], offsets[o]
+    else:
+        expected = ilines[x], xlines[y], offsets[o]
+
+    for got, exp in zip((ils, xls, ofs), expected):
+        if not numpy.array_equal(got, exp):
+            return None
+
+    return sorting, ilines, xlines, offsets
+
+def sparse_geometry(f, iline, xline):
+    """Geometry of a file with missing traces
+
+    Read the inline, crossline and offset of every trace, and build the
+    (inline, crossline, offset) -> trace lookup table. Positions without a
+    trace are -1.
+
+    Returns (sorting, ilines, xlines, offsets, lookup).
+    """
+    words = [iline, xline, segyio.TraceField.offset]
+    attrs = f.attributes_many(words)
+    ils, xls, ofs = (attrs[w] for w in words)
+
+    ilines,  ii = numpy.unique(ils, return_inverse = True)
+    xlines,  xi = numpy.unique(xls, return_inverse = True)
+    offsets, oi = numpy.unique(ofs, return_inverse = True)
+
+    shape = (len(ilines), len(xlines), len(offsets))
+    position = numpy.ravel_multi_index((ii, xi, oi), shape)
+    if numpy.unique(position).size != position.size:
+        problem = 'duplicate (inline, crossline, offset)'
+        solution = 'a sparse file must have at most one trace per position'
+        raise ValueError(', '.join((problem, solution)))
+
+    lookup = numpy.full(shape, -1, dtype = numpy.intc)
+    lookup.flat[position] = numpy.arange(f.tracecount, dtype = numpy.intc)
+
+    # the sorting is the direction that is kept most often when moving from
+    # one gather to the next
+    moved = (ils[1:] != ils[:-1]) | (xls[1:] != xls[:-1])
+    same_il = numpy.count_nonzero(moved & (ils[1:] == ils[:-1]))
+    same_xl = numpy.count_nonzero(moved & (xls[1:] == xls[:-1]))
+    if same_il >= same_xl:
+        sorting = segyio.TraceSortingFormat.INLINE_SORTING
+    else:
+        sorting = segyio.TraceSortingFormat.CROSSLINE_SORTING
+
+    return sorting, ilines, xlines, offsets, lookup
+
+# bump when the layout of the index changes, so that old indices are rebuilt
+index_version = 2
+
+def index_path(filename, index):
+    """The path of the geometry index of filename
+
+    index is either True for the default, ``<filename>.segyio-index``, a
+    directory to put the default-named index in, or the path itself.
+    """
+    filename = str(filename)
+    if index is True:
+        return filename + '.segyio-index'
+
+    index = str(index)
+    if os.path.isdir(index):
+        name = os.path.basename(filename) + '.segyio-index'
+        return os.path.join(index, name)
+
+    return index
+
+def index_key(f, metrics, iline, xline, sparse = False, regular = False):
+    # what a valid index must match. The size and mtime catch most changes to
+    # the file, and the checksum of the binary header and the first and last
+    # trace header catches files that are replaced with one of the same size
+    # and timestamp. The sparse and regular options are part of the key, since
+    # they change how the geometry is found: a sparse geometry must not be
+    # used by a dense open, and a spot-checked regular geometry must not be
+    # used by an open that asked for a full scan
+    stat = os.stat(f._filename)
+    try:
+        mtime = stat.st_mtime_ns
+    except AttributeError:
+        # python 2 has no st_mtime_ns
+        mtime = int(stat.st_mtime * 1e9)
+
+    checks = 0
+    if regular:
+        checks = 64 if regular is True else int(regular)
+
+    trace0 = metrics['trace0']
+    trsize = metrics['trace_bsize'] + 240
+    last = trace0 + max(f.tracecount - 1, 0) * trsize
+
+    with io.open(f._filename, 'rb') as fd:
+        checksum = zlib.crc32(fd.read(trace0 + 240))
+        fd.seek(last)
+        checksum = zlib.crc32(fd.read(240), checksum)
+
+    return numpy.array([
+        index_version,
+        stat.st_size,
+        mtime,
+        checksum & 0xffffffff,
+        int(iline),
+        int(xline),
+        f.endian in ('little', 'lsb'),
+        bool(sparse),
+        checks,
+    ], dtype = numpy.int64)
+
+def read_index(path, key):
+    """Read the geometry index at path
+
+    Returns None if there is no index, it is unreadable, or it does not match
+    key.
+    """
+    try:
+        with numpy.load(path, allow_pickle = False) as index:
+            if not numpy.array_equal(index['key'], key):
+                return None
+            return {k: index[k] for k in index.files}
+    except (IOError, OSError, ValueError, KeyError):
+        return None
+
+def write_index(path, f, key):
+    """Write the geometry of f to a new index at path
+
+    The index is written to a temporary file and moved in place, so readers
+    never see a partially written index. The trace lookup table of sparse
+    files is stored too.
+    """
+    geometry = dict(
+        key = key,
+        sorting = f.sorting,
+        tracecount = f.tracecount,
+        ilines = f.ilines,
+        xlines = f.xlines,
+        offsets = f.offsets,
+        samples = f.samples,
+    )
+
+    if f.lookup is not None:
+        geometry['lookup'] = f.lookup
+
+    tmp = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with io.open(tmp, 'wb') as fd:
+            numpy.savez(fd, **geometry)
+
+        try:
+            os.replace(tmp, path)
+        except AttributeError:
+            # python 2 has no os.replace
+            os.rename(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def load_geometry(f, metrics, iline, xline, index, scan, fill = 0,
+                  sparse = False, regular = False):
+    path = index_path(f._filename, index)
+    key = index_key(f, metrics, iline, xline, sparse, regular)
+
+    geometry = read_index(path, key)
+    if geometry is not None and 'lookup' in geometry:
+        f._samples = geometry['samples']
+        f._interpret_sparse(geometry['ilines'],
+                            geometry['xlines'],
+                            geometry['offsets'],
+                            geometry['lookup'],
+                            int(geometry['sorting']),
+                            fill)
+        return f
+
+    if geometry is not None:
+        f._samples = geometry['samples']
+        f.interpret(geometry['ilines'],
+                    geometry['xlines'],
+                    geometry['offsets'],
+                    int(geometry['sorting']))
+        return f
+
+    f = scan(f)
+    if f.unstructured:
+        return f
+
+    # the index is only a cache, so failing to write it (read-only directory,
+    # full disk) should not fail the open
+    try:
+        write_index(path, f, key)
+    except (IOError, OSError):
+        pass
+
+    return f
+
+
 def open(filename, mode="r", iline = 189,
                              xline = 193,
                              strict = True,
                              ignore_geometry = False,
-                             endian = 'big'):
+                             endian = 'big',
+                             index = None,
+                             geometry = 'eager',
+                             regular = False,
+                             sparse = False,
+                             fill = 0):
     """Open a segy file.
 
     Opens a segy file and tries to figure out its sorting, inline numbers,
@@ -90,6 +392,32 @@ def open(filename, mode="r", iline = 189,
     endian : {'big', 'msb', 'little', 'lsb'}
         File endianness, big/msb (default) or little/lsb
 
+    index : bool or str, optional
+        Use a geometry index. True for ``<filename>.segyio-index``, a directory
+        for an index with that name in it, or the path of the index itself.
+        Defaults to no index.
+
+    geometry : {'eager', 'lazy'}
+        When to infer the geometry. 'eager' (default) infers it in open, 'lazy'
+        defers it until it is first needed, i.e. when the sorting, ilines,
+        xlines, offsets, or a line, gather or depth slice mode is accessed. A
+        file that is only read trace-by-trace never infers its geometry.
+
+    regular : bool or int
+        Assume the file is a regular cube, and derive the geometry from a few
+        trace headers instead of scanning them. The assumption is checked
+        against a sample of traces, 64 if True, or the given number, and if it
+        does not hold the headers are scanned as usual. Defaults to False.
+
+    sparse : bool
+        Allow inline/crossline/offset positions without traces. If the file is
+        not a full cube, the geometry is built from the inline, crossline and
+        offset of every trace, and the line, gather and depth slice modes read
+        missing traces as `fill`. Defaults to False.
+
+    fill : scalar
+        The value of missing traces in sparse files. Defaults to 0.
+
     Returns
     -------
 
@@ -110,9 +438,16 @@ def open(filename, mode="r", iline = 189,
     .. versionchanged:: 1.8
         endian argument
 
+    .. versionchanged:: 1.10
+        index, geometry, regular, sparse and fill arguments
+
     When a file is opened non-strict, only raw traces access is allowed, and
     using modes such as ``iline`` raise an error.
 
+    When a file is opened with ``geometry = 'lazy'``, errors from inferring the
+    geometry in strict mode are raised on first use instead of from open, and
+    the file is not closed.
+
 
     Examples
     --------
@@ -139,6 +474,23 @@ def open(filename, mode="r", iline = 189,
     >>> with segyio.open(path, endian = 'little') as f:
     ...     f.trace[0]
 
+    Open a file without scanning the headers, for trace-by-trace processing:
+
+    >>> with segyio.open(path, geometry = 'lazy') as f:
+    ...     for tr in f.trace:
+    ...         pass
+
+    Open a file with a geometry index, which is built on the first open and
+    makes later opens of the same file skip the header scan:
+
+    >>> with segyio.open(path, index = True) as f:
+    ...     f.ilines
+
+    Open a file with missing traces, which are read as NaN:
+
+    >>> with segyio.open(path, sparse = True, fill = np.nan) as f:
+    ...     f.iline[10]
+
     """
 
     if 'w' in mode:
@@ -146,6 +498,10 @@ def open(filename, mode="r", iline = 189,
         solution = 'use r+ to open in read-write'
         raise ValueError(', '.join((problem, solution)))
 
+    if geometry not in ('eager', 'lazy'):
+        problem = 'unknown geometry {}, expected one of: eager lazy'
+        raise ValueError(problem.format(geometry))
+
     endians = {
         'little': 256, # (1 << 8)
         'lsb': 256,
@@ -184,4 +540,48 @@ def open(filename, mode="r", iline = 189,
     if ignore_geometry:
         return f
 
-    return infer_geometry(f, metrics, iline, xline, strict)
+    def scan(f):
+        if regular:
+            checks = 64 if regular is True else int(regular)
+            geometry = regular_geometry(f, iline, xline, checks)
+            if geometry is not None:
+                sorting, ilines, xlines, offsets = geometry
+                try:
+                    f.interpret(ilines, xlines, offsets, sorting)
+                    return f
+                except ValueError:
+                    # e.g. repeated offsets, let the full scan decide
+                    pass
+
+        if not sparse:
+            return infer_geometry(f, metrics, iline, xline, strict)
+
+        try:
+            return infer_geometry(f, metrics, iline, xline, strict = True)
+        except (RuntimeError, ValueError):
+            # not a full cube - build the trace lookup table instead
+            try:
+                geometry = sparse_geometry(f, iline, xline)
+            except ValueError:
+                if strict: raise
+                return infer_geometry(f, metrics, iline, xline, strict)
+
+            sorting, ilines, xlines, offsets, lookup = geometry
+            return f._interpret_sparse(ilines, xlines, offsets, lookup,
+                                       sorting, fill)
+
+    def infer(f):
+        if index:
+            return load_geometry(f, metrics, iline, xline, index, scan, fill,
+                                 sparse, regular)
+        return scan(f)
+
+    if geometry == 'lazy':
+        f._infer = infer
+        return f
+
+    try:
+        return infer(f)
+    except:
+        f.close()
+        raise
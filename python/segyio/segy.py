@@ -6,12 +6,15 @@ except (NameError, ImportError): pass
 
 import numpy as np
 
-from .gather import Gather, Groups
-from .line import Line
+from .gather import Gather, SparseGather, Groups
+from .line import Line, SparseLine
+from .subvolume import SubVolume
 from .trace import Trace, Header, Attributes, Text
 from .field import Field
 
 from .tracesortingformat import TraceSortingFormat
+from .tracefield import TraceField
+from . import tracefield
 
 
 
@@ -45,6 +48,8 @@ class SegyFile(object):
         self._iline_stride = None
         self._xline_length = None
         self._xline_stride = None
+        self._lookup = None
+        self._fill = 0
 
         self.xfd = fd
         metrics = self.xfd.metrics()
@@ -79,11 +84,15 @@ class SegyFile(object):
                             self.tracecount,
                             metrics['samplecount'],
                             self.readonly,
+                            segy = self,
                            )
         self._header = Header(self)
         self._iline = None
         self._xline = None
         self._gather = None
+        self._subvolume = None
+        self._view = None
+        self._infer = None
         self.depth = None
         self.endian = endian
 
@@ -221,6 +230,141 @@ class SegyFile(object):
         """
         return self.xfd.mmap()
 
+    def _infer_geometry(self):
+        # files opened with geometry = 'lazy' infer the geometry the first time
+        # it is needed. If inference fails, it is attempted (and fails) again
+        # on the next access, rather than leaving the file half-initialised
+        if self._infer is None:
+            return
+
+        infer = self._infer
+        self._infer = None
+        try:
+            infer(self)
+        except:
+            self._infer = infer
+            raise
+
+    def _byteorder(self):
+        return '<' if self.endian in ('little', 'lsb') else '>'
+
+    def _sample_dtype(self):
+        # the dtype of the samples as they are laid out on disk, or None if
+        # they must be converted (ibm float, 3-byte integers)
+        if self._fmt not in (2, 3, 5, 6, 8, 9, 10, 11, 12, 16):
+            return None
+        return self.dtype.newbyteorder(self._byteorder())
+
+    def as_structured(self):
+        """The whole file as a structured memmap
+
+        Memory map the trace area of the file, i.e. everything from the first
+        trace header and out, as a numpy.memmap with one record per trace.
+        The record dtype has a field for every ``TraceField``, named after the
+        field and with the byte order of the file, followed by the samples in
+        the ``samples`` field.
+
+        Selecting a header field gives a strided view of that word for every
+        trace in the file, so header columns are available without reading
+        the headers one by one. The memmap is writeable if the file is opened
+        for writing.
+
+        If the samples can't be represented by numpy, i.e. for IBM float and
+        the 3-byte integers, ``samples`` is the raw, unconverted bytes of the
+        trace.
+
+        Returns
+        -------
+        structured : numpy.memmap
+            of shape (tracecount,)
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        All inline numbers in the file:
+
+        >>> ilines = f.as_structured()['INLINE_3D']
+
+        Offsets and samples of every trace in a common-offset gather:
+
+        >>> s = f.as_structured()
+        >>> gather = s[s['offset'] == 250]['samples']
+        """
+        order = self._byteorder()
+        metrics = self.xfd.metrics()
+        header = sorted(tracefield.keys.items(), key = lambda kv: kv[1])
+        stops = [offset for _, offset in header[1:]] + [240 + 1]
+
+        names, formats, offsets = [], [], []
+        for (name, offset), stop in zip(header, stops):
+            size = stop - offset
+            kind = 'u' if offset == TraceField.TRACE_SAMPLE_COUNT else 'i'
+            names.append(name)
+            formats.append('{}{}{}'.format(order, kind, size))
+            offsets.append(offset - 1)
+
+        samples = self._sample_dtype()
+        if samples is None:
+            samples = np.dtype('V{}'.format(metrics['trace_bsize']))
+        else:
+            samples = np.dtype((samples, len(self.samples)))
+
+        names.append('samples')
+        formats.append(samples)
+        offsets.append(240)
+
+        dtype = np.dtype({
+            'names': names,
+            'formats': formats,
+            'offsets': offsets,
+            'itemsize': 240 + metrics['trace_bsize'],
+        })
+
+        return np.memmap(self._filename,
+                         dtype = dtype,
+                         mode = 'r' if self.readonly else 'r+',
+                         offset = metrics['trace0'],
+                         shape = (self.tracecount,),
+                        )
+
+    def _view_traces(self):
+        # map the trace area of the file, and lay the (tracecount, samples)
+        # array over it with strides that skip the trace headers. the mapping
+        # is numpy's own and is shared by all views, so that trace- and line
+        # views don't map the file over and over, and survive close()
+        if self._view is not None:
+            return self._view
+
+        dtype = self._sample_dtype()
+        if dtype is None:
+            msg = 'cannot view {}, samples must be converted'
+            raise ValueError(msg.format(self.format))
+
+        metrics = self.xfd.metrics()
+        samples = len(self.samples)
+        stride = metrics['trace_bsize'] + 240
+
+        if self.tracecount == 0:
+            return np.empty((0, samples), dtype = dtype)
+
+        mapping = np.memmap(self._filename,
+                            dtype = np.uint8,
+                            mode = 'r' if self.readonly else 'r+',
+                            offset = metrics['trace0'],
+                            shape = (self.tracecount * stride,),
+                           )
+
+        self._view = np.ndarray(shape = (self.tracecount, samples),
+                                dtype = dtype,
+                                buffer = mapping,
+                                offset = 240,
+                                strides = (stride, dtype.itemsize),
+                               )
+        return self._view
+
     @property
     def dtype(self):
         """
@@ -253,6 +397,7 @@ class SegyFile(object):
         sorting : int
 
         """
+        self._infer_geometry()
         return self._sorting
 
     @property
@@ -302,6 +447,7 @@ class SegyFile(object):
         offsets : numpy.ndarray of int
 
         """
+        self._infer_geometry()
         return self._offsets
 
     @property
@@ -337,6 +483,39 @@ class SegyFile(object):
         """
         return self.ilines is None
 
+    @property
+    def lookup(self):
+        """The trace lookup table of a sparse file
+
+        For files opened with ``sparse = True`` that have missing traces, the
+        trace number of every (inline, crossline, offset) position, indexed by
+        the position of the labels in `ilines`, `xlines` and `offsets`.
+        Positions without a trace are -1.
+
+        Returns
+        -------
+
+        lookup : numpy.ndarray of int or None
+            An array of shape (ilines, xlines, offsets), or None if the file
+            is not sparse
+
+        Notes
+        -----
+
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+
+        Find the traces of inline 12:
+
+        >>> i = list(f.ilines).index(12)
+        >>> traces = f.lookup[i, :, 0]
+        >>> traces[traces >= 0]
+        """
+        self._infer_geometry()
+        return self._lookup
+
     @property
     def header(self):
         """
@@ -390,11 +569,12 @@ class SegyFile(object):
         self.header[:] = val
 
     def attributes(self, field):
-        """File-wide attribute (header word) reading
+        """File-wide attribute (header word) reading and writing
 
         Lazily gather a single header word for every trace in the file. The
         array can be sliced, supports index lookup, and numpy-style
-        list-of-indices.
+        list-of-indices. In files opened with 'r+', the word can be written by
+        assigning to the array.
 
         Parameters
         ----------
@@ -413,9 +593,64 @@ class SegyFile(object):
 
         .. versionadded:: 1.1
 
+        .. versionchanged:: 1.10
+            Attributes are writable
+
         """
         return Attributes(field, self.xfd, self.tracecount)
 
+    def attributes_many(self, fields, traces = slice(None)):
+        """Read many header words for every trace, in one pass
+
+        Read the header words `fields` of every trace in the slice `traces`.
+        Every trace header is read only once, regardless of the number of
+        fields, so this is much faster than calling ``attributes(field)[:]``
+        for every field.
+
+        Parameters
+        ----------
+
+        fields : iterable of int or segyio.TraceField
+        traces : slice
+            The traces to read, defaults to all
+
+        Returns
+        -------
+
+        attrs : dict of numpy.ndarray
+            One array of header words per field, keyed by the field as given
+
+        Notes
+        -----
+
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+
+        Read the inline, crossline and offset of every trace:
+
+        >>> fields = [TraceField.INLINE_3D,
+        ...           TraceField.CROSSLINE_3D,
+        ...           TraceField.offset]
+        >>> attrs = f.attributes_many(fields)
+        >>> ilines = attrs[TraceField.INLINE_3D]
+
+        Read all the header words of every other trace into a dataframe:
+
+        >>> keys = segyio.tracefield.keys
+        >>> attrs = f.attributes_many(keys.values(), slice(None, None, 2))
+        >>> df = pandas.DataFrame({k: attrs[v] for k, v in keys.items()})
+        """
+        fields = list(fields)
+        words = np.asarray([int(field) for field in fields], dtype = np.intc)
+        start, stop, step = traces.indices(self.tracecount)
+        length = len(range(start, stop, step))
+
+        attrs = np.empty((len(fields), length), dtype = np.intc)
+        self.xfd.fields_forall(attrs, start, stop, step, words)
+        return dict(zip(fields, attrs))
+
     @property
     def trace(self):
         """
@@ -495,6 +730,7 @@ class SegyFile(object):
         inlines : array_like of int or None
 
         """
+        self._infer_geometry()
         return self._ilines
 
     @property
@@ -519,9 +755,19 @@ class SegyFile(object):
         if self.unstructured:
             raise ValueError(self._unstructured_errmsg)
 
+        self._infer_geometry()
         if self._iline is not None:
             return self._iline
 
+        if self._lookup is not None:
+            self._iline = SparseLine(self,
+                                     self.ilines,
+                                     self._lookup,
+                                     self.offsets,
+                                     self._fill,
+                                    )
+            return self._iline
+
         self._iline = Line(self,
                            self.ilines,
                            self._iline_length,
@@ -567,6 +813,7 @@ class SegyFile(object):
         crosslines : array_like of int or None
 
         """
+        self._infer_geometry()
         return self._xlines
 
     @property
@@ -590,9 +837,19 @@ class SegyFile(object):
         if self.unstructured:
             raise ValueError(self._unstructured_errmsg)
 
+        self._infer_geometry()
         if self._xline is not None:
             return self._xline
 
+        if self._lookup is not None:
+            self._xline = SparseLine(self,
+                                     self.xlines,
+                                     self._lookup.transpose(1, 0, 2),
+                                     self.offsets,
+                                     self._fill,
+                                    )
+            return self._xline
+
         self._xline = Line(self,
                            self.xlines,
                            self._xline_length,
@@ -694,6 +951,7 @@ class SegyFile(object):
             enabled for unstructured files
         """
 
+        self._infer_geometry()
         if self.depth is not None:
             return self.depth
 
@@ -737,12 +995,51 @@ class SegyFile(object):
         if self.unstructured:
             raise ValueError(self._unstructured_errmsg)
 
+        self._infer_geometry()
         if self._gather is not None:
             return self._gather
 
+        if self._lookup is not None:
+            self._gather = SparseGather(self.trace,
+                                        self.iline,
+                                        self.xline,
+                                        self.offsets,
+                                        self._lookup,
+                                        self._fill,
+                                       )
+            return self._gather
+
         self._gather = Gather(self.trace, self.iline, self.xline, self.offsets)
         return self._gather
 
+    @property
+    def subvolume(self):
+        """
+        Interact with segy in sub volume mode
+
+        Returns
+        -------
+        subvolume : SubVolume
+
+        Raises
+        ------
+        ValueError
+            If the file is unstructured
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+        """
+        if self.unstructured:
+            raise ValueError(self._unstructured_errmsg)
+
+        self._infer_geometry()
+        if self._subvolume is not None:
+            return self._subvolume
+
+        self._subvolume = SubVolume(self)
+        return self._subvolume
+
     @property
     def text(self):
         """Interact with segy in text mode
@@ -897,6 +1194,15 @@ class SegyFile(object):
         ... f.interpret(ilines, xlines)
         """
 
+        # an explicit structure replaces any pending lazy inference
+        self._infer = None
+        self._lookup = None
+        self._iline = None
+        self._xline = None
+        self._gather = None
+        self._subvolume = None
+        self.depth = None
+
         valid_sortings = {
             1           : TraceSortingFormat.CROSSLINE_SORTING,
             2           : TraceSortingFormat.INLINE_SORTING,
@@ -964,6 +1270,24 @@ class SegyFile(object):
 
         return self
 
+    def _interpret_sparse(self, ilines, xlines, offsets, lookup, sorting, fill):
+        # a file with missing traces has no line lengths or strides, every
+        # trace is found through the (inline, crossline, offset) lookup table
+        self._infer = None
+        self._iline = None
+        self._xline = None
+        self._gather = None
+        self._subvolume = None
+        self.depth = None
+
+        self._sorting = sorting
+        self._ilines  = np.copy(np.asarray(ilines,  dtype=np.intc))
+        self._xlines  = np.copy(np.asarray(xlines,  dtype=np.intc))
+        self._offsets = np.copy(np.asarray(offsets, dtype=np.intc))
+        self._lookup  = np.asarray(lookup, dtype=np.intc)
+        self._fill    = fill
+        return self
+
     def group(self, word):
         """Get groups of traces matching a key
 
@@ -145,6 +145,7 @@ PyObject* Error( int err ) {
                                                "likely corrupted file" );
         case SEGY_READONLY:    return IOError( "file not open for writing. "
                                                "open with 'r+'" );
+        case SEGY_MEMORY_ERROR: return PyErr_NoMemory();
         default:               return RuntimeError( err );
     }
 }
@@ -182,6 +183,35 @@ struct segyiofd {
     int samplecount;
     int format;
     int elemsize;
+    int busy;
+};
+
+/*
+ * Release the GIL for the lifetime of this object, so that other python
+ * threads can run while the segy_* functions are busy reading or writing.
+ * Only plain C data may be touched while the GIL is released - python objects
+ * (and exceptions) must wait until this object goes out of scope.
+ *
+ * The file handle is marked busy for as long as the GIL is released, so that
+ * operations that invalidate the handle (close, mmap, re-open) can refuse to
+ * run concurrently with a read or write.
+ */
+struct nogil {
+    explicit nogil( segyiofd* self ) : self( self ) {
+        ++self->busy;
+        this->state = PyEval_SaveThread();
+    }
+
+    ~nogil() {
+        PyEval_RestoreThread( this->state );
+        --this->self->busy;
+    }
+
+    segyiofd* self;
+    PyThreadState* state;
+
+private:
+    nogil( const nogil& );
 };
 
 struct buffer_guard {
@@ -228,6 +258,16 @@ struct buffer_guard {
     Py_buffer buffer;
 };
 
+/*
+ * The format samples are decoded with. Files with a rubbish format field in
+ * the binary header are read as 4-byte ibm float, like segyopen assumes when
+ * computing the trace size. The raw format is still reported by metrics().
+ */
+int sample_format( const segyiofd* self ) {
+    if( segy_trsize( self->format, 1 ) < 0 ) return SEGY_IBM_FLOAT_4_BYTE;
+    return self->format;
+}
+
 namespace fd {
 
 int init( segyiofd* self, PyObject* args, PyObject* kwargs ) {
@@ -287,6 +327,11 @@ int init( segyiofd* self, PyObject* args, PyObject* kwargs ) {
      * file on the same object. That means the previous file handle must be
      * properly closed before the new file is set
      */
+    if( self->busy ) {
+        RuntimeError( "cannot re-open file with I/O in progress" );
+        return -1;
+    }
+
     self->fd.swap( fd );
 
     return 0;
@@ -544,6 +589,9 @@ PyObject* close( segyiofd* self ) {
     /* multiple close() is a no-op */
     if( !self->fd ) return Py_BuildValue( "" );
 
+    if( self->busy )
+        return RuntimeError( "cannot close file with I/O in progress" );
+
     errno = 0;
     self->fd.close();
 
@@ -568,6 +616,9 @@ PyObject* mmap( segyiofd* self ) {
 
     if( !fp ) return NULL;
 
+    if( self->busy )
+        return RuntimeError( "cannot mmap file with I/O in progress" );
+
     const int err = segy_mmap( fp );
 
     if( err != SEGY_OK )
@@ -769,14 +820,74 @@ PyObject* field_forall( segyiofd* self, PyObject* args ) {
     buffer_guard buffer( bufferobj, PyBUF_CONTIG );
     if( !buffer ) return NULL;
 
-    const int err = segy_field_forall( fp,
-                                       field,
-                                       start,
-                                       stop,
-                                       step,
-                                       buffer.buf< int >(),
-                                       self->trace0,
-                                       self->trace_bsize );
+    int err;
+    {
+        nogil released( self );
+        err = segy_field_forall( fp,
+                                 field,
+                                 start,
+                                 stop,
+                                 step,
+                                 buffer.buf< int >(),
+                                 self->trace0,
+                                 self->trace_bsize );
+    }
+
+    if( err ) return Error( err );
+
+    Py_INCREF( bufferobj );
+    return bufferobj;
+}
+
+static int slicelength( int start, int stop, int step ) {
+    if( ( step < 0 && stop >= start ) ||
+        ( step > 0 && start >= stop ) ) return 0;
+
+    if( step < 0 ) return (stop - start + 1) / step + 1;
+    return (stop - start - 1) / step + 1;
+}
+
+PyObject* fields_forall( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    PyObject* bufferobj;
+    buffer_guard fields;
+    int start, stop, step;
+
+    if( !PyArg_ParseTuple( args, "Oiiis*", &bufferobj,
+                                           &start,
+                                           &stop,
+                                           &step,
+                                           &fields ) )
+        return NULL;
+
+    if( step == 0 ) return ValueError( "slice step cannot be zero" );
+
+    buffer_guard buffer( bufferobj, PyBUF_CONTIG );
+    if( !buffer ) return NULL;
+
+    const int nfields = fields.len() / sizeof(int);
+    const int slicelen = slicelength( start, stop, step );
+    const Py_ssize_t size = Py_ssize_t(nfields) * slicelen * sizeof(int);
+    if( buffer.len() != size )
+        return ValueError( "internal: array size mismatch "
+                           "(output %zd, expected %zd)",
+                           buffer.len(), size );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_fields_forall( fp,
+                                  fields.buf< const int >(),
+                                  nfields,
+                                  start,
+                                  stop,
+                                  step,
+                                  buffer.buf< int >(),
+                                  self->trace0,
+                                  self->trace_bsize );
+    }
 
     if( err ) return Error( err );
 
@@ -806,14 +917,17 @@ PyObject* field_foreach( segyiofd* self, PyObject* args ) {
     int* out = bufout.buf< int >();
     Py_ssize_t len = bufout.len() / sizeof(int);
     int err = 0;
-    for( int i = 0; err == 0 && i < len; ++i ) {
-        err = segy_field_forall( fp, field,
-                                     ind[ i ],
-                                     ind[ i ] + 1,
-                                     1,
-                                     out + i,
-                                     self->trace0,
-                                     self->trace_bsize );
+    {
+        nogil released( self );
+        for( int i = 0; err == 0 && i < len; ++i ) {
+            err = segy_field_forall( fp, field,
+                                         ind[ i ],
+                                         ind[ i ] + 1,
+                                         1,
+                                         out + i,
+                                         self->trace0,
+                                         self->trace_bsize );
+        }
     }
 
     if( err ) return Error( err );
@@ -822,6 +936,171 @@ PyObject* field_foreach( segyiofd* self, PyObject* args ) {
     return bufferobj;
 }
 
+PyObject* putfields_forall( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    buffer_guard buffer;
+    buffer_guard fields;
+    int start, stop, step;
+
+    if( !PyArg_ParseTuple( args, "s*iiis*", &buffer,
+                                            &start,
+                                            &stop,
+                                            &step,
+                                            &fields ) )
+        return NULL;
+
+    if( step == 0 ) return ValueError( "slice step cannot be zero" );
+
+    const int nfields = fields.len() / sizeof(int);
+    const int slicelen = slicelength( start, stop, step );
+    const Py_ssize_t size = Py_ssize_t(nfields) * slicelen * sizeof(int);
+    if( buffer.len() != size )
+        return ValueError( "internal: array size mismatch "
+                           "(values %zd, expected %zd)",
+                           buffer.len(), size );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_set_fields_forall( fp,
+                                      fields.buf< const int >(),
+                                      nfields,
+                                      start,
+                                      stop,
+                                      step,
+                                      buffer.buf< const int >(),
+                                      self->trace0,
+                                      self->trace_bsize );
+    }
+
+    if( err ) return Error( err );
+    return Py_BuildValue( "" );
+}
+
+PyObject* putfield_foreach( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    buffer_guard buffer;
+    buffer_guard indices;
+    int field;
+    if( !PyArg_ParseTuple( args, "s*s*i", &buffer, &indices, &field ) )
+        return NULL;
+
+    if( buffer.len() != indices.len() )
+        return ValueError( "internal: array size mismatch "
+                           "(values %zd, indices %zd)",
+                           buffer.len(), indices.len() );
+
+    const int* ind = indices.buf< const int >();
+    const int* val = buffer.buf< const int >();
+    Py_ssize_t len = buffer.len() / sizeof(int);
+    int err = 0;
+    {
+        nogil released( self );
+        for( int i = 0; err == 0 && i < len; ++i ) {
+            err = segy_set_field_forall( fp, field,
+                                             ind[ i ],
+                                             ind[ i ] + 1,
+                                             1,
+                                             val + i,
+                                             self->trace0,
+                                             self->trace_bsize );
+        }
+    }
+
+    if( err ) return Error( err );
+    return Py_BuildValue( "" );
+}
+
+PyObject* getths( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    int start, stop, step;
+    PyObject* bufferobj;
+
+    if( !PyArg_ParseTuple( args, "iiiO", &start, &stop, &step, &bufferobj ) )
+        return NULL;
+
+    if( step == 0 ) return ValueError( "slice step cannot be zero" );
+
+    buffer_guard buffer( bufferobj, PyBUF_CONTIG );
+    if( !buffer ) return NULL;
+
+    const Py_ssize_t size = Py_ssize_t( slicelength( start, stop, step ) )
+                          * SEGY_TRACE_HEADER_SIZE;
+    if( buffer.len() != size )
+        return ValueError( "internal: array size mismatch "
+                           "(output %zd, expected %zd)",
+                           buffer.len(), size );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_traceheaders( fp, start, stop, step,
+                                     buffer.buf(),
+                                     self->trace0,
+                                     self->trace_bsize );
+    }
+
+    switch( err ) {
+        case SEGY_OK:
+            Py_INCREF( bufferobj );
+            return bufferobj;
+
+        case SEGY_FREAD_ERROR:
+            return IOError( "I/O operation failed on trace headers [%d, %d)",
+                            start, stop );
+
+        default:
+            return Error( err );
+    }
+}
+
+PyObject* putths( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    int start, stop, step;
+    buffer_guard buffer;
+
+    if( !PyArg_ParseTuple( args, "iiis*", &start, &stop, &step, &buffer ) )
+        return NULL;
+
+    if( step == 0 ) return ValueError( "slice step cannot be zero" );
+
+    const Py_ssize_t size = Py_ssize_t( slicelength( start, stop, step ) )
+                          * SEGY_TRACE_HEADER_SIZE;
+    if( buffer.len() != size )
+        return ValueError( "internal: array size mismatch "
+                           "(input %zd, expected %zd)",
+                           buffer.len(), size );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_write_traceheaders( fp, start, stop, step,
+                                           buffer.buf< const char >(),
+                                           self->trace0,
+                                           self->trace_bsize );
+    }
+
+    switch( err ) {
+        case SEGY_OK:
+            return Py_BuildValue( "" );
+
+        case SEGY_FWRITE_ERROR:
+            return IOError( "I/O operation failed on trace headers [%d, %d)",
+                            start, stop );
+
+        default:
+            return Error( err );
+    }
+}
+
 PyObject* metrics( segyiofd* self ) {
     static const int text = SEGY_TEXT_HEADER_SIZE;
     static const int bin  = SEGY_BINARY_HEADER_SIZE;
@@ -866,35 +1145,22 @@ PyObject* cube_metrics( segyiofd* self, PyObject* args ) {
     metrics_errmsg errmsg = { il, xl, SEGY_TR_OFFSET };
 
     int sorting = -1;
-    int err = segy_sorting( fp, il,
-                                xl,
-                                SEGY_TR_OFFSET,
-                                &sorting,
-                                self->trace0,
-                                self->trace_bsize );
-
-    if( err ) return errmsg( err );
-
     int offset_count = -1;
-    err = segy_offsets( fp, il,
-                            xl,
-                            self->tracecount,
-                            &offset_count,
-                            self->trace0,
-                            self->trace_bsize );
-
-    if( err ) return errmsg( err );
-
     int xl_count = 0;
     int il_count = 0;
-    err = segy_lines_count( fp, il,
-                                xl,
-                                sorting,
-                                offset_count,
-                                &il_count,
-                                &xl_count,
-                                self->trace0,
-                                self->trace_bsize );
+    int err;
+    {
+        nogil released( self );
+        err = segy_geometry( fp, il,
+                                 xl,
+                                 SEGY_TR_OFFSET,
+                                 &sorting,
+                                 &offset_count,
+                                 &il_count,
+                                 &xl_count,
+                                 self->trace0,
+                                 self->trace_bsize );
+    }
 
     if( err == SEGY_NOTFOUND )
         return ValueError( "could not parse geometry, "
@@ -1015,15 +1281,19 @@ PyObject* gettr( segyiofd* self, PyObject* args ) {
     int err = 0;
     int i = 0;
     char* buf = buffer.buf();
-    for( ; err == 0 && i < length; ++i, buf += skip ) {
-        err = segy_readsubtr( fp, start + (i * step),
-                                  sample_start,
-                                  sample_stop,
-                                  sample_step,
-                                  buf,
-                                  NULL,
-                                  trace0,
-                                  trace_bsize );
+    {
+        nogil released( self );
+        for( ; err == 0 && i < length; ++i, buf += skip ) {
+            err = segy_readsubtr_native( fp, start + (i * step),
+                                             sample_start,
+                                             sample_stop,
+                                             sample_step,
+                                             sample_format( self ),
+                                             buf,
+                                             NULL,
+                                             trace0,
+                                             trace_bsize );
+        }
     }
 
     if( err == SEGY_FREAD_ERROR )
@@ -1031,7 +1301,56 @@ PyObject* gettr( segyiofd* self, PyObject* args ) {
 
     if( err ) return Error( err );
 
-    segy_to_native( self->format, bufsize, buffer.buf() );
+    Py_INCREF( bufferobj );
+    return bufferobj;
+}
+
+PyObject* gettraces( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    PyObject* bufferobj;
+    buffer_guard indices;
+    int start = 0;
+    int stop = self->samplecount;
+    int step = 1;
+    if( !PyArg_ParseTuple( args, "Os*|iii", &bufferobj,
+                                            &indices,
+                                            &start,
+                                            &stop,
+                                            &step ) )
+        return NULL;
+
+    buffer_guard buffer( bufferobj, PyBUF_CONTIG );
+    if( !buffer ) return NULL;
+
+    const int count = indices.len() / sizeof( int );
+    const int samples = slicelength( start, stop, step );
+    const Py_ssize_t bufsize = (Py_ssize_t) count * samples * self->elemsize;
+
+    if( buffer.len() < bufsize )
+        return ValueError( "internal: data trace buffer too small, "
+                           "expected %zd, was %zd",
+                           bufsize, buffer.len() );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_readsubtraces_native( fp, indices.buf< const int >(),
+                                             count,
+                                             start,
+                                             stop,
+                                             step,
+                                             sample_format( self ),
+                                             buffer.buf(),
+                                             self->trace0,
+                                             self->trace_bsize );
+    }
+
+    if( err == SEGY_FREAD_ERROR )
+        return IOError( "I/O operation failed on data traces" );
+
+    if( err ) return Error( err );
 
     Py_INCREF( bufferobj );
     return bufferobj;
@@ -1053,14 +1372,24 @@ PyObject* puttr( segyiofd* self, PyObject* args ) {
                           self->trace_bsize,
                           buflen );
 
-    segy_from_native( self->format, self->samplecount, buffer );
+    /*
+     * convert a private copy, so that the caller's array is never modified,
+     * not even temporarily while the GIL is released
+     */
+    heapbuffer scratch( self->trace_bsize );
+    if( !scratch ) return NULL;
+    std::memcpy( scratch, buffer, self->trace_bsize );
 
-    int err = segy_writetrace( fp, traceno,
-                                   buffer,
+    int err;
+    {
+        nogil released( self );
+        segy_from_native( sample_format( self ), self->samplecount, scratch );
+
+        err = segy_writetrace( fp, traceno,
+                                   scratch,
                                    self->trace0,
                                    self->trace_bsize );
-
-    segy_to_native( self->format, self->samplecount, buffer );
+    }
 
     switch( err ) {
         case SEGY_OK:
@@ -1094,18 +1423,37 @@ PyObject* getline( segyiofd* self, PyObject* args) {
     buffer_guard buffer( bufferobj, PyBUF_CONTIG );
     if( !buffer ) return NULL;
 
-    int err = segy_read_line( fp, line_trace0,
-                                  line_length,
-                                  stride,
-                                  offsets,
-                                  buffer.buf(),
-                                  self->trace0,
-                                  self->trace_bsize);
-    if( err ) return Error( err );
+    if( buffer.len() < (Py_ssize_t)self->trace_bsize * line_length )
+        return ValueError( "internal: line buffer too small, "
+                           "expected %zi, was %zd",
+                           (Py_ssize_t)self->trace_bsize * line_length,
+                           buffer.len() );
 
-    segy_to_native( self->format,
-                    self->samplecount * line_length,
-                    buffer.buf() );
+    /*
+     * equivalent to segy_read_line + segy_to_native, but decodes every trace
+     * as it is read
+     */
+    int err = 0;
+    {
+        nogil released( self );
+        char* buf = buffer.buf();
+        const int samples = self->samplecount;
+        stride *= offsets;
+        for( ; err == 0 && line_length--; line_trace0 += stride ) {
+            err = segy_readsubtr_native( fp, line_trace0,
+                                             0,
+                                             samples,
+                                             1,
+                                             sample_format( self ),
+                                             buf,
+                                             NULL,
+                                             self->trace0,
+                                             self->trace_bsize );
+            buf += self->trace_bsize;
+        }
+    }
+
+    if( err ) return Error( err );
 
     Py_INCREF( bufferobj );
     return bufferobj;
@@ -1133,6 +1481,7 @@ PyObject* putline( segyiofd* self, PyObject* args) {
         return NULL;
 
     buffer_guard buffer( val, PyBUF_CONTIG );
+    if( !buffer ) return NULL;
 
     if( self->trace_bsize * line_length > buffer.len() )
         return ValueError("line too short: expected %d elements, got %zd",
@@ -1140,17 +1489,25 @@ PyObject* putline( segyiofd* self, PyObject* args) {
                           buffer.len() / self->elemsize );
 
     const int elems = line_length * self->samplecount;
-    segy_from_native( self->format, elems, buffer.buf() );
 
-    int err = segy_write_line( fp, line_trace0,
+    /* convert a private copy, like puttr */
+    heapbuffer scratch( self->trace_bsize * line_length );
+    if( !scratch ) return NULL;
+    std::memcpy( scratch, buffer.buf(), self->trace_bsize * line_length );
+
+    int err;
+    {
+        nogil released( self );
+        segy_from_native( sample_format( self ), elems, scratch );
+
+        err = segy_write_line( fp, line_trace0,
                                    line_length,
                                    stride,
                                    offsets,
-                                   buffer.buf(),
+                                   scratch,
                                    self->trace0,
                                    self->trace_bsize );
-
-    segy_to_native( self->format, elems, buffer.buf() );
+    }
 
     switch( err ) {
         case SEGY_OK:
@@ -1191,15 +1548,19 @@ PyObject* getdepth( segyiofd* self, PyObject* args ) {
     const long trace0 = self->trace0;
     const int trace_bsize = self->trace_bsize;
 
-    for( ; err == 0 && traceno < count; ++traceno, buf += skip ) {
-        err = segy_readsubtr( fp,
-                              traceno * offsets,
-                              depth,
-                              depth + 1,
-                              1,
-                              buf,
-                              NULL,
-                              trace0, trace_bsize);
+    {
+        nogil released( self );
+        for( ; err == 0 && traceno < count; ++traceno, buf += skip ) {
+            err = segy_readsubtr_native( fp,
+                                         traceno * offsets,
+                                         depth,
+                                         depth + 1,
+                                         1,
+                                         sample_format( self ),
+                                         buf,
+                                         NULL,
+                                         trace0, trace_bsize);
+        }
     }
 
     if( err == SEGY_FREAD_ERROR )
@@ -1208,7 +1569,58 @@ PyObject* getdepth( segyiofd* self, PyObject* args ) {
 
     if( err ) return Error( err );
 
-    segy_to_native( self->format, count, buffer.buf() );
+    Py_INCREF( bufferobj );
+    return bufferobj;
+}
+
+PyObject* getdepths( segyiofd* self, PyObject* args ) {
+    segy_file* fp = self->fd;
+    if( !fp ) return NULL;
+
+    int start, stop, step;
+    int count;
+    int offsets;
+    PyObject* bufferobj;
+
+    if( !PyArg_ParseTuple( args, "iiiiiO", &start,
+                                           &stop,
+                                           &step,
+                                           &count,
+                                           &offsets,
+                                           &bufferobj ) )
+        return NULL;
+
+    buffer_guard buffer( bufferobj, PyBUF_CONTIG );
+    if( !buffer ) return NULL;
+
+    const int depths = slicelength( start, stop, step );
+    const Py_ssize_t bufsize = (Py_ssize_t) count * depths * self->elemsize;
+
+    if( buffer.len() < bufsize )
+        return ValueError( "internal: depth buffer too small, "
+                           "expected %zd, was %zd",
+                           bufsize, buffer.len() );
+
+    int err;
+    {
+        nogil released( self );
+        err = segy_readdepths_native( fp, 0,
+                                          count,
+                                          offsets,
+                                          start,
+                                          stop,
+                                          step,
+                                          sample_format( self ),
+                                          buffer.buf(),
+                                          self->trace0,
+                                          self->trace_bsize );
+    }
+
+    if( err == SEGY_FREAD_ERROR )
+        return IOError( "I/O operation failed on depths [%d, %d)",
+                        start, stop );
+
+    if( err ) return Error( err );
 
     Py_INCREF( bufferobj );
     return bufferobj;
@@ -1236,30 +1648,36 @@ PyObject* putdepth( segyiofd* self, PyObject* args ) {
         return ValueError("slice too short: expected %d elements, got %zd",
                           count, buffer.len() / self->elemsize );
 
+    /* convert a private copy, like puttr */
+    heapbuffer scratch( count * self->elemsize );
+    if( !scratch ) return NULL;
+    std::memcpy( scratch, buffer.buf(), count * self->elemsize );
+
     int traceno = 0;
     int err = 0;
-    const char* buf = buffer.buf();
+    const char* buf = scratch;
     const int skip = self->elemsize;
 
     const long trace0 = self->trace0;
     const int trace_bsize = self->trace_bsize;
 
-    segy_from_native( self->format, count, buffer.buf() );
-
-    for( ; err == 0 && traceno < count; ++traceno, buf += skip ) {
-        err = segy_writesubtr( fp,
-                               traceno * offsets,
-                               depth,
-                               depth + 1,
-                               1,
-                               buf,
-                               NULL,
-                               trace0,
-                               trace_bsize );
+    {
+        nogil released( self );
+        segy_from_native( sample_format( self ), count, scratch );
+
+        for( ; err == 0 && traceno < count; ++traceno, buf += skip ) {
+            err = segy_writesubtr( fp,
+                                   traceno * offsets,
+                                   depth,
+                                   depth + 1,
+                                   1,
+                                   buf,
+                                   NULL,
+                                   trace0,
+                                   trace_bsize );
+        }
     }
 
-    segy_to_native( self->format, count, buffer.buf() );
-
     if( err == SEGY_FREAD_ERROR )
         return IOError( "I/O operation failed on data trace %d at depth %d",
                         traceno, depth );
@@ -1352,18 +1770,25 @@ PyMethodDef methods [] = {
     { "getbin", (PyCFunction) fd::getbin, METH_VARARGS, "Get binary header." },
     { "putbin", (PyCFunction) fd::putbin, METH_VARARGS, "Put binary header." },
 
-    { "getth", (PyCFunction) fd::getth, METH_VARARGS, "Get trace header." },
-    { "putth", (PyCFunction) fd::putth, METH_VARARGS, "Put trace header." },
+    { "getth",  (PyCFunction) fd::getth,  METH_VARARGS, "Get trace header." },
+    { "putth",  (PyCFunction) fd::putth,  METH_VARARGS, "Put trace header." },
+    { "getths", (PyCFunction) fd::getths, METH_VARARGS, "Get many trace headers." },
+    { "putths", (PyCFunction) fd::putths, METH_VARARGS, "Put many trace headers." },
 
     { "field_forall",  (PyCFunction) fd::field_forall,  METH_VARARGS, "Field for-all."  },
     { "field_foreach", (PyCFunction) fd::field_foreach, METH_VARARGS, "Field for-each." },
+    { "fields_forall", (PyCFunction) fd::fields_forall, METH_VARARGS, "Fields for-all." },
+    { "putfields_forall", (PyCFunction) fd::putfields_forall, METH_VARARGS, "Write fields for-all." },
+    { "putfield_foreach", (PyCFunction) fd::putfield_foreach, METH_VARARGS, "Write field for-each." },
 
     { "gettr", (PyCFunction) fd::gettr, METH_VARARGS, "Get trace." },
+    { "gettraces", (PyCFunction) fd::gettraces, METH_VARARGS, "Get traces." },
     { "puttr", (PyCFunction) fd::puttr, METH_VARARGS, "Put trace." },
 
     { "getline",  (PyCFunction) fd::getline,  METH_VARARGS, "Get line." },
     { "putline",  (PyCFunction) fd::putline,  METH_VARARGS, "Put line." },
     { "getdepth", (PyCFunction) fd::getdepth, METH_VARARGS, "Get depth." },
+    { "getdepths", (PyCFunction) fd::getdepths, METH_VARARGS, "Get depths." },
     { "putdepth", (PyCFunction) fd::putdepth, METH_VARARGS, "Put depth." },
 
     { "getdt",    (PyCFunction) fd::getdt, METH_VARARGS,    "Get sample interval (dt)." },
@@ -1470,6 +1895,54 @@ PyObject* getfield( PyObject*, PyObject *args ) {
     }
 }
 
+PyObject* getfields( PyObject*, PyObject *args ) {
+    buffer_guard buffer;
+    buffer_guard fields;
+
+    if( !PyArg_ParseTuple( args, "s*s*", &buffer, &fields ) ) return NULL;
+
+    if( buffer.len() != SEGY_BINARY_HEADER_SIZE &&
+        buffer.len() != SEGY_TRACE_HEADER_SIZE )
+        return BufferError( "buffer too small" );
+
+    const bool binary = buffer.len() == segy_binheader_size();
+    const char* header = buffer.buf< const char >();
+    const int* xs = fields.buf< const int >();
+    const Py_ssize_t len = fields.len() / sizeof(int);
+
+    PyObject* values = PyList_New( len );
+    if( !values ) return NULL;
+
+    for( Py_ssize_t i = 0; i < len; ++i ) {
+        const int field = xs[ i ];
+        int value = 0;
+        const int err = binary
+                      ? segy_get_bfield( header, field, &value )
+                      : segy_get_field(  header, field, &value )
+                      ;
+
+        if( err != SEGY_OK ) {
+            Py_DECREF( values );
+            if( err == SEGY_INVALID_FIELD )
+                return KeyError( "No such field %d", field );
+            return Error( err );
+        }
+
+        /* widen the unsigned fields, like getfield */
+        switch( field ) {
+            case SEGY_TR_SAMPLE_COUNT:
+            case SEGY_BIN_SAMPLES:
+            case SEGY_BIN_SAMPLES_ORIG:
+                value = int(std::uint16_t(value));
+                break;
+        }
+
+        PyList_SET_ITEM( values, i, PyLong_FromLong( value ) );
+    }
+
+    return values;
+}
+
 PyObject* putfield( PyObject*, PyObject *args ) {
 
     buffer_guard buffer;
@@ -1590,6 +2063,7 @@ PyMethodDef SegyMethods[] = {
     { "trace_bsize", (PyCFunction) trbsize, METH_VARARGS, "Size of a trace (in bytes)." },
 
     { "getfield", (PyCFunction) getfield, METH_VARARGS, "Get a header field." },
+    { "getfields", (PyCFunction) getfields, METH_VARARGS, "Get many header fields." },
     { "putfield", (PyCFunction) putfield, METH_VARARGS, "Put a header field." },
 
     { "line_metrics", (PyCFunction) line_metrics,  METH_VARARGS, "Find the length and stride of lines." },
@@ -115,4 +115,8 @@ def open(filename, mode = 'r', iline = 189,
     if ignore_geometry:
         return f
 
-    return infer_geometry(f, metrics, iline, xline, strict)
+    try:
+        return infer_geometry(f, metrics, iline, xline, strict)
+    except:
+        f.close()
+        raise
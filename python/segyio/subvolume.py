@@ -0,0 +1,142 @@
+import numpy as np
+
+from .line import sanitize_slice, window, readwindow
+
+
+class SubVolume(object):
+    """
+    The SubVolume reads a box of the cube, i.e. a range of inlines, a range of
+    crosslines and a window of samples, into one numpy.ndarray. Only the
+    traces in the box are read, and only the samples in the window, in a
+    single call into segyio.
+
+    Lines and offsets are accessed by their labels, like in the line modes,
+    and samples by their zero-based index, like in the depth mode.
+
+    Notes
+    -----
+    .. versionadded:: 1.10
+    """
+
+    def __init__(self, segy):
+        self.segy = segy
+        self.iline = segy.iline
+        self.xline = segy.xline
+        self.samples = len(segy.samples)
+        self.dtype = segy.dtype
+
+    @staticmethod
+    def keys(index, keys):
+        # the labels in the line (or offset) slice index that exist, in slice
+        # order, with the same rules for slicing as for lines
+        if not isinstance(index, slice):
+            if index not in keys:
+                raise KeyError(index)
+            return [index]
+
+        index = sanitize_slice(index, keys.keys())
+        labels = range(*index.indices(max(keys.keys()) + 1))
+        return [label for label in labels if label in keys]
+
+    def __getitem__(self, index):
+        """subvolume[i, x], subvolume[i, x, t] or subvolume[i, x, t, o]
+
+        Read the inlines `i`, crosslines `x` and samples `t`, at offsets `o`,
+        into a numpy.ndarray of shape (inlines, crosslines, samples) or, when
+        `o` is a slice, (inlines, crosslines, offsets, samples). Every
+        dimension indexed with an int instead of a slice is dropped, like for
+        numpy arrays.
+
+        The `i`, `x` and `o` are *keys*, and should correspond to the line- and
+        offset labels in your file, and slices can contain lines and offsets
+        not in the file. The `t` are zero-based sample indices. If `t` is
+        omitted, all samples are read, and if `o` is omitted the first offset
+        is read. In sparse files, missing traces are read as the fill value.
+
+        Parameters
+        ----------
+        i : int or slice
+            inlines
+        x : int or slice
+            crosslines
+        t : int or slice
+            samples (default is :)
+        o : int or slice
+            offsets (default is the first offset)
+
+        Returns
+        -------
+        subvolume : numpy.ndarray of dtype
+
+        Raises
+        ------
+        KeyError
+            If `i`, `x` or `o` don't exist
+        IndexError
+            If `t` is out of range
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Read a 100 x 50 lines box, with the samples [200, 400):
+
+        >>> x = f.subvolume[2400:2500, 1200:1250, 200:400]
+
+        Read all offsets of the same box:
+
+        >>> x = f.subvolume[2400:2500, 1200:1250, 200:400, :]
+
+        Read every other sample of an inline, between two crosslines:
+
+        >>> x = f.subvolume[2400, 1200:1250, ::2]
+        """
+        if not isinstance(index, tuple) or not 2 <= len(index) <= 4:
+            msg = 'subvolume takes 2 to 4 indices, got {}'
+            raise TypeError(msg.format(index))
+
+        # default to all samples at the first offset
+        defaults = (slice(None), self.iline.default_offset)
+        il, xl, t, off = index + defaults[len(index) - 2:]
+
+        out = self.read(self.keys(il, self.iline.heads),
+                        self.keys(xl, self.xline.heads),
+                        self.keys(off, self.iline.offsets),
+                        window(t, self.samples))
+
+        # drop the dimensions indexed by ints, like numpy
+        drop = tuple(
+            slice(None) if isinstance(x, slice) else 0
+            for x in (il, xl, off, t)
+        )
+        out = out[drop]
+        if out.ndim > 0 and not out.flags['C_CONTIGUOUS']:
+            out = np.ascontiguousarray(out)
+        return out
+
+    def read(self, ilines, xlines, offsets, depths):
+        """Read the traces at the inline, crossline and offset labels, and
+        the samples depths, a (start, stop, step) triple, into an array of
+        shape (ilines, xlines, offsets, depths)
+        """
+        ils = [self.iline.heads[x] for x in ilines]
+        xls = [self.xline.heads[x] for x in xlines]
+        offs = [self.iline.offsets[x] for x in offsets]
+
+        ils = np.asarray(ils, dtype = np.intc)
+        xls = np.asarray(xls, dtype = np.intc)
+        offs = np.asarray(offs, dtype = np.intc)
+
+        lookup = getattr(self.iline, 'lookup', None)
+        if lookup is None:
+            traces = (ils[:, np.newaxis, np.newaxis]
+                    + xls[np.newaxis, :, np.newaxis]
+                    + offs[np.newaxis, np.newaxis, :])
+        else:
+            traces = lookup[np.ix_(ils, xls, offs)]
+
+        shape = traces.shape + (len(range(*depths)),)
+        out = np.empty(shape, dtype = self.dtype)
+        return readwindow(self.segy.xfd, traces, depths, out, self.segy._fill)
@@ -244,6 +244,101 @@ def cube(f):
     dims = (fast, slow, smps) if offs == 1 else (fast, slow, offs, smps)
     return f.trace.raw[:].reshape(dims)
 
+def common_offsets(f, offsets = None, block_bytes = 64 * 1024 * 1024):
+    """Read common-offset cubes from a pre-stack file
+
+    Read the cube of every offset in `offsets`, in a single sequential pass
+    over the file. The traces are read in blocks of whole gathers, i.e. all
+    the offsets of a run of in/crossline intersections, and de-interleaved
+    into one cube per offset, so every trace is read only once regardless of
+    the number of offsets.
+
+    Takes an open segy file (created with segyio.open) or a file name.
+
+    Parameters
+    ----------
+
+    f : str or segyio.SegyFile
+    offsets : iterable of int, optional
+        The offset labels to read, defaults to all offsets
+    block_bytes : int
+        Upper bound of the size of the blocks of gathers read at a time
+
+    Returns
+    -------
+
+    cubes : numpy.ndarray
+        of shape ``(offset, fast, slow, sample)``
+
+    Raises
+    ------
+
+    KeyError
+        If an offset doesn't exist
+
+    Notes
+    -----
+
+    .. versionadded:: 1.10
+
+    In sparse files, missing traces are set to the fill value.
+
+    Examples
+    --------
+
+    Read the near and far offset cubes:
+
+    >>> near, far = segyio.tools.common_offsets(f, [150, 3000])
+
+    """
+
+    if not isinstance(f, segyio.SegyFile):
+        with segyio.open(f) as fl:
+            return common_offsets(fl, offsets, block_bytes)
+
+    ilsort = f.sorting == segyio.TraceSortingFormat.INLINE_SORTING
+    fast = len(f.ilines if ilsort else f.xlines)
+    slow = len(f.xlines if ilsort else f.ilines)
+    smps = len(f.samples)
+
+    if offsets is None:
+        offsets = f.offsets
+
+    index = { off: i for i, off in enumerate(f.offsets) }
+    selected = np.asarray([index[off] for off in offsets], dtype = np.intc)
+
+    cubes = np.empty((len(selected), fast, slow, smps), dtype = f.dtype)
+
+    if f.lookup is not None:
+        # sparse files have no runs of whole gathers to read, so read the
+        # present traces in on-disk order
+        lookup = f.lookup[:, :, selected]
+        if not ilsort:
+            lookup = lookup.transpose(1, 0, 2)
+        traces = lookup.transpose(2, 0, 1)
+        present = traces >= 0
+        cubes[~present] = f._fill
+        indices = traces[present]
+        order = np.argsort(indices, kind = 'mergesort')
+        data = np.empty((len(indices), smps), dtype = f.dtype)
+        data[order] = f.trace.read(indices[order])
+        cubes[present] = data
+        return cubes
+
+    noffs = len(f.offsets)
+    gathers = fast * slow
+    flat = cubes.reshape(len(selected), gathers, smps)
+
+    gathersize = noffs * smps * f.dtype.itemsize
+    block = max(1, block_bytes // gathersize)
+    for start in range(0, gathers, block):
+        stop = min(start + block, gathers)
+        traces = f.trace.read(np.arange(start * noffs, stop * noffs))
+        traces = traces.reshape(stop - start, noffs, smps)
+        flat[:, start:stop] = traces[:, selected].transpose(1, 0, 2)
+
+    return cubes
+
 def rotation(f, line = 'fast'):
     """ Find rotation of the survey
 
@@ -350,6 +445,61 @@ def metadata(f):
 
     return spec
 
+def build_index(filename, index = True, iline = 189,
+                                        xline = 193,
+                                        endian = 'big'):
+    """Build the geometry index of a file
+
+    Infer the geometry of the file, and write it to an index that
+    ``segyio.open(filename, index = index)`` picks up, so that opening the file
+    does not need to scan the trace headers. An existing index is always
+    replaced.
+
+    The index is only valid for the same iline, xline and endian arguments, and
+    is invalidated when the file changes.
+
+    Parameters
+    ----------
+
+    filename : str
+    index : bool or str
+        True for ``<filename>.segyio-index``, a directory for an index with
+        that name in it, or the path of the index itself
+    iline : int or segyio.TraceField
+    xline : int or segyio.TraceField
+    endian : {'big', 'msb', 'little', 'lsb'}
+
+    Returns
+    -------
+
+    path : str
+        Path of the index
+
+    Notes
+    -----
+
+    .. versionadded:: 1.10
+
+    Examples
+    --------
+
+    Build the index of a survey ahead of time, and use it:
+
+    >>> path = segyio.tools.build_index('survey.sgy')
+    >>> with segyio.open('survey.sgy', index = True) as f:
+    ...     f.ilines
+    """
+    from .open import index_path, index_key, write_index
+
+    with segyio.open(filename, iline = iline,
+                               xline = xline,
+                               endian = endian) as f:
+        path = index_path(filename, index)
+        key = index_key(f, f.xfd.metrics(), iline, xline)
+        write_index(path, f, key)
+
+    return path
+
 def resample(f, rate = None, delay = None, micro = False,
                                            trace = True,
                                            binary = True):
@@ -12,8 +12,10 @@ except ImportError: pass
 
 import numpy as np
 
+import segyio
 from .line import HeaderLine
 from .field import Field
+from . import tracefield
 from .utils import castarray
 
 class Sequence(Sequence):
@@ -102,12 +104,14 @@ class Trace(Sequence):
 
     """
 
-    def __init__(self, filehandle, dtype, tracecount, samples, readonly):
+    def __init__(self, filehandle, dtype, tracecount, samples, readonly,
+                 segy = None):
         super(Trace, self).__init__(tracecount)
         self.filehandle = filehandle
         self.dtype = dtype
         self.shape = samples
         self.readonly = readonly
+        self.segy = segy
 
     def __getitem__(self, i):
         """trace[i] or trace[i, j]
@@ -289,6 +293,118 @@ class Trace(Sequence):
         # writes
         self.filehandle.puttr(self.wrapindex(i), xs)
 
+    def read(self, indices, out = None):
+        """Read many traces at once
+
+        Eagerly read the traces at ``indices`` into a numpy.ndarray, in a
+        single call into segyio. The indices can be in any order and can
+        repeat, and negative indices count from the end, like for lists.
+
+        Traces that are adjacent on disk, or close and equally spaced, are
+        read together, so reading e.g. a random sample of traces is
+        considerably faster than reading them one at a time with trace[i].
+
+        Parameters
+        ----------
+        indices : array_like of int
+        out : numpy.ndarray, optional
+            Buffer to read into. Must be C-contiguous, of the file's dtype,
+            and of shape indices.shape + (samples,)
+
+        Returns
+        -------
+        traces : numpy.ndarray of dtype
+            of shape indices.shape + (samples,)
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Read a random sample of 1000 traces:
+
+        >>> ix = numpy.random.randint(0, len(trace), size = 1000)
+        >>> traces = trace.read(ix)
+
+        Read into a pre-allocated buffer, to re-use it between batches:
+
+        >>> buf = numpy.empty((1000, len(f.samples)), dtype = f.dtype)
+        >>> for batch in batches:
+        ...     trace.read(batch, out = buf)
+        """
+        indices = np.asarray(indices)
+        if indices.size > 0 and not np.issubdtype(indices.dtype, np.integer):
+            msg = 'trace indices must be integers, not {}'
+            raise TypeError(msg.format(indices.dtype))
+
+        indices = indices.astype(np.int64)
+        indices = np.where(indices < 0, indices + len(self), indices)
+        if np.any((indices < 0) | (indices >= len(self))):
+            raise IndexError('trace index out of range')
+
+        shape = indices.shape + (self.shape,)
+        if out is None:
+            out = np.empty(shape, dtype = self.dtype)
+        elif out.shape != shape or out.dtype != self.dtype:
+            msg = 'out must be {} of shape {}, was {} of shape {}'
+            raise ValueError(msg.format(self.dtype, shape, out.dtype, out.shape))
+        elif not out.flags['C_CONTIGUOUS'] or not out.flags['WRITEABLE']:
+            raise ValueError('out must be C-contiguous and writeable')
+
+        indices = np.ascontiguousarray(indices.ravel(), dtype = np.intc)
+        self.filehandle.gettraces(out, indices)
+        return out
+
+    def view(self):
+        """All traces as a zero-copy view of the file
+
+        Memory map the data traces and return them as a 2D numpy.ndarray with
+        one row per trace, without copying or converting any samples. The
+        array's strides skip the trace headers, so ``view[i, j]`` is stored
+        directly at sample `j` of trace `i` in the file. If the file is opened
+        for writing the array is writeable, and assignments go straight to the
+        file.
+
+        Only files with samples in a format numpy understands can be viewed,
+        i.e. all formats but IBM float and the 3-byte integers. The dtype of
+        the view has the byte order of the file, which is the native byte
+        order when the file is opened with the endianness of the host.
+
+        The view has its own mapping of the file, independent of
+        ``SegyFile.mmap()``, and stays valid after the file is closed.
+
+        Returns
+        -------
+        view : numpy.ndarray
+            of shape (tracecount, samples)
+
+        Raises
+        ------
+        ValueError
+            If the samples can't be represented by numpy without conversion
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Average amplitude of every trace, without reading the file into memory
+        first:
+
+        >>> avg = trace.view().mean(axis = 1)
+
+        Scale every trace, in-place, in a file opened with r+:
+
+        >>> v = trace.view()
+        >>> v *= 2
+        """
+        if self.segy is None:
+            raise ValueError('trace view requires a file')
+
+        return self.segy._view_traces()
+
     def __repr__(self):
         return "Trace(traces = {}, samples = {})".format(len(self), self.shape)
 
@@ -306,6 +422,7 @@ class Trace(Sequence):
                         len(self),
                         self.shape,
                         self.readonly,
+                        self.segy,
                        )
 
     @property
@@ -335,6 +452,7 @@ class Trace(Sequence):
                      len(self),
                      self.shape,
                      self.readonly,
+                     self.segy,
                     )
         yield x
         x.flush()
@@ -387,10 +505,7 @@ class RawTrace(Trace):
             except AttributeError:
                 msg = 'trace indices must be integers or slices, not {}'
                 raise TypeError(msg.format(type(i).__name__))
-            start, _, step = indices
-            length = len(range(*indices))
-            buf = np.empty((length, self.shape), dtype = self.dtype)
-            return self.filehandle.gettr(buf, start, step, length, 0, self.shape, 1, self.shape)
+            return self.read(np.arange(*indices))
 
 
 def fingerprint(x):
@@ -590,6 +705,9 @@ class Header(Sequence):
         common list operations (Sequence)
 
     """
+    # upper bound of the size of the blocks of headers copied at a time
+    block_bytes = 64 * 1024 * 1024
+
     def __init__(self, segy):
         self.segy = segy
         super(Header, self).__init__(segy.tracecount)
@@ -654,7 +772,7 @@ class Header(Sequence):
                     # skip re-invoking __getitem__, just update the buffer
                     # directly with fetch, and save some initialisation work
                     buf = x.fetch(buf, j)
-                    x.buf[:] = buf
+                    x.buf, buf = buf, x.buf
                     x.traceno = j
                     yield x
 
@@ -667,15 +785,24 @@ class Header(Sequence):
         (which return numpy.ndarrays), changes to returned headers being
         iterated over *will* be reflected on disk.
 
+        When `val` is a dict and `i` a slice, the values are broadcast to the
+        headers like numpy arrays, so every value can be either a single int,
+        or an array_like with one value per header. Only the words in the
+        dict are written.
+
         Parameters
         ----------
         i   : int or slice
-        val : Field or array_like of dict_like
+        val : Field or dict or array_like of dict_like
 
         Notes
         -----
         .. versionadded:: 1.1
 
+        .. versionchanged:: 1.10
+            Broadcast dicts of values or arrays to slices in one pass, and
+            copy Header to Header in blocks
+
         Behaves like [] for lists
 
         Examples
@@ -703,8 +830,31 @@ class Header(Sequence):
 
         >>> for x in header[::2]:
         ...     x.update({ TraceField.offset : 2 })
+
+        Write fields in every other header, in one go:
+
+        >>> header[::2] = { TraceField.offset : 2 }
+
+        Write a field with a different value for every header:
+
+        >>> header[:] = { TraceField.CDP_X : xs }
+
+        Copy all headers from another file, or in reverse order:
+
+        >>> dst.header = src.header
+        >>> dst.header[::-1] = src.header
         """
 
+        if isinstance(i, slice) and isinstance(val, dict):
+            # a plain dict of (broadcastable) values written to many headers
+            # only patches the words in the dict, in a single pass
+            return self._broadcast(i, val)
+
+        if isinstance(i, slice) and isinstance(val, Header):
+            # header-to-header copies, e.g. dst.header = src.header, copy the
+            # raw headers in blocks, without going through Field
+            return self._copy(i, val)
+
         x = self[i]
 
         try:
@@ -716,6 +866,103 @@ class Header(Sequence):
             for h, v in zip(x, val):
                 h.update(v)
 
+    def table(self, fields = None, traces = slice(None)):
+        """Read header words of many traces as columns
+
+        Read the header words `fields` of the traces `traces` into one numpy
+        array per field. This is ``SegyFile.attributes_many``, but the fields
+        can be given by name, and the columns are keyed by name.
+
+        The columns are keyed by the field names, as in
+        segyio.tracefield.keys, in the order the fields are given.
+
+        Parameters
+        ----------
+        fields : iterable of int or segyio.TraceField or str, optional
+            The header words to read, defaults to all the standard words.
+            Strings are looked up in segyio.tracefield.keys
+        traces : slice
+            The traces to read, defaults to all
+
+        Returns
+        -------
+        table : dict of str -> numpy.ndarray
+
+        Raises
+        ------
+        KeyError
+            If a field is not a valid header word
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Read all headers into a pandas dataframe:
+
+        >>> df = pandas.DataFrame(f.header.table())
+
+        Read the coordinates of every other trace:
+
+        >>> table = f.header.table(['CDP_X', 'CDP_Y'], slice(None, None, 2))
+        >>> x, y = table['CDP_X'], table['CDP_Y']
+        """
+        names = dict((v, k) for k, v in tracefield.keys.items())
+        if fields is None:
+            fields = tracefield.keys.values()
+
+        words = []
+        for field in fields:
+            if field in tracefield.keys:
+                field = tracefield.keys[field]
+
+            if field not in names:
+                raise KeyError(field)
+            words.append(int(field))
+
+        attrs = self.segy.attributes_many(words, traces)
+        return dict((names[w], attrs[w]) for w in words)
+
+    def _copy(self, i, src):
+        # the headers of src are paired with the headers in i in order, like
+        # zip, and copied in blocks of at most block_bytes. The headers are
+        # big-endian in the block, regardless of the files, so copies between
+        # little- and big-endian files are converted
+        start, stop, step = i.indices(len(self))
+        length = min(len(range(start, stop, step)), len(src))
+
+        size = segyio._segyio.thsize()
+        block = max(1, self.block_bytes // size)
+        buf = np.empty(min(block, length) * size, dtype = np.uint8)
+
+        for first in range(0, length, block):
+            last = min(first + block, length)
+            xs = buf[:(last - first) * size]
+            src.segy.xfd.getths(first, last, 1, xs)
+            self.segy.xfd.putths(start + first * step,
+                                 start + last * step,
+                                 step,
+                                 xs)
+
+    def _broadcast(self, i, val):
+        keys = tracefield.keys.values()
+        words = []
+        for key in val:
+            if int(key) not in keys:
+                raise KeyError(key)
+            words.append(int(key))
+
+        start, stop, step = i.indices(len(self))
+        length = len(range(start, stop, step))
+
+        vals = np.empty((len(words), length), dtype = np.intc)
+        for row, v in zip(vals, val.values()):
+            row[:] = np.asarray(v, dtype = np.intc)
+
+        words = np.asarray(words, dtype = np.intc)
+        self.segy.xfd.putfields_forall(vals, start, stop, step, words)
+
     @property
     def iline(self):
         """
@@ -768,15 +1015,19 @@ class Header(Sequence):
             self.xline[i] = src
 
 class Attributes(Sequence):
-    """File-wide attribute (header word) reading
+    """File-wide attribute (header word) reading and writing
 
     Lazily read a single header word for every trace in the file. The
     Attributes implement the array interface, and will behave as expected when
-    indexed and sliced.
+    indexed and sliced. When the file is opened for writing, the header word
+    can be assigned for many traces at once.
 
     Notes
     -----
     .. versionadded:: 1.1
+
+    .. versionchanged:: 1.10
+        Attributes are writable
     """
 
     def __init__(self, field, filehandle, tracecount):
@@ -845,6 +1096,79 @@ class Attributes(Sequence):
             attrs = np.empty(len(indices), dtype = self.dtype)
             return filehandle.field_forall(attrs, start, stop, step, field)
 
+    def __setitem__(self, i, val):
+        """attributes[:] = val
+
+        Write the header word for the traces `i`. Only the word itself is
+        written, the rest of the header is left untouched, and the traces are
+        written in a single call into segyio.
+
+        `val` is broadcast to the traces, like for numpy arrays, so a single
+        value can be written to many traces. Values are truncated to the size
+        of the header word.
+
+        Parameters
+        ----------
+        i : int or slice or array_like of int or bool
+        val : int or array_like of int
+
+        Raises
+        ------
+        ValueError
+            If `val` cannot be broadcast to the traces `i`
+        IOError
+            If the file is not opened for writing
+
+        Notes
+        -----
+        .. versionadded:: 1.10
+
+        Examples
+        --------
+        Set the offset of every trace:
+
+        >>> f.attributes(segyio.TraceField.offset)[:] = 1
+
+        Scale the CDP coordinates of every trace:
+
+        >>> cdpx = f.attributes(segyio.TraceField.CDP_X)
+        >>> cdpx[:] = cdpx[:] * 10
+
+        Number the traces of a shot record:
+
+        >>> traceno = f.attributes(segyio.TraceField.TraceNumber)
+        >>> traceno[tracenos] = np.arange(1, len(tracenos) + 1)
+        """
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self.tracecount)
+            length = len(range(start, stop, step))
+            vals = np.broadcast_to(np.asarray(val, dtype = self.dtype), length)
+            vals = np.ascontiguousarray(vals)
+            field = np.asarray([self.field], dtype = self.dtype)
+            self.filehandle.putfields_forall(vals, start, stop, step, field)
+            return
+
+        xs = np.asarray(i)
+        if xs.dtype == np.bool_:
+            xs = np.flatnonzero(xs)
+
+        xs = xs.astype(self.dtype)
+        if xs.ndim == 0:
+            xs = np.asarray([self.wrapindex(int(xs))], dtype = self.dtype)
+
+        # negative indices count from the end, like for a single trace
+        xs[xs < 0] += self.tracecount
+
+        # unlike reads, writes past the end would grow the file, so check the
+        # indices before writing anything
+        if xs.size and (xs.min() < 0 or xs.max() >= self.tracecount):
+            raise IndexError('trace index out of range')
+
+        vals = np.broadcast_to(np.asarray(val, dtype = self.dtype), xs.shape)
+        vals = np.ascontiguousarray(vals)
+        xs = np.ascontiguousarray(xs)
+        self.filehandle.putfield_foreach(vals, xs, self.field)
+
 class Text(Sequence):
     """Interact with segy in text mode
 
@@ -13,6 +13,7 @@ import itertools
 import filecmp
 import shutil
 import os
+import sys
 import numpy as np
 import numpy.testing as npt
 import pytest
@@ -22,9 +23,10 @@ from . import tmpfiles, small, smallps
 from . import testdata
 
 import segyio
+import segyio._segyio as _segyio
 from segyio import TraceField, BinField, TraceSortingFormat
 from segyio.field import Field
-from segyio.line import Line, HeaderLine
+from segyio.line import Line, HeaderLine, SparseLine
 from segyio.trace import Trace, Header
 
 small_sus = [
@@ -345,6 +347,48 @@ def test_header_dict_methods(openfn, kwargs):
         iter(f.bin)
 
 
+def test_header_decode_matches_getfield(small):
+    getfield = _segyio.getfield
+    with segyio.open(small) as f:
+        for h in list(f.header[::7]) + [f.bin]:
+            values = h.decode()
+            assert values == [getfield(h.buf, int(k)) for k in h.keys()]
+            assert dict(h) == dict(zip(h.keys(), values))
+            assert repr(h) == repr(h[h.keys()])
+
+        assert f.header[1] == f.header[1]
+        assert f.header[1] != f.header[2]
+        assert f.header[1] == dict(f.header[1])
+        assert f.header[0][segyio.TraceField.UnassignedInt1] == 0
+
+        with pytest.raises(AttributeError):
+            f.header[0].extra = 1
+
+        with pytest.raises(KeyError):
+            _segyio.getfields(f.header[0].buf,
+                              np.asarray([189, 190], dtype = np.intc))
+
+def test_header_decode_cache_follows_writes(small):
+    il = segyio.TraceField.INLINE_3D
+    with segyio.open(small, mode = 'r+') as f:
+        h = f.header[0]
+        g = f.header[0]
+        assert h[il] == 1 and h[il] == 1
+
+        h[il] = 10
+        assert h[il] == 10
+        h.update({ il: 11 })
+        assert h[il] == 11
+        assert dict(h)[il] == 11
+
+        assert g[il] == 1 and g[il] == 1
+        g.reload()
+        assert g[il] == 11
+
+        # the header is re-used when iterating, but must not show stale values
+        expected = [11] + [1] * 4 + [2] * 5 + [3] * 5 + [4] * 5 + [5] * 5
+        assert [dict(x)[il] for x in f.header[:]] == expected
+
 def test_header_dropped_writes(small):
     with segyio.open(small, mode='r+') as f:
         f.header[10] = { 1: 5, 5: 10 }
@@ -604,6 +648,68 @@ def test_gather_mode():
             assert np.array_equal(empty, g)
 
 
+def test_gather_ranges_read_gathers_only(monkeypatch):
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        cube = segyio.tools.cube(f)
+
+        calls = []
+        read = Trace.read
+        def counted(self, indices, out = None):
+            calls.append(np.asarray(indices).size)
+            return read(self, indices, out)
+        monkeypatch.setattr(Trace, 'read', counted)
+
+        # one inline at a time, and only the traces of the gathers
+        gathers = list(f.gather[:, 2, :])
+        assert calls == [2, 2, 2, 2]
+        npt.assert_array_equal(gathers, cube[:, 1])
+
+        npt.assert_array_equal(list(f.gather[2:4, :, 2]), cube[1:3, :, 1].reshape(6, 10))
+        npt.assert_array_equal(list(f.gather[4, 1:3]), cube[3, 0:2])
+        assert list(f.gather[:, 2, 3]) == []
+
+
+def test_gather_read():
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        cube = segyio.tools.cube(f)
+
+        x = f.gather.read(slice(None), slice(None))
+        assert x.shape == (4, 3, 2, 10)
+        npt.assert_array_equal(x, cube)
+        npt.assert_array_equal(f.gather.read(2, slice(2, 4), 2), cube[1:2, 1:3, 1:2])
+        npt.assert_array_equal(f.gather.read(slice(4, 1, -2), 1), cube[3:0:-2, 0:1])
+        npt.assert_array_equal(f.gather.read(slice(1, 3), slice(None), slice(2, 3)),
+                               np.stack(list(f.gather[1:3, :, 2:3])).reshape(2, 3, 1, 10))
+
+        with pytest.raises(KeyError):
+            f.gather.read(5, slice(None))
+
+        with pytest.raises(KeyError):
+            f.gather.read(slice(None), slice(None), 3)
+
+    with segyio.open(testdata / 'small.sgy') as f:
+        x = f.gather.read(slice(None), slice(None))
+        npt.assert_array_equal(x[:, :, 0], segyio.tools.cube(f))
+
+def test_gather_blocks():
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        cube = segyio.tools.cube(f)
+
+        blocks = list(f.gather.blocks(slice(None), slice(None)))
+        assert len(blocks) == 1
+        npt.assert_array_equal(blocks[0], cube)
+
+        # two inlines of 3 crosslines, 2 offsets and 10 samples per block
+        blocks = list(f.gather.blocks(slice(None), slice(None),
+                                      block_bytes = 2 * 3 * 2 * 10 * 4))
+        assert [b.shape for b in blocks] == [(2, 3, 2, 10)] * 2
+        npt.assert_array_equal(np.concatenate(blocks), cube)
+
+        blocks = list(f.gather.blocks(slice(None), 2, 1, block_bytes = 1))
+        assert len(blocks) == 4
+        npt.assert_array_equal(np.concatenate(blocks), cube[:, 1:2, 0:1])
+
+
 def test_line_generators():
     with segyio.open(testdata / 'small.sgy') as f:
         for _ in f.iline:
@@ -613,6 +719,97 @@ def test_line_generators():
             pass
 
 
+@pytest.mark.parametrize('budget', [1, 3 * 5 * 50 * 4, Line.block_bytes])
+@pytest.mark.parametrize('fname', ['small.sgy', 'small-ps.sgy', 'f3.sgy'])
+def test_line_generators_blocked(fname, budget, monkeypatch):
+    monkeypatch.setattr(Line, 'block_bytes', budget)
+    with segyio.open(testdata / fname) as f:
+        for lines, labels in [(f.iline, f.ilines), (f.xline, f.xlines)]:
+            for off in f.offsets:
+                expected = [lines[l, off] for l in labels]
+                npt.assert_array_equal(list(lines[:, off]), expected)
+                npt.assert_array_equal(list(lines[::-2, off]), expected[::-2])
+
+            expected = [lines[l, o] for l in labels for o in f.offsets]
+            npt.assert_array_equal(list(lines[:, :]), expected)
+
+@pytest.mark.parametrize(('openfn', 'kwargs'), small_segys)
+def test_line_sample_window(openfn, kwargs):
+    with openfn(**kwargs) as f:
+        for lines, labels in [(f.iline, f.ilines), (f.xline, f.xlines)]:
+            line = lines[labels[1]]
+            npt.assert_array_equal(lines[labels[1], None, 10:20], line[:, 10:20])
+            npt.assert_array_equal(lines[labels[1], None, ::-7], line[:, ::-7])
+            npt.assert_array_equal(lines[labels[1], 1, 5], line[:, 5])
+            npt.assert_array_equal(lines[labels[1], 1, -1], line[:, -1])
+            assert lines[labels[1], None, 10:20].shape == (5, 10)
+            npt.assert_array_equal(lines[labels[1], :, 10:20], line[:, 10:20])
+            npt.assert_array_equal(lines[labels[1], :, 5], line[:, 5])
+
+            expected = [lines[l][:, 40:] for l in labels[::2]]
+            npt.assert_array_equal(list(lines[::2, :, 40:]), expected)
+
+        f.mmap()
+        npt.assert_array_equal(f.iline[3, 1, 10:20], f.iline[3][:, 10:20])
+
+        with pytest.raises(IndexError):
+            f.iline[3, 1, 50]
+
+        with pytest.raises(KeyError):
+            f.iline[6, 1, 10:20]
+
+def test_line_sample_window_prestack_sparse(tmpdir):
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        for off in f.offsets:
+            npt.assert_array_equal(f.xline[2, off, 3:8], f.xline[2, off][:, 3:8])
+
+        window = f.xline[2, :, 3:8]
+        assert window.shape == (len(f.offsets), len(f.ilines), 5)
+        for x, off in zip(window, f.offsets):
+            npt.assert_array_equal(x, f.xline[2, off][:, 3:8])
+        assert f.xline[2, 2:, 3].shape == (1, len(f.ilines))
+
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3])
+    with segyio.open(fname, sparse = True, fill = -1) as f:
+        npt.assert_array_equal(f.iline[1, None, 3:8], f.iline[1][:, 3:8])
+        assert (f.iline[1, None, 3:8][3] == -1).all()
+        npt.assert_array_equal(f.iline[1, :, 3:8], f.iline[1][:, 3:8])
+
+
+def test_xline_generator_reads_once(monkeypatch):
+    calls = []
+    read = Trace.read
+    def counted(self, indices, out = None):
+        calls.append(indices)
+        return read(self, indices, out)
+    monkeypatch.setattr(Trace, 'read', counted)
+
+    with segyio.open(testdata / 'small.sgy') as f:
+        xlines = list(f.xline[:])
+        assert len(calls) == 1
+        npt.assert_array_equal(xlines[2], f.xline[22])
+
+
+def test_line_generators_read_in_disk_order(monkeypatch):
+    calls = []
+    read = Trace.read
+    def counted(self, indices, out = None):
+        calls.append(np.asarray(indices))
+        return read(self, indices, out)
+    monkeypatch.setattr(Trace, 'read', counted)
+
+    with segyio.open(testdata / 'small.sgy') as f:
+        for lines, labels in [(f.iline, f.ilines), (f.xline, f.xlines)]:
+            del calls[:]
+            xs = list(lines[:])
+            assert len(calls) == 1
+            # both directions read the whole file once, front to back, so
+            # that consecutive traces are merged into single reads
+            npt.assert_array_equal(calls[0], np.arange(f.tracecount))
+            for x, label in zip(xs, labels):
+                npt.assert_array_equal(x, lines[label])
+
+
 @pytest.mark.parametrize(('openfn', 'kwargs'), smallfiles)
 def test_fast_slow_dimensions(openfn, kwargs):
     with openfn(**kwargs) as f:
@@ -882,6 +1079,103 @@ def test_write_binary(small):
         f.bin = f.bin
 
 
+@pytest.mark.parametrize('mmap', [False, True])
+@pytest.mark.parametrize('endian', ['big', 'little'])
+def test_write_header_broadcast(tmpdir, mmap, endian):
+    fname = 'small.sgy' if endian == 'big' else 'small-lsb.sgy'
+    shutil.copy(str(testdata / fname), str(tmpdir))
+
+    with segyio.open(str(tmpdir / fname), 'r+', endian = endian) as f:
+        if mmap: f.mmap()
+        before = [dict(h) for h in f.header]
+        xs = np.arange(13) * 10
+
+        f.header[::2] = {
+            segyio.su.dt: 1000,
+            segyio.su.delrt: -5,
+            segyio.su.cdpx: xs,
+        }
+        f.header = { segyio.su.scalco: -100 }
+
+    with segyio.open(str(tmpdir / fname), endian = endian) as f:
+        for i, h in enumerate(f.header):
+            expected = dict(before[i])
+            expected[segyio.su.scalco] = -100
+            if i % 2 == 0:
+                expected[segyio.su.dt] = 1000
+                expected[segyio.su.delrt] = -5
+                expected[segyio.su.cdpx] = i * 5
+
+            assert dict(h) == expected
+
+def test_write_header_broadcast_errors(small):
+    with segyio.open(small, 'r+') as f:
+        before = [dict(h) for h in f.header]
+
+        with pytest.raises(KeyError):
+            f.header[:] = { segyio.su.dt: 1, 188: 2 }
+
+        with pytest.raises(ValueError):
+            f.header[:] = { segyio.su.dt: 1, segyio.su.cdpx: [1, 2] }
+
+        assert [dict(h) for h in f.header] == before
+
+    with segyio.open(small) as f:
+        with pytest.raises(IOError):
+            f.header[:] = { segyio.su.dt: 1 }
+
+@pytest.mark.parametrize('mmap', [False, True])
+@pytest.mark.parametrize('block_bytes', [240 * 3, 64 * 1024 * 1024])
+def test_copy_headers(tmpdir, mmap, block_bytes, monkeypatch):
+    from segyio.trace import Header
+    monkeypatch.setattr(Header, 'block_bytes', block_bytes)
+
+    shutil.copy(str(testdata / 'small.sgy'), str(tmpdir / 'dst.sgy'))
+    with segyio.open(testdata / 'small-ps.sgy') as src:
+        expected = [dict(h) for h in src.header]
+
+    with segyio.open(str(tmpdir / 'dst.sgy'), 'r+') as dst:
+        with segyio.open(testdata / 'small-ps.sgy') as src:
+            if mmap: dst.mmap()
+            before = [dict(h) for h in dst.header]
+
+            # like zip, only the first 8 headers of the source are copied
+            dst.header[1:25:3] = src.header
+            for i, h in enumerate(dst.header):
+                if i % 3 == 1:
+                    assert dict(h) == expected[i // 3]
+                else:
+                    assert dict(h) == before[i]
+
+            dst.header[::-1] = src.header
+            headers = [dict(h) for h in dst.header]
+            assert headers[::-1][:len(expected)] == expected
+            assert headers[:25 - len(expected)] == before[:25 - len(expected)]
+
+def test_copy_headers_convert_endianness(tmpdir):
+    shutil.copy(str(testdata / 'small-lsb.sgy'), str(tmpdir / 'lsb.sgy'))
+    shutil.copy(str(testdata / 'small.sgy'), str(tmpdir / 'msb.sgy'))
+
+    with segyio.open(testdata / 'small.sgy') as msb:
+        expected = [dict(h) for h in msb.header]
+
+    lsb = str(tmpdir / 'lsb.sgy')
+    with segyio.open(lsb, 'r+', endian = 'little') as dst:
+        dst.header = { segyio.su.cdpx: 5, segyio.su.dt: 1 }
+        with segyio.open(testdata / 'small.sgy') as src:
+            dst.header = src.header
+
+    with segyio.open(lsb, endian = 'little') as f:
+        assert [dict(h) for h in f.header] == expected
+
+    msb = str(tmpdir / 'msb.sgy')
+    with segyio.open(msb, 'r+') as dst:
+        dst.header = { segyio.su.cdpx: 5 }
+        with segyio.open(lsb, endian = 'little') as src:
+            dst.header = src.header
+
+    assert filecmp.cmp(msb, str(testdata / 'small.sgy'))
+
 def test_write_header_update_atomic(small):
     with segyio.open(small, "r+") as f:
         orig = dict(f.header[10])
@@ -1684,6 +1978,117 @@ def test_depth_slice_reading(openfn, kwargs):
         _ = f.depth_slice[len(f.samples)]
 
 
+@pytest.mark.parametrize(('openfn', 'kwargs'), smallfiles)
+def test_depth_slice_read_many(openfn, kwargs):
+    with openfn(**kwargs) as f:
+        expected = np.array([np.copy(x) for x in f.depth_slice[:]])
+        npt.assert_array_equal(f.depth_slice.read(slice(None)), expected)
+
+        for s in [slice(10, 20), slice(3, 40, 4), slice(40, 3, -3),
+                  slice(-5, None), slice(10, 10)]:
+            x = f.depth_slice.read(s)
+            assert x.shape == expected[s].shape
+            npt.assert_array_equal(x, expected[s])
+
+        f.mmap()
+        npt.assert_array_equal(f.depth_slice.read(slice(5, 15)), expected[5:15])
+
+        with pytest.raises(TypeError):
+            f.depth_slice.read(1)
+
+def test_depth_slice_read_many_prestack_unstructured():
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        expected = np.array([np.copy(x) for x in f.depth_slice[:]])
+        assert expected.shape == (10, 4, 3)
+        npt.assert_array_equal(f.depth_slice.read(slice(None)), expected)
+
+    with segyio.open(testdata / 'small.sgy', ignore_geometry = True) as f:
+        traces = f.trace.raw[:]
+        npt.assert_array_equal(f.depth_slice.read(slice(2, 9)), traces[:, 2:9].T)
+
+def test_depth_slice_iterate_in_slabs(monkeypatch):
+    from segyio.depth import Depth
+    # a slab of two depths at a time, to check the slab boundaries
+    monkeypatch.setattr(Depth, 'slab_bytes', 2 * 5 * 5 * 4)
+    with segyio.open(testdata / 'small.sgy') as f:
+        expected = [np.copy(f.depth_slice[i]) for i in range(50)]
+        got = list(f.depth_slice[1:8])
+        npt.assert_array_equal(got, expected[1:8])
+        got = list(f.depth_slice[::-3])
+        npt.assert_array_equal(got, expected[::-3])
+
+
+@pytest.mark.parametrize(('openfn', 'kwargs'), small_segys)
+def test_subvolume(openfn, kwargs):
+    with openfn(**kwargs) as f:
+        cube = segyio.tools.cube(f)
+
+        npt.assert_array_equal(f.subvolume[:, :], cube)
+        npt.assert_array_equal(f.subvolume[2:5, 21:24, 10:20],
+                               cube[1:4, 1:4, 10:20])
+        npt.assert_array_equal(f.subvolume[::2, 22:, ::-3],
+                               cube[::2, 2:, ::-3])
+        npt.assert_array_equal(f.subvolume[5:1:-2, :, 30:5:-3],
+                               cube[4:0:-2, :, 30:5:-3])
+        npt.assert_array_equal(f.subvolume[3, 21:24], cube[2, 1:4])
+        npt.assert_array_equal(f.subvolume[3, 21:24, 7], cube[2, 1:4, 7])
+        assert f.subvolume[3, 22, 4] == cube[2, 2, 4]
+
+        # lines outside the file are ignored, like for line slices
+        npt.assert_array_equal(f.subvolume[0:100, 23:30, 45:],
+                               cube[:, 3:, 45:])
+        assert f.subvolume[10:20, :, :].shape == (0, 5, 50)
+
+        x = f.subvolume[2:4, 20:22, 5:10, :]
+        assert x.shape == (2, 2, 1, 5)
+        npt.assert_array_equal(x[:, :, 0], cube[1:3, 0:2, 5:10])
+
+        f.mmap()
+        npt.assert_array_equal(f.subvolume[2:5, 21:24, 10:20],
+                               cube[1:4, 1:4, 10:20])
+
+        with pytest.raises(KeyError):
+            f.subvolume[6, :]
+
+        with pytest.raises(KeyError):
+            f.subvolume[:, :, :, 2]
+
+        with pytest.raises(IndexError):
+            f.subvolume[:, :, 50]
+
+        with pytest.raises(TypeError):
+            f.subvolume[1]
+
+def test_subvolume_prestack():
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        cube = segyio.tools.cube(f)
+
+        npt.assert_array_equal(f.subvolume[:, :, 2:5, :],
+                               cube[:, :, :, 2:5])
+        npt.assert_array_equal(f.subvolume[:, :, :, 2], cube[:, :, 1])
+        npt.assert_array_equal(f.subvolume[:, :], cube[:, :, 0])
+
+def test_subvolume_sparse(tmpdir):
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3, 7])
+    with segyio.open(testdata / 'small.sgy') as f:
+        expected = segyio.tools.cube(f)[:, :, 10:20]
+
+    expected[0, 3] = -1
+    expected[1, 2] = -1
+
+    with segyio.open(fname, sparse = True, fill = -1) as f:
+        npt.assert_array_equal(f.subvolume[:, :, 10:20], expected)
+
+def test_subvolume_unstructured():
+    with segyio.open(testdata / 'small.sgy', ignore_geometry = True) as f:
+        with pytest.raises(ValueError):
+            f.subvolume
+
+        f.interpret([1, 2, 3, 4, 5], [20, 21, 22, 23, 24])
+        assert f.subvolume is f.subvolume
+        npt.assert_array_equal(f.subvolume[2, :], f.iline[2])
+
+
 def test_depth_slice_array_shape():
     with segyio.open(testdata / '1xN.sgy') as f:
         shape = (len(f.fast), len(f.slow))
@@ -1779,6 +2184,34 @@ def test_attributes_header_shortword_equal():
     with segyio.open(f3lsb, endian = 'little') as f3:
         assert f3.header[6][word] == f3.attributes(word)[6][0]
 
+def test_header_table(small):
+    with segyio.open(small) as f:
+        table = f.header.table()
+        assert list(table.keys()) == list(segyio.tracefield.keys.keys())
+
+        for name, word in segyio.tracefield.keys.items():
+            expected = [h[word] for h in f.header]
+            assert np.array_equal(table[name], expected)
+
+
+def test_header_table_fields_traces(small):
+    with segyio.open(small) as f:
+        il, xl = segyio.TraceField.INLINE_3D, segyio.TraceField.CROSSLINE_3D
+        table = f.header.table([xl, 'INLINE_3D', 37], slice(1, None, 3))
+        assert list(table.keys()) == ['CROSSLINE_3D', 'INLINE_3D', 'offset']
+        assert np.array_equal(table['INLINE_3D'], f.attributes(il)[1::3])
+        assert np.array_equal(table['CROSSLINE_3D'], f.attributes(xl)[1::3])
+        assert np.array_equal(table['offset'], [1] * 8)
+
+        assert not f.header.table([il], slice(5, 5))['INLINE_3D'].size
+
+        with pytest.raises(KeyError):
+            f.header.table([il, 190])
+
+        with pytest.raises(KeyError):
+            f.header.table(['no-such-field'])
+
+
 @tmpfiles(testdata / 'f3.sgy')
 def test_writetrace_int16(tmpdir):
     with segyio.open(tmpdir / 'f3.sgy', mode = 'r+') as f:
@@ -1951,6 +2384,46 @@ def test_all_group_sort():
         right_shot = group[right_key]
         assert right_shot.index == [9, 7, 5, 3, 1]
 
+@pytest.mark.parametrize('key', [
+    segyio.su.fldr,
+    (segyio.su.fldr, segyio.su.grnofr),
+    (segyio.su.grnofr, segyio.su.tracf),
+    [segyio.su.offset],
+])
+def test_group_matches_header_scan(key):
+    with segyio.open(testdata / 'shot-gather.sgy', ignore_geometry = True) as f:
+        expected = {}
+        for i, h in enumerate(f.header):
+            k = segyio.gather.Groups.fingerprint(h[key])
+            expected.setdefault(k, []).append(i)
+
+        groups = f.group(key)
+        assert list(groups.bins.keys()) == list(expected.keys())
+        for k, group in groups.items():
+            assert group.index == expected[k]
+
+def test_group_trace_read_once(monkeypatch):
+    with segyio.open(testdata / 'shot-gather.sgy', ignore_geometry = True) as f:
+        group = f.group(segyio.su.fldr)[5]
+        expected = np.stack([f.trace[i] for i in group.index])
+
+        calls = []
+        read = Trace.read
+        def counted(self, indices, out = None):
+            calls.append(indices)
+            return read(self, indices, out)
+        monkeypatch.setattr(Trace, 'read', counted)
+
+        traces = group.read()
+        assert len(calls) == 1
+        assert traces.shape == (len(group.index), len(f.samples))
+        npt.assert_array_equal(traces, expected)
+
+        gen = group.trace
+        npt.assert_array_equal(next(gen), expected[0])
+        npt.assert_array_equal(list(gen), expected[1:])
+
+
 def test_groups_gather_equivalence():
     with segyio.open(testdata / 'small.sgy') as f:
         groups = f.group((segyio.su.iline, segyio.su.xline))
@@ -1968,3 +2441,650 @@ def test_groups_gather_equivalence():
 
         # group[(il, xl)] == gather[il, xl]
         npt.assert_array_equal(from_group, from_gather)
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_concurrent_line_reads(mmap):
+    from concurrent.futures import ThreadPoolExecutor
+    with segyio.open(testdata / 'f3.sgy') as f:
+        if mmap: f.mmap()
+        expected_ilines = [f.iline[il].copy() for il in f.ilines]
+        expected_xlines = [f.xline[xl].copy() for xl in f.xlines]
+        expected_traces = f.trace.raw[:]
+        expected_depth = f.depth_slice[10].copy()
+        expected_cdpx = f.attributes(segyio.su.cdpx)[:]
+
+        def read(_):
+            ilines = [f.iline[il] for il in f.ilines]
+            xlines = [f.xline[xl] for xl in f.xlines]
+            traces = f.trace.raw[:]
+            depth = f.depth_slice[10]
+            cdpx = f.attributes(segyio.su.cdpx)[::-1]
+            return ilines, xlines, traces, depth, cdpx
+
+        with ThreadPoolExecutor(max_workers = 8) as pool:
+            results = list(pool.map(read, range(32)))
+
+        for ilines, xlines, traces, depth, cdpx in results:
+            for exp, line in zip(expected_ilines, ilines):
+                npt.assert_array_equal(exp, line)
+            for exp, line in zip(expected_xlines, xlines):
+                npt.assert_array_equal(exp, line)
+            npt.assert_array_equal(expected_traces, traces)
+            npt.assert_array_equal(expected_depth, depth)
+            npt.assert_array_equal(expected_cdpx[::-1], cdpx)
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_concurrent_line_writes(mmap, tmpdir):
+    from concurrent.futures import ThreadPoolExecutor
+    fname = str(tmpdir / 'f3.sgy')
+    shutil.copy(str(testdata / 'f3.sgy'), fname)
+
+    with segyio.open(fname, 'r+') as f:
+        if mmap: f.mmap()
+
+        def write(il):
+            f.iline[il] = np.full(f.iline[il].shape, il, dtype = np.single)
+
+        with ThreadPoolExecutor(max_workers = 8) as pool:
+            list(pool.map(write, f.ilines))
+
+    with segyio.open(fname) as f:
+        for il in f.ilines:
+            assert np.all(f.iline[il] == il)
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_concurrent_writes_shared_array(mmap, tmpdir):
+    # the array written is shared between threads, and must not be modified,
+    # not even temporarily, by the writes
+    from concurrent.futures import ThreadPoolExecutor
+    fname = str(tmpdir / 'f3.sgy')
+    shutil.copy(str(testdata / 'f3.sgy'), fname)
+
+    with segyio.open(fname, 'r+') as f:
+        if mmap: f.mmap()
+        tr = np.arange(len(f.samples), dtype = np.int16)
+        il = np.tile(tr, (len(f.xlines), 1))
+        expected = tr.copy()
+
+        def write(_):
+            for i in range(f.tracecount):
+                f.trace[i] = tr
+            for x in f.ilines:
+                f.iline[x] = il
+
+        with ThreadPoolExecutor(max_workers = 8) as pool:
+            list(pool.map(write, range(40)))
+
+        npt.assert_array_equal(tr, expected)
+
+    with segyio.open(fname) as f:
+        npt.assert_array_equal(f.trace.raw[:], np.tile(expected, (f.tracecount, 1)))
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_trace_read_many(mmap):
+    with segyio.open(testdata / 'f3.sgy') as f:
+        if mmap: f.mmap()
+        indices = [3, 17, 5, 413, 0, 0, 200, 150, 100, -1]
+        expected = np.array([f.trace[i] for i in indices])
+        npt.assert_array_equal(expected, f.trace.read(indices))
+
+        grid = np.array(indices).reshape(2, 5)
+        traces = f.trace.read(grid)
+        assert traces.shape == (2, 5, len(f.samples))
+        npt.assert_array_equal(expected.reshape(traces.shape), traces)
+
+        out = np.empty((len(indices), len(f.samples)), dtype = f.dtype)
+        assert f.trace.read(indices, out = out) is out
+        npt.assert_array_equal(expected, out)
+
+        assert f.trace.read([]).shape == (0, len(f.samples))
+
+def test_trace_read_many_errors():
+    with segyio.open(testdata / 'small.sgy') as f:
+        with pytest.raises(IndexError):
+            f.trace.read([0, 25])
+
+        with pytest.raises(IndexError):
+            f.trace.read([-26])
+
+        with pytest.raises(TypeError):
+            f.trace.read([0.5, 1.5])
+
+        with pytest.raises(ValueError):
+            f.trace.read([0, 1], out = np.empty((3, 50), dtype = f.dtype))
+
+        with pytest.raises(ValueError):
+            f.trace.read([0, 1], out = np.empty((2, 50), dtype = np.float64))
+
+@pytest.mark.parametrize('fname, endian', [
+    ('f3.sgy', 'big'),
+    ('f3-lsb.sgy', 'little'),
+])
+def test_trace_view(fname, endian):
+    with segyio.open(testdata / fname, endian = endian) as f:
+        view = f.trace.view()
+        assert view.shape == (f.tracecount, len(f.samples))
+        assert not view.flags.writeable
+        npt.assert_array_equal(f.trace.raw[:], view)
+
+        for il in f.ilines[::5]:
+            npt.assert_array_equal(f.iline[il], f.iline.view(il))
+        for xl in f.xlines[::5]:
+            npt.assert_array_equal(f.xline[xl], f.xline.view(xl))
+
+    # the view outlives the file handle
+    npt.assert_array_equal(view[10], segyio.open(testdata / fname,
+                                                 endian = endian).trace[10])
+
+@tmpfiles(testdata / 'f3.sgy')
+def test_trace_view_write(tmpdir):
+    with segyio.open(tmpdir / 'f3.sgy', 'r+') as f:
+        view = f.iline.view(f.ilines[2])
+        assert view.flags.writeable
+        view[:] = 7
+        npt.assert_array_equal(f.iline[f.ilines[2]], 7)
+
+    with segyio.open(tmpdir / 'f3.sgy') as f:
+        npt.assert_array_equal(f.iline[f.ilines[2]], 7)
+        npt.assert_array_equal(f.iline[f.ilines[3]], f.iline.view(f.ilines[3]))
+
+def test_trace_view_ibm():
+    with segyio.open(testdata / 'small.sgy') as f:
+        with pytest.raises(ValueError):
+            f.trace.view()
+
+@pytest.mark.parametrize('fname, endian', [
+    ('f3.sgy', 'big'),
+    ('f3-lsb.sgy', 'little'),
+    ('small.sgy', 'big'),
+])
+def test_as_structured(fname, endian):
+    with segyio.open(testdata / fname, endian = endian) as f:
+        s = f.as_structured()
+        assert len(s) == f.tracecount
+        assert not s.flags.writeable
+
+        for field in segyio.TraceField.enums():
+            column = s[str(field)]
+            for i in [0, 1, f.tracecount - 1]:
+                assert column[i] == f.header[i][field]
+
+        if int(f.format) == 1:
+            assert s.dtype['samples'].itemsize == 4 * len(f.samples)
+        else:
+            npt.assert_array_equal(f.trace.raw[:], s['samples'])
+
+@tmpfiles(testdata / 'f3.sgy')
+def test_as_structured_write(tmpdir):
+    with segyio.open(tmpdir / 'f3.sgy', 'r+') as f:
+        s = f.as_structured()
+        s['SourceX'] = np.arange(f.tracecount)
+        s['samples'][5] = 3
+        s.flush()
+
+    with segyio.open(tmpdir / 'f3.sgy') as f:
+        sx = f.attributes(segyio.TraceField.SourceX)[:]
+        npt.assert_array_equal(sx, np.arange(f.tracecount))
+        npt.assert_array_equal(f.trace[5], 3)
+
+@pytest.mark.parametrize('mmap', [False, True])
+@pytest.mark.parametrize('traces', [
+    slice(None),
+    slice(None, None, -1),
+    slice(3, 400, 7),
+    slice(5, 5),
+])
+def test_attributes_many(mmap, traces):
+    fields = [
+        segyio.TraceField.INLINE_3D,
+        segyio.TraceField.CROSSLINE_3D,
+        segyio.TraceField.offset,
+        segyio.TraceField.TRACE_SAMPLE_COUNT,
+        segyio.TraceField.CDP_X,
+    ]
+
+    with segyio.open(testdata / 'f3.sgy') as f:
+        if mmap: f.mmap()
+        attrs = f.attributes_many(fields, traces)
+        assert list(attrs.keys()) == fields
+        for field in fields:
+            npt.assert_array_equal(f.attributes(field)[traces], attrs[field])
+
+def test_attributes_many_all_fields():
+    keys = segyio.tracefield.keys
+    with segyio.open(testdata / 'small-lsb.sgy', endian = 'little') as f:
+        attrs = f.attributes_many(keys.values())
+        for name, field in keys.items():
+            npt.assert_array_equal(f.attributes(field)[:], attrs[field])
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_attributes_write(small, mmap):
+    cdpx = segyio.TraceField.CDP_X
+    scalco = segyio.su.scalco
+    with segyio.open(small, mode = 'r+') as f:
+        if mmap: f.mmap()
+        ilines = f.attributes(segyio.TraceField.INLINE_3D)[:]
+
+        f.attributes(cdpx)[:] = np.arange(25) * 100
+        f.attributes(cdpx)[1::5] = -1
+        f.attributes(scalco)[::-2] = -np.arange(13)
+        f.attributes(scalco)[[0, 3, 7]] = [5, 6, 7]
+        f.attributes(scalco)[-1] = 10
+
+    expected_cdpx = np.arange(25) * 100
+    expected_cdpx[1::5] = -1
+    expected_scalco = np.zeros(25, dtype = np.intc)
+    expected_scalco[::-2] = -np.arange(13)
+    expected_scalco[[0, 3, 7]] = [5, 6, 7]
+    expected_scalco[-1] = 10
+
+    with segyio.open(small) as f:
+        npt.assert_array_equal(f.attributes(cdpx)[:], expected_cdpx)
+        npt.assert_array_equal(f.attributes(scalco)[:], expected_scalco)
+        npt.assert_array_equal(f.attributes(segyio.TraceField.INLINE_3D)[:],
+                               ilines)
+        assert f.header[3][scalco] == 6
+        assert f.header[3][cdpx] == 300
+
+def test_attributes_write_mask_and_negative(small):
+    scalco = segyio.su.scalco
+    with segyio.open(small, mode = 'r+') as f:
+        mask = np.zeros(25, dtype = bool)
+        mask[24] = True
+        f.attributes(scalco)[mask] = 9
+        f.attributes(scalco)[[-2, -4]] = [7, 8]
+        f.attributes(scalco)[np.asarray([-25])] = 6
+
+    expected = np.zeros(25, dtype = np.intc)
+    expected[[24, 23, 21, 0]] = [9, 7, 8, 6]
+
+    with segyio.open(small) as f:
+        npt.assert_array_equal(f.attributes(scalco)[:], expected)
+
+def test_attributes_write_errors(small):
+    offset = segyio.TraceField.offset
+    with segyio.open(small) as f:
+        with pytest.raises(IOError):
+            f.attributes(offset)[:] = 2
+
+    with segyio.open(small, mode = 'r+') as f:
+        with pytest.raises(IndexError):
+            f.attributes(offset)[[0, 25]] = 2
+
+        with pytest.raises(IndexError):
+            f.attributes(offset)[25] = 2
+
+        with pytest.raises(IndexError):
+            f.attributes(offset)[[-26]] = 2
+
+        with pytest.raises(ValueError):
+            f.attributes(offset)[:5] = [1, 2]
+
+        npt.assert_array_equal(f.attributes(offset)[:], [1] * 25)
+
+@pytest.mark.parametrize('fname', ['small.sgy', 'small-ps.sgy', 'f3.sgy'])
+def test_open_with_index(fname, tmpdir, monkeypatch):
+    shutil.copy(str(testdata / fname), str(tmpdir))
+    path = str(tmpdir / fname)
+
+    with segyio.open(path) as f:
+        expected = segyio.tools.metadata(f)
+        line = f.iline[f.ilines[1]]
+
+    with segyio.open(path, index = True) as f:
+        assert os.path.exists(path + '.segyio-index')
+
+    # the second open must not scan the headers
+    def no_scan(*args):
+        raise AssertionError('geometry inferred, index not used')
+
+    monkeypatch.setattr(sys.modules['segyio.open'], 'infer_geometry', no_scan)
+    with segyio.open(path, index = True) as f:
+        assert f.sorting == expected.sorting
+        npt.assert_array_equal(f.ilines, expected.ilines)
+        npt.assert_array_equal(f.xlines, expected.xlines)
+        npt.assert_array_equal(f.offsets, expected.offsets)
+        npt.assert_array_equal(f.samples, expected.samples)
+        npt.assert_array_equal(f.iline[f.ilines[1]], line)
+
+def test_open_with_stale_index(small, monkeypatch):
+    path = str(small)
+    with segyio.open(path, index = True):
+        pass
+
+    with segyio.open(path, 'r+') as f:
+        f.header[0][segyio.TraceField.INLINE_3D] = 10
+        f.header[1][segyio.TraceField.INLINE_3D] = 10
+        f.header[2][segyio.TraceField.INLINE_3D] = 10
+        f.header[3][segyio.TraceField.INLINE_3D] = 10
+        f.header[4][segyio.TraceField.INLINE_3D] = 10
+
+    # same size, and force same mtime, so that only the checksum differs
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime))
+
+    with segyio.open(path, index = True) as f:
+        npt.assert_array_equal(f.ilines, [10, 2, 3, 4, 5])
+
+    # other line fields do not use the index
+    with segyio.open(path, index = True, iline = 193, xline = 189) as f:
+        npt.assert_array_equal(f.xlines, [10, 2, 3, 4, 5])
+
+def test_open_with_index_dir(small, tmpdir):
+    cache = tmpdir.mkdir('cache')
+    with segyio.open(small, index = str(cache)) as f:
+        ilines = f.ilines
+
+    assert os.path.exists(str(cache / 'small.sgy.segyio-index'))
+    with segyio.open(small, index = str(cache)) as f:
+        npt.assert_array_equal(ilines, f.ilines)
+
+def test_open_with_index_unstructured(tmpdir):
+    shutil.copy(str(testdata / 'small.sgy'), str(tmpdir))
+    path = str(tmpdir / 'small.sgy')
+    with segyio.open(path, index = True, iline = 193, xline = 193,
+                     strict = False) as f:
+        assert f.unstructured
+
+    assert not os.path.exists(path + '.segyio-index')
+
+def test_open_with_index_keyed_by_options(tmpdir, monkeypatch):
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3])
+
+    # an index written by a sparse open must not be used by a dense open
+    with segyio.open(fname, sparse = True, index = True):
+        pass
+
+    with pytest.raises(ValueError):
+        segyio.open(fname, index = True)
+
+    # an index of a spot-checked regular geometry must not be used by an open
+    # that scans all headers
+    shutil.copy(str(testdata / 'small.sgy'), str(tmpdir))
+    path = str(tmpdir / 'small.sgy')
+    with segyio.open(path, regular = True, index = True):
+        pass
+
+    calls = []
+    infer_geometry = sys.modules['segyio.open'].infer_geometry
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return infer_geometry(*args, **kwargs)
+    monkeypatch.setattr(sys.modules['segyio.open'], 'infer_geometry', counted)
+
+    with segyio.open(path, index = True):
+        pass
+    assert len(calls) == 1
+
+    # but the full scan is reused
+    with segyio.open(path, index = True):
+        pass
+    assert len(calls) == 1
+
+@pytest.mark.parametrize('fname', ['small.sgy', 'small-ps.sgy'])
+def test_open_lazy_geometry(fname, monkeypatch):
+    with segyio.open(testdata / fname) as f:
+        expected = segyio.tools.metadata(f)
+        lines = [f.iline[il].copy() for il in f.ilines]
+
+    calls = []
+    infer_geometry = sys.modules['segyio.open'].infer_geometry
+    def counted(*args):
+        calls.append(args)
+        return infer_geometry(*args)
+    monkeypatch.setattr(sys.modules['segyio.open'], 'infer_geometry', counted)
+
+    with segyio.open(testdata / fname, geometry = 'lazy') as f:
+        f.trace[0]
+        f.header[3]
+        assert not calls
+
+        assert f.sorting == expected.sorting
+        assert len(calls) == 1
+
+        npt.assert_array_equal(f.ilines, expected.ilines)
+        npt.assert_array_equal(f.xlines, expected.xlines)
+        npt.assert_array_equal(f.offsets, expected.offsets)
+        for expected_line, il in zip(lines, f.ilines):
+            npt.assert_array_equal(expected_line, f.iline[il])
+        assert len(calls) == 1
+
+@pytest.mark.parametrize('mode', ['iline', 'xline', 'gather', 'depth_slice'])
+def test_open_lazy_geometry_modes(mode):
+    with segyio.open(testdata / 'small.sgy', geometry = 'lazy') as f:
+        assert getattr(f, mode) is not None
+        assert not f.unstructured
+
+def test_open_lazy_geometry_strict():
+    with segyio.open(testdata / 'small.sgy', iline = 193, xline = 193,
+                     geometry = 'lazy') as f:
+        npt.assert_array_equal(f.trace[0], f.trace.raw[0])
+        with pytest.raises(RuntimeError):
+            f.ilines
+
+        with pytest.raises(RuntimeError):
+            f.iline
+
+    with segyio.open(testdata / 'small.sgy', iline = 193, xline = 193,
+                     strict = False, geometry = 'lazy') as f:
+        assert f.unstructured
+
+def test_open_unknown_geometry_mode():
+    with pytest.raises(ValueError):
+        segyio.open(testdata / 'small.sgy', geometry = 'never')
+
+@pytest.mark.parametrize('fname', [
+    'small.sgy',
+    'f3.sgy',
+    '1x1.sgy',
+    '1xN.sgy',
+    'Mx1.sgy',
+    'small-ps.sgy',
+    'small-ps-dec-il-xl-off.sgy',
+    'small-ps-dec-off-inc-il-xl.sgy',
+    'small-ps-dec-xl-inc-il-off.sgy',
+])
+def test_open_regular(fname, monkeypatch):
+    with segyio.open(testdata / fname) as f:
+        expected = segyio.tools.metadata(f)
+
+    def no_scan(*args):
+        raise AssertionError('headers scanned for a regular file')
+
+    monkeypatch.setattr(sys.modules['segyio.open'], 'infer_geometry', no_scan)
+    with segyio.open(testdata / fname, regular = True) as f:
+        assert f.sorting == expected.sorting
+        npt.assert_array_equal(f.ilines, expected.ilines)
+        npt.assert_array_equal(f.xlines, expected.xlines)
+        npt.assert_array_equal(f.offsets, expected.offsets)
+
+def test_open_regular_falls_back(small, monkeypatch):
+    # swap the crosslines of two traces in the middle of the file, which is
+    # not visible from the corners
+    with segyio.open(small, 'r+') as f:
+        f.header[12] = { TraceField.CROSSLINE_3D: 23 }
+        f.header[13] = { TraceField.CROSSLINE_3D: 22 }
+
+    with segyio.open(small) as f:
+        expected = segyio.tools.metadata(f)
+
+    calls = []
+    infer_geometry = sys.modules['segyio.open'].infer_geometry
+    def counted(*args):
+        calls.append(args)
+        return infer_geometry(*args)
+    monkeypatch.setattr(sys.modules['segyio.open'], 'infer_geometry', counted)
+
+    with segyio.open(small, regular = 25) as f:
+        assert len(calls) == 1
+        npt.assert_array_equal(f.ilines, expected.ilines)
+        npt.assert_array_equal(f.xlines, expected.xlines)
+
+def test_open_regular_unstructured():
+    with segyio.open(testdata / 'shot-gather.sgy', ignore_geometry = True) as f:
+        tracecount = f.tracecount
+
+    with pytest.raises(RuntimeError):
+        segyio.open(testdata / 'long.sgy', regular = True)
+
+    with segyio.open(testdata / 'shot-gather.sgy', regular = True,
+                     strict = False) as f:
+        assert f.unstructured
+        assert f.tracecount == tracecount
+
+def drop_traces(src, dst, drop):
+    # copy src to dst without the traces in drop, which makes a file with holes
+    with segyio.open(src, ignore_geometry = True) as f:
+        trace0 = 3600 + 3200 * f.ext_headers
+        trsize = 240 + len(f.samples) * 4
+        tracecount = f.tracecount
+
+    with open(str(src), 'rb') as f:
+        raw = f.read()
+
+    with open(str(dst), 'wb') as f:
+        f.write(raw[:trace0])
+        for i in range(tracecount):
+            if i in drop: continue
+            f.write(raw[trace0 + i * trsize:trace0 + (i + 1) * trsize])
+
+    return dst
+
+def test_open_sparse(tmpdir):
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3, 7, 12])
+
+    with segyio.open(testdata / 'small.sgy') as dense:
+        expected = segyio.tools.cube(dense)
+
+    # inline 1 crossline 23, inline 2 crossline 22, inline 3 crossline 22
+    expected[0, 3] = np.nan
+    expected[1, 2] = np.nan
+    expected[2, 2] = np.nan
+
+    with pytest.raises(ValueError):
+        segyio.open(fname)
+
+    with segyio.open(fname, sparse = True, fill = np.nan) as f:
+        assert f.tracecount == 22
+        assert f.sorting == TraceSortingFormat.INLINE_SORTING
+        npt.assert_array_equal(f.ilines, [1, 2, 3, 4, 5])
+        npt.assert_array_equal(f.xlines, [20, 21, 22, 23, 24])
+        npt.assert_array_equal(f.offsets, [1])
+        assert f.lookup.shape == (5, 5, 1)
+        assert f.lookup[0, 3, 0] == -1
+        assert f.lookup[0, 4, 0] == 3
+
+        for i, line in enumerate(f.iline[:]):
+            npt.assert_array_equal(line, expected[i])
+
+        for i, xl in enumerate(f.xlines):
+            npt.assert_array_equal(f.xline[xl], expected[:, i])
+
+        npt.assert_array_equal(f.depth_slice[10], expected[:, :, 10])
+        for i, depth in enumerate(f.depth_slice[:3]):
+            npt.assert_array_equal(depth, expected[:, :, i])
+
+        npt.assert_array_equal(f.gather[1, 24], expected[0, 4])
+        assert np.isnan(f.gather[1, 23]).all()
+        npt.assert_array_equal(list(f.gather[1:3, 22]), expected[0:2, 2])
+
+        with pytest.raises(ValueError):
+            f.header.iline
+
+        with pytest.raises(ValueError):
+            f.iline.view(1)
+
+def test_open_sparse_prestack(tmpdir):
+    fname = drop_traces(testdata / 'small-ps.sgy', tmpdir / 'sparse.sgy', [1, 6])
+
+    with segyio.open(testdata / 'small-ps.sgy') as dense:
+        il, xl = dense.ilines[0], dense.xlines[0]
+        expected = np.copy(dense.gather[il, xl])
+        offsets = list(dense.offsets)
+
+    expected[1] = -1
+
+    with segyio.open(fname, sparse = True, fill = -1) as f:
+        npt.assert_array_equal(f.offsets, offsets)
+        npt.assert_array_equal(f.gather[il, xl], expected)
+        npt.assert_array_equal(f.gather[il, xl, offsets[1]], expected[1])
+        npt.assert_array_equal(f.iline[il, offsets[1]][0], expected[1])
+
+def test_open_sparse_common_offsets(tmpdir):
+    fname = drop_traces(testdata / 'small-ps.sgy', tmpdir / 'sparse.sgy', [1, 6])
+
+    with segyio.open(testdata / 'small-ps.sgy') as dense:
+        expected = segyio.tools.common_offsets(dense)
+
+    # trace 1 is (1, 1, 2), trace 6 is (2, 1, 1)
+    expected[1, 0, 0] = -1
+    expected[0, 1, 0] = -1
+
+    with segyio.open(fname, sparse = True, fill = -1) as f:
+        npt.assert_array_equal(segyio.tools.common_offsets(f), expected)
+
+def test_open_sparse_gather_read(tmpdir):
+    fname = drop_traces(testdata / 'small-ps.sgy', tmpdir / 'sparse.sgy', [1, 6])
+
+    with segyio.open(testdata / 'small-ps.sgy') as dense:
+        expected = segyio.tools.cube(dense)
+
+    expected[0, 0, 1] = -1
+    expected[1, 0, 0] = -1
+
+    with segyio.open(fname, sparse = True, fill = -1) as f:
+        npt.assert_array_equal(f.gather.read(slice(None), slice(None)), expected)
+        blocks = f.gather.blocks(slice(None), slice(None), block_bytes = 1)
+        npt.assert_array_equal(np.concatenate(list(blocks)), expected)
+
+def test_open_sparse_write(tmpdir):
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3])
+
+    with segyio.open(fname, 'r+', sparse = True) as f:
+        line = np.arange(250, dtype = np.single).reshape(5, 50)
+        f.iline[1] = line
+        f.depth_slice[0] = np.full((5, 5), 7, dtype = np.single)
+
+    with segyio.open(fname, sparse = True) as f:
+        expected = np.copy(line)
+        expected[3] = 0
+        expected[:, 0] = 7
+        expected[3, 0] = 0
+        npt.assert_array_equal(f.iline[1], expected)
+        assert f.tracecount == 24
+        npt.assert_array_equal(f.trace[0], expected[0])
+
+def test_open_sparse_full_cube():
+    with segyio.open(testdata / 'small.sgy', sparse = True) as f:
+        assert f.lookup is None
+        assert not isinstance(f.iline, SparseLine)
+        npt.assert_array_equal(f.ilines, [1, 2, 3, 4, 5])
+
+def test_open_sparse_duplicates(tmpdir):
+    fname = tmpdir / 'duplicates.sgy'
+    shutil.copy(str(testdata / 'small.sgy'), str(fname))
+    with segyio.open(fname, 'r+') as f:
+        f.header[1] = { TraceField.CROSSLINE_3D: 20 }
+
+    with pytest.raises(ValueError):
+        segyio.open(fname, sparse = True)
+
+    with segyio.open(fname, sparse = True, strict = False) as f:
+        assert f.unstructured
+
+def test_open_sparse_index(tmpdir, monkeypatch):
+    fname = drop_traces(testdata / 'small.sgy', tmpdir / 'sparse.sgy', [3])
+
+    with segyio.open(fname, sparse = True, index = True) as f:
+        lookup = np.copy(f.lookup)
+        expected = np.copy(f.iline[1])
+
+    def no_scan(*args):
+        raise AssertionError('headers scanned with an index')
+
+    monkeypatch.setattr(sys.modules['segyio.open'], 'sparse_geometry', no_scan)
+    with segyio.open(fname, sparse = True, index = True, fill = 1) as f:
+        npt.assert_array_equal(f.lookup, lookup)
+        expected[3] = 1
+        npt.assert_array_equal(f.iline[1], expected)
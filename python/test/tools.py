@@ -1,3 +1,6 @@
+import os
+import shutil
+
 import numpy as np
 import pytest
 from pytest import approx
@@ -126,6 +129,29 @@ def test_cube_identity_prestack():
         assert np.all(x == segyio.tools.cube(f))
 
 
+def test_common_offsets():
+    with segyio.open(testdata / 'small-ps.sgy') as f:
+        cube = segyio.tools.cube(f)
+        offsets = list(f.offsets)
+
+        cubes = segyio.tools.common_offsets(f)
+        assert cubes.shape == (2, 4, 3, 10)
+        assert np.array_equal(cubes, cube.transpose(2, 0, 1, 3))
+
+        # one gather per block, and only the last offset
+        cubes = segyio.tools.common_offsets(f, offsets[1:], block_bytes = 1)
+        assert np.array_equal(cubes[0], cube[:, :, 1])
+
+        cubes = segyio.tools.common_offsets(f, offsets[::-1], block_bytes = 100)
+        assert np.array_equal(cubes, cube.transpose(2, 0, 1, 3)[::-1])
+
+        with pytest.raises(KeyError):
+            segyio.tools.common_offsets(f, [3])
+
+    cubes = segyio.tools.common_offsets(testdata / 'small.sgy')
+    assert np.array_equal(cubes[0], segyio.tools.cube(testdata / 'small.sgy'))
+
+
 def test_unstructured_rotation():
     with pytest.raises(ValueError):
         with segyio.open(testdata / 'small.sgy', ignore_geometry=True) as f:
@@ -381,3 +407,21 @@ def test_create_from_array_invalid_args(tmpdir, create):
     data = "rubbish-input"
     with pytest.raises(ValueError):
         create(fresh, data)
+
+def test_build_index(tmpdir):
+    shutil.copy(str(testdata / 'small-ps.sgy'), str(tmpdir))
+    path = str(tmpdir / 'small-ps.sgy')
+
+    index = segyio.tools.build_index(path)
+    assert index == path + '.segyio-index'
+    assert os.path.exists(index)
+
+    explicit = str(tmpdir / 'explicit-index')
+    assert segyio.tools.build_index(path, index = explicit) == explicit
+
+    with segyio.open(path, index = explicit) as f, \
+         segyio.open(testdata / 'small-ps.sgy') as g:
+        assert f.sorting == g.sorting
+        assert np.array_equal(f.ilines, g.ilines)
+        assert np.array_equal(f.xlines, g.xlines)
+        assert np.array_equal(f.offsets, g.offsets)